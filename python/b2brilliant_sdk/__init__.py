@@ -2,11 +2,50 @@
 B2Brilliant Campaign Agent Python SDK
 """
 
-from .agent import B2BrilliantAgent
-from .exceptions import ApiError, ValidationError
+from .agent import B2BrilliantAgent, AsyncB2BrilliantAgent
+from .batch import BatchResult, TopResults
+from .cache import ResponseCache, MemoryCache, SQLiteCache
+from .circuit import CircuitBreaker
+from .concurrency import AdaptiveConcurrency
+from .exceptions import ApiError, CircuitOpenError, ValidationError
+from .hedge import HedgePolicy
+from .hooks import RequestEvent, RequestHooks
+from .jobs import BatchJob, JsonlJobStore, SQLiteJobStore
+from .metrics import MetricsRegistry
+from .models import BusinessModel, CompatibilityModel, CampaignModel
+from .pipeline import ProspectingPipeline, ProspectResult
+from .profile import BusinessProfile
+from .rate_limit import RateLimiter, SQLiteTokenBucket, TokenBucket
+from .retry import RetryPolicy
 
 __all__ = [
     'B2BrilliantAgent',
+    'AsyncB2BrilliantAgent',
+    'BatchResult',
+    'TopResults',
     'ApiError',
     'ValidationError',
+    'CircuitOpenError',
+    'RetryPolicy',
+    'RateLimiter',
+    'TokenBucket',
+    'SQLiteTokenBucket',
+    'AdaptiveConcurrency',
+    'CircuitBreaker',
+    'ResponseCache',
+    'MemoryCache',
+    'SQLiteCache',
+    'HedgePolicy',
+    'ProspectingPipeline',
+    'ProspectResult',
+    'BusinessProfile',
+    'BusinessModel',
+    'CompatibilityModel',
+    'CampaignModel',
+    'RequestHooks',
+    'RequestEvent',
+    'MetricsRegistry',
+    'BatchJob',
+    'JsonlJobStore',
+    'SQLiteJobStore',
 ] 
\ No newline at end of file
@@ -2,10 +2,14 @@
 Main B2Brilliant Agent class for the B2B Campaign Agent SDK
 """
 
+import functools
 from .api_client import ApiClient
-from .user import UserService
-from .business import BusinessService
-from .campaigns import CampaignService
+from .async_api_client import AsyncApiClient
+from .batch import DEFAULT_MAX_CONCURRENCY, run_batch
+from .processes import run_batch_processes
+from .user import UserService, AsyncUserService
+from .business import BusinessService, AsyncBusinessService
+from .campaigns import CampaignService, AsyncCampaignService
 
 
 class B2BrilliantAgent:
@@ -13,20 +17,126 @@ class B2BrilliantAgent:
     
     DEFAULT_BASE_URL = "https://api.b2brilliant.app"
     
-    def __init__(self, api_key, base_url=None):
+    def __init__(self, api_key, base_url=None, **client_options):
         """
         Initialize a new B2Brilliant Agent
         
         Args:
             api_key (str): API key for authentication
             base_url (str, optional): Base URL for the API
+            **client_options: Additional ApiClient options such as
+                pool_maxsize or keep_alive
         """
         self.api_client = ApiClient(
             api_key=api_key,
-            base_url=base_url or self.DEFAULT_BASE_URL
+            base_url=base_url or self.DEFAULT_BASE_URL,
+            **client_options
         )
+        self._factory = functools.partial(type(self), api_key, base_url, **client_options)
         
         # Initialize services
         self.user = UserService(self.api_client)
         self.business = BusinessService(self.api_client)
-        self.campaigns = CampaignService(self.api_client) 
\ No newline at end of file
+        self.campaigns = CampaignService(self.api_client)
+        
+    def run_batch(self, func, items, max_concurrency=DEFAULT_MAX_CONCURRENCY, as_completed=False,
+                  backend="threads", mp_context=None):
+        """
+        Call ``func(agent, item)`` for every item, on threads or worker processes
+        
+        ``func`` can make any number of calls and process their results, so
+        parsing, scoring and writing out run in the pool too. With
+        ``backend="threads"`` it gets this agent. With ``backend="processes"``
+        it runs in ``max_concurrency`` worker processes, out of reach of the
+        GIL, and gets an agent each worker builds from this agent's options.
+        Those options must then be picklable, and only a RateLimiter created
+        with ``path`` and a ResponseCache backed by SQLiteCache are shared by
+        all workers; in-memory limiters and caches are rejected.
+        
+        Args:
+            func (callable): Called with an agent and one item. For processes,
+                a module-level function whose items and results are picklable.
+            items (iterable): Items to process
+            max_concurrency (int, optional): Number of threads or processes
+            as_completed (bool, optional): Yield results as they finish instead
+                of in input order
+            backend (str, optional): ``"threads"`` or ``"processes"``
+            mp_context (optional): multiprocessing context for the worker
+                processes. Defaults to ``spawn``.
+                
+        Returns:
+            iterator: BatchResult with the result or error for each item,
+                with its input index
+                
+        Raises:
+            ValueError: If the backend is unknown, ``max_concurrency`` is
+                below 1, or the agent's options cannot be shared with worker
+                processes. Raised by this call, before any item runs.
+        """
+        if backend not in ("threads", "processes"):
+            raise ValueError(f"Unknown backend: {backend!r}")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+            
+        if backend == "threads":
+            return run_batch(functools.partial(func, self), items, max_concurrency, as_completed)
+        return run_batch_processes(self._factory, func, items, max_concurrency, as_completed, mp_context)
+        
+    @property
+    def metrics(self):
+        """MetricsRegistry: Request metrics, or None unless created with ``metrics``"""
+        return self.api_client.metrics
+        
+    def close(self):
+        """Release pooled HTTP connections held by the agent"""
+        self.api_client.close()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class AsyncB2BrilliantAgent:
+    """Asynchronous client for the B2B Campaign Agent API"""
+    
+    DEFAULT_BASE_URL = B2BrilliantAgent.DEFAULT_BASE_URL
+    
+    def __init__(self, api_key, base_url=None, **client_options):
+        """
+        Initialize a new asynchronous B2Brilliant Agent
+        
+        Service methods mirror B2BrilliantAgent and must be awaited.
+        
+        Args:
+            api_key (str): API key for authentication
+            base_url (str, optional): Base URL for the API
+            **client_options: Additional AsyncApiClient options such as
+                max_connections or max_concurrency
+        """
+        self.api_client = AsyncApiClient(
+            api_key=api_key,
+            base_url=base_url or self.DEFAULT_BASE_URL,
+            **client_options
+        )
+        
+        # Initialize services
+        self.user = AsyncUserService(self.api_client)
+        self.business = AsyncBusinessService(self.api_client)
+        self.campaigns = AsyncCampaignService(self.api_client)
+        
+    @property
+    def metrics(self):
+        """MetricsRegistry: Request metrics, or None unless created with ``metrics``"""
+        return self.api_client.metrics
+        
+    async def aclose(self):
+        """Release pooled HTTP connections held by the agent"""
+        await self.api_client.aclose()
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
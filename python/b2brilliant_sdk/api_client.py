@@ -2,24 +2,386 @@
 API Client for making HTTP requests to the B2B Campaign Agent API
 """
 
-import json
+import functools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 import requests
-from .exceptions import ApiError
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+from .codec import get_codec
+from .coalesce import SingleFlight, request_key
+from .compression import (
+    DEFAULT_COMPRESS_THRESHOLD,
+    REQUEST_ENCODINGS,
+    accept_encoding as build_accept_encoding,
+    compress_body
+)
+from .concurrency import AdaptiveConcurrency
+from .exceptions import ApiError, CircuitOpenError
+from .hedge import _HedgeSkipped
+from .hooks import RequestTrace
+from .metrics import MetricsRegistry
+from .models import RESPONSE_MODELS
+from .profile import encode_payload
+from .sse import EVENT_STREAM, ServerSentEvent, iter_sse
 
+# Streaming requests accept a plain JSON answer from servers that can't stream
+STREAM_ACCEPT = f"{EVENT_STREAM}, application/json"
 
-class ApiClient:
-    """API Client for the B2B Campaign Agent API"""
+
+class BaseApiClient:
+    """Transport-independent configuration shared by the sync and async clients"""
     
-    def __init__(self, api_key, base_url):
+    SINGLE_FLIGHT_CLASS = None
+    SUPPORTED_ENCODINGS = ("gzip", "deflate")
+    
+    def __init__(self, api_key, base_url, keep_alive=True, retry_policy=None, rate_limiter=None,
+                 cache=None, coalesce=False, accept_encoding=None, compress_requests=False,
+                 compress_threshold=DEFAULT_COMPRESS_THRESHOLD, request_encoding="gzip", codec=None,
+                 hedge_policy=None, response_models=False, hooks=None, metrics=None,
+                 adaptive_concurrency=None, circuit_breaker=None, canonicalize_urls=False):
         """
         Create a new API client
         
         Args:
             api_key (str): API key for authentication
             base_url (str): Base URL for the API
+            keep_alive (bool, optional): Keep connections open between requests
+            retry_policy (RetryPolicy, optional): Policy for retrying transient
+                failures. Requests are not retried when omitted.
+            rate_limiter (RateLimiter, optional): Paces requests per endpoint,
+                including retries. Share one limiter between clients to share
+                a budget.
+            cache (ResponseCache, optional): Serves repeated discover calls
+                from a cache instead of the API
+            coalesce (bool, optional): Send identical concurrent requests
+                (same endpoint and body) only once and share the outcome
+            accept_encoding (str, optional): Accept-Encoding header to send.
+                Defaults to every coding the transport can decode (zstd and br
+                when their libraries are installed, then gzip and deflate).
+            compress_requests (bool, optional): Compress request bodies of at
+                least compress_threshold bytes
+            compress_threshold (int, optional): Minimum encoded body size, in
+                bytes, worth compressing
+            request_encoding (str, optional): Coding used for compressed
+                request bodies, ``"gzip"`` or ``"deflate"``
+            codec (str or object, optional): JSON codec used for request and
+                response bodies: ``"orjson"``, ``"ujson"``, ``"json"`` or an
+                object with ``dumps``/``loads``. Defaults to the fastest
+                installed library.
+            hedge_policy (HedgePolicy, optional): Sends a duplicate of slow
+                requests to hedgeable endpoints and uses whichever response
+                arrives first
+            response_models (bool or dict, optional): Return compact
+                response models that decode nested fields on demand instead
+                of dicts. Pass a dict of endpoint to model class to choose
+                the models.
+            hooks (RequestHooks or list, optional): Hooks notified of every
+                attempt, with per-phase timings
+            metrics (MetricsRegistry or bool, optional): Registry that keeps
+                per-endpoint request metrics. Pass True to create one.
+            adaptive_concurrency (AdaptiveConcurrency or bool, optional):
+                Limits requests in flight per endpoint group, raising the
+                limit while latency is steady and cutting it on throttling
+                or latency spikes. Pass True to use the default limits.
+            circuit_breaker (CircuitBreaker, optional): Fails calls to an
+                endpoint fast with CircuitOpenError while too many of its
+                recent calls fail or run slow
+            canonicalize_urls (bool, optional): Canonicalize and de-duplicate
+                discover URLs before sending them, so spellings of the same
+                site (http/https, www., trailing slashes, tracking parameters)
+                make the same request. Off by default, so URLs are sent as
+                given; batch deduplication canonicalizes its keys either way.
         """
+        if request_encoding not in REQUEST_ENCODINGS:
+            raise ValueError(f"request_encoding must be one of {REQUEST_ENCODINGS}")
+            
         self.api_key = api_key
         self.base_url = base_url
+        self.keep_alive = keep_alive
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.single_flight = self.SINGLE_FLIGHT_CLASS() if coalesce else None
+        self.accept_encoding = (
+            accept_encoding if accept_encoding is not None
+            else build_accept_encoding(self.SUPPORTED_ENCODINGS)
+        )
+        self.compress_requests = compress_requests
+        self.compress_threshold = compress_threshold
+        self.request_encoding = request_encoding
+        self.codec = get_codec(codec)
+        self.hedge_policy = hedge_policy
+        self.response_models = RESPONSE_MODELS if response_models is True else dict(response_models or {})
+        self.hooks = list(hooks) if isinstance(hooks, (list, tuple)) else [hooks] if hooks else []
+        self.metrics = MetricsRegistry() if metrics is True else metrics or None
+        if self.metrics is not None:
+            self.hooks.append(self.metrics)
+        self.adaptive_concurrency = (
+            AdaptiveConcurrency() if adaptive_concurrency is True else adaptive_concurrency or None
+        )
+        if self.metrics is not None and self.adaptive_concurrency is not None:
+            self.metrics.watch_concurrency(self.adaptive_concurrency)
+        self.circuit_breaker = circuit_breaker
+        self.canonicalize_urls = canonicalize_urls
+        
+    def _build_headers(self):
+        """
+        Build the headers sent with every request
+        
+        Returns:
+            dict: Request headers
+        """
+        headers = {
+            "x-api-key": self.api_key,
+            "Accept-Encoding": self.accept_encoding,
+            "Content-Type": "application/json"
+        }
+        
+        if not self.keep_alive:
+            headers["Connection"] = "close"
+            
+        return headers
+        
+    def _prepare_request(self, data):
+        """
+        Encode a request body and build its headers
+        
+        Args:
+            data (dict): Request body
+            
+        Returns:
+            tuple: ``(headers, body)`` with the body as bytes
+        """
+        headers = self._build_headers()
+        body = encode_payload(self.codec, data or {})
+        
+        if self.compress_requests and len(body) >= self.compress_threshold:
+            body = compress_body(body, self.request_encoding)
+            headers["Content-Encoding"] = self.request_encoding
+            
+        return headers, body
+        
+    def _trace(self, endpoint):
+        """Start timing a request and reporting it to the hooks"""
+        return RequestTrace(self.hooks, endpoint)
+        
+    def _finish_attempt(self, endpoint, limit, probe, latency, status):
+        """
+        Report how an attempt ended to the circuit breaker and adaptive limit
+        
+        Args:
+            endpoint (str): API endpoint
+            limit (AdaptiveLimit): Limit holding the attempt's slot, or None
+            probe (bool): Whether the attempt was a half-open probe
+            latency (float): Seconds the attempt took
+            status (int): HTTP status, 0 for a network error, or None if the
+                attempt was abandoned
+        """
+        if limit is not None:
+            limit.release(latency, status or None)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(endpoint, latency, status, probe)
+            
+    def _should_retry(self, endpoint, error, attempt):
+        """
+        Check whether a failed attempt should be retried
+        
+        Args:
+            endpoint (str): API endpoint
+            error (ApiError): Error raised by the attempt
+            attempt (int): Number of the attempt that failed, starting at 1
+            
+        Returns:
+            bool: Whether to retry
+        """
+        return bool(self.retry_policy) and self.retry_policy.should_retry(endpoint, error.status, attempt)
+        
+    @staticmethod
+    def _http_error(status_code, error_data):
+        """
+        Build the ApiError raised for a non-2xx response
+        
+        Args:
+            status_code (int): HTTP status code
+            error_data (dict): Decoded error body, or an empty dict
+            
+        Returns:
+            ApiError: Error describing the failed response
+        """
+        if not isinstance(error_data, dict):
+            error_data = {}
+            
+        return ApiError(
+            error_data.get("message") or f"HTTP error {status_code}",
+            status_code,
+            error_data
+        )
+        
+    def _decode(self, content):
+        """
+        Decode a response body
+        
+        Args:
+            content (bytes): Raw response body
+            
+        Returns:
+            Decoded JSON
+            
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        return self.codec.loads(content)
+        
+    def _decode_response(self, endpoint, content):
+        """
+        Decode a response body into the endpoint's response model, if any
+        
+        Args:
+            endpoint (str): API endpoint
+            content (bytes): Raw response body
+            
+        Returns:
+            ResponseModel, or decoded JSON for endpoints without a model
+            
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        model = self.response_models.get(endpoint)
+        if model is None:
+            return self._decode(content)
+        return model(content, self.codec)
+        
+    def _from_cache(self, endpoint, cached):
+        """Rebuild the endpoint's response model from a cached response"""
+        model = self.response_models.get(endpoint)
+        if model is None:
+            return cached
+        return model(self.codec.dumps(cached), self.codec)
+        
+    @staticmethod
+    def _is_event_stream(content_type):
+        """Check whether a Content-Type header announces server-sent events"""
+        return content_type.split(";")[0].strip().lower() == EVENT_STREAM
+        
+    def _result_event(self, content):
+        """Wrap a plain JSON response to a streaming request as a single event"""
+        try:
+            return ServerSentEvent("result", self._decode(content), None)
+        except ValueError as e:
+            raise self._network_error(e)
+            
+    def _decode_event(self, event):
+        """
+        Decode the JSON data of a streamed event
+        
+        Args:
+            event (ServerSentEvent): Raw event
+            
+        Returns:
+            ServerSentEvent: Event with decoded data. Data that is not JSON is
+                left as a string.
+                
+        Raises:
+            ApiError: If the event is an ``error`` event
+        """
+        try:
+            data = self._decode(event.data.encode("utf-8"))
+        except ValueError:
+            data = event.data
+            
+        if event.event == "error":
+            error_data = data if isinstance(data, dict) else {"message": data}
+            raise ApiError(
+                error_data.get("message") or "Stream error",
+                error_data.get("status", 0),
+                error_data
+            )
+            
+        return event._replace(data=data)
+        
+    @staticmethod
+    def _network_error(error):
+        """
+        Build the ApiError raised when no usable response was received
+        
+        Args:
+            error (Exception): Underlying transport or decoding error
+            
+        Returns:
+            ApiError: Error with status 0
+        """
+        return ApiError(
+            str(error) or "Network error",
+            0,
+            {"original_error": str(error)}
+        )
+
+
+class ApiClient(BaseApiClient):
+    """API Client for the B2B Campaign Agent API"""
+    
+    SINGLE_FLIGHT_CLASS = SingleFlight
+    SUPPORTED_ENCODINGS = tuple(ACCEPT_ENCODING.split(","))
+    
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+    
+    def __init__(self, api_key, base_url, pool_connections=None, pool_maxsize=None,
+                 pool_block=False, keep_alive=True, session=None, **options):
+        """
+        Create a new API client
+        
+        The client owns a long-lived ``requests.Session`` so that connections
+        (and their TCP/TLS handshakes) are reused across calls.
+        
+        Args:
+            api_key (str): API key for authentication
+            base_url (str): Base URL for the API
+            pool_connections (int, optional): Number of host connection pools to cache
+            pool_maxsize (int, optional): Maximum number of connections kept per host.
+                Set this to at least the number of threads sharing the client.
+            pool_block (bool, optional): Block when the pool is exhausted instead
+                of opening throwaway connections
+            keep_alive (bool, optional): Keep connections open between requests
+            session (requests.Session, optional): Pre-configured session to use.
+                The client will not close a session it did not create.
+            **options: Shared client options such as retry_policy,
+                rate_limiter, cache, coalesce and compression (see BaseApiClient)
+        """
+        super().__init__(api_key, base_url, keep_alive=keep_alive, **options)
+        self._owns_session = session is None
+        self.session = session or self._create_session(
+            pool_connections or self.DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize or self.DEFAULT_POOL_MAXSIZE,
+            pool_block
+        )
+        
+    @staticmethod
+    def _create_session(pool_connections, pool_maxsize, pool_block):
+        """
+        Create a session with a sized connection pool
+        
+        Args:
+            pool_connections (int): Number of host connection pools to cache
+            pool_maxsize (int): Maximum number of connections kept per host
+            pool_block (bool): Block when the pool is exhausted
+            
+        Returns:
+            requests.Session: Configured session
+        """
+        session = requests.Session()
+        adapter = _TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
         
     def post(self, endpoint, data=None):
         """
@@ -33,39 +395,378 @@ class ApiClient:
             dict: Response data
             
         Raises:
-            ApiError: If the API request fails
+            ApiError: If the API request fails. ``retries`` holds the number
+                of retries made before giving up.
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "x-api-key": self.api_key,
-            "Accept-Encoding": "deflate",
-            "Content-Type": "application/json"
-        }
+        if self.single_flight is not None:
+            return self.single_flight.do(
+                request_key(endpoint, data),
+                lambda: self._cached_post(endpoint, data)
+            )
+            
+        return self._cached_post(endpoint, data)
         
+    def _cached_post(self, endpoint, data):
+        """Serve the request from the cache when possible"""
+        if self.cache is not None and self.cache.cacheable(endpoint):
+            cached = self.cache.get(endpoint, data, self.codec)
+            if cached is not None:
+                return self._from_cache(endpoint, cached)
+                
+            result = self._post(endpoint, data)
+            self.cache.set(endpoint, data, result, self.codec)
+            return result
+            
+        return self._post(endpoint, data)
+        
+    def _post(self, endpoint, data):
+        """Send the request, retrying transient failures"""
+        trace = self._trace(endpoint)
+        response = self._send_with_retry(endpoint, data, self._send, trace, hedged=True)
+        
+        started = time.perf_counter()
         try:
-            response = requests.post(
-                url, 
-                headers=headers,
-                json=data or {}
-            )
+            result, error = self._decode_response(endpoint, response.content), None
+        except ValueError as e:
+            result, error = None, self._network_error(e)
+        trace.record("decode", time.perf_counter() - started)
+        trace.respond(response.status_code, len(response.content))
+        
+        if error is not None:
+            trace.fail(error)
+            raise error
+        return result
+        
+
+    def stream(self, endpoint, data=None):
+        """
+        Make a POST request and iterate the server-sent events it streams back
+        
+        Failures before the response starts are retried like :meth:`post`.
+        Streamed responses are never cached, coalesced or hedged.
+        
+        Args:
+            endpoint (str): API endpoint
+            data (dict, optional): Request body
             
-            if not response.ok:
+        Yields:
+            ServerSentEvent: Events with their JSON ``data`` decoded. A server
+                that answers with a plain JSON body yields one ``"result"`` event.
+                
+        Raises:
+            ApiError: If the request fails, the stream breaks off or the
+                server sends an ``error`` event
+        """
+        trace = self._trace(endpoint)
+        response = self._send_with_retry(endpoint, data, self._open_stream, trace)
+        trace.respond(response.status_code, None)
+        with response:
+            if not self._is_event_stream(response.headers.get("Content-Type", "")):
+                yield self._result_event(response.content)
+                return
+                
+            try:
+                for event in iter_sse(response.iter_content(chunk_size=None)):
+                    yield self._decode_event(event)
+            except requests.RequestException as e:
+                raise self._network_error(e)
+                
+    def _send_with_retry(self, endpoint, data, send, trace, hedged=False):
+        """
+        Send a request with ``send``, retrying transient failures
+        
+        Attempts race a hedged duplicate when ``hedged`` is set and the
+        client's HedgePolicy covers the endpoint.
+        
+        Returns:
+            requests.Response: The first successful response
+        """
+        url = f"{self.base_url}{endpoint}"
+        started = time.perf_counter()
+        headers, body = self._prepare_request(data)
+        trace.record("encode", time.perf_counter() - started)
+        send_attempt = self._hedged_attempt if hedged else self._send_attempt
+        attempt = 1
+        
+        while True:
+            retry_after = None
+            
+            if self.rate_limiter:
+                started = time.perf_counter()
+                self.rate_limiter.acquire(endpoint)
+                trace.record("rate_limit", time.perf_counter() - started)
+                
+            try:
+                response = send_attempt(send, endpoint, url, headers, body, trace, attempt)
+            except CircuitOpenError as e:
+                trace.fail(e)
+                raise
+            except requests.RequestException as e:
+                error = self._network_error(e)
+            else:
+                trace.add(getattr(response, "_phase_timings", None))
+                if response.ok:
+                    return response
+                    
                 try:
-                    error_data = response.json()
-                except (ValueError, json.JSONDecodeError):
+                    error_data = self._decode(response.content)
+                except ValueError:
                     error_data = {}
                     
-                raise ApiError(
-                    error_data.get("message") or f"HTTP error {response.status_code}",
-                    response.status_code,
-                    error_data
-                )
+                trace.respond(response.status_code, len(response.content))
+                error = self._http_error(response.status_code, error_data)
+                retry_after = response.headers.get("Retry-After")
                 
-            return response.json()
+            if not self._should_retry(endpoint, error, attempt):
+                error.retries = attempt - 1
+                trace.fail(error)
+                raise error
+                
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+            trace.retry(error, delay)
+            time.sleep(delay)
+            attempt += 1
             
-        except requests.RequestException as e:
-            raise ApiError(
-                str(e) or "Network error",
-                0,
-                {"original_error": str(e)}
-            ) 
\ No newline at end of file
+    def _send_attempt(self, send, endpoint, url, headers, body, trace, attempt, hedge=False):
+        """
+        Send one attempt with ``send``, guarded by the circuit breaker and
+        holding a slot of its adaptive concurrency limit
+        
+        A hedged duplicate (``hedge``) never waits for a slot.
+        
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            _HedgeSkipped: If ``hedge`` is set and no slot is free
+        """
+        probe = False
+        if self.circuit_breaker is not None:
+            probe = self.circuit_breaker.check(endpoint, retries=attempt - 1)
+            
+        limit = self.adaptive_concurrency.limiter(endpoint) if self.adaptive_concurrency else None
+        if limit is not None and hedge:
+            if not limit.try_acquire():
+                self._finish_attempt(endpoint, None, probe, 0.0, None)
+                raise _HedgeSkipped()
+        elif limit is not None:
+            started = time.perf_counter()
+            limit.acquire()
+            trace.record("concurrency", time.perf_counter() - started)
+            
+        status = None
+        sent = False
+        started = time.perf_counter()
+        try:
+            trace.start(attempt, len(body))
+            sent = True
+            response = send(endpoint, url, headers, body)
+            status = response.status_code
+            return response
+        except requests.RequestException:
+            status = 0
+            raise
+        finally:
+            self._finish_attempt(endpoint, limit, probe, time.perf_counter() - started, status)
+            if sent and status is None:
+                # Cancelled or interrupted, so no other event ends the attempt
+                trace.abandon()
+            
+    def _send(self, endpoint, url, headers, body):
+        """Send one attempt over the pooled session and read the response"""
+        response, received = self._timed_post(url, headers, body)
+        response.content  # Read the body now so its transfer is timed on its own
+        response._phase_timings["transfer"] = time.perf_counter() - received
+        return response
+        
+    def _open_stream(self, endpoint, url, headers, body):
+        """Send one attempt asking for an event stream, without reading the body"""
+        response, _ = self._timed_post(url, {**headers, "Accept": STREAM_ACCEPT}, body)
+        return response
+        
+    def _timed_post(self, url, headers, body):
+        """
+        Send a POST and wait for the response headers, timing each phase
+        
+        Returns:
+            tuple: ``(response, received)``, where ``received`` is the
+                ``time.perf_counter()`` reading when the headers arrived.
+                The phase timings are stored on ``response._phase_timings``.
+        """
+        phases = _connection_phases.current = {}
+        started = time.perf_counter()
+        response = self.session.post(url, headers=headers, data=body, stream=True)
+        received = time.perf_counter()
+        
+        phases["ttfb"] = received - started - phases.get("connect", 0.0) - phases.get("tls", 0.0)
+        response._phase_timings = phases
+        return response, received
+        
+    def _send_hedge(self, send, endpoint, url, headers, body, trace, attempt):
+        """Send a duplicate attempt, paced and guarded like any other attempt"""
+        if self.rate_limiter:
+            started = time.perf_counter()
+            self.rate_limiter.acquire(endpoint)
+            trace.record("rate_limit", time.perf_counter() - started)
+            
+        return self._send_attempt(send, endpoint, url, headers, body, trace, attempt, hedge=True)
+        
+    def _hedged_attempt(self, send, endpoint, url, headers, body, trace, attempt):
+        """Send one attempt, racing a duplicate against it if it runs slow"""
+        policy = self.hedge_policy
+        if policy is None or not policy.hedges(endpoint):
+            return self._send_attempt(send, endpoint, url, headers, body, trace, attempt)
+            
+        start = time.monotonic()
+        delay = policy.hedge_delay(endpoint)
+        if delay is None:
+            response = self._send_attempt(send, endpoint, url, headers, body, trace, attempt)
+            policy.record(endpoint, time.monotonic() - start)
+            return response
+            
+        # Each racer reports to a trace of its own; the request's trace
+        # carries on from the winner's and the loser's is abandoned
+        traces = [trace.fork()]
+        futures = [_start_thread(self._send_attempt, send, endpoint, url, headers, body, traces[0], attempt)]
+        if not wait(futures, timeout=delay).done and policy.acquire_hedge():
+            traces.append(trace.fork(hedge=True))
+            futures.append(_start_thread(
+                self._send_hedge, send, endpoint, url, headers, body, traces[1], attempt
+            ))
+            
+        winner = _first_success(futures, traces)
+        trace.adopt(traces[futures.index(winner)])
+        response = winner.result()
+        policy.record(endpoint, time.monotonic() - start, hedge_won=winner is not futures[0])
+        return response
+        
+    def close(self):
+        """Close pooled connections held by the client"""
+        if self._owns_session:
+            self.session.close()
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Connection phases timed on the current thread, for the request being sent
+_connection_phases = threading.local()
+
+
+def _record_connection_phase(phase, seconds):
+    """Add time spent opening a connection to the request on this thread"""
+    phases = getattr(_connection_phases, "current", None)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+class _TimedConnectionMixin:
+    """Times DNS lookup and TCP connect for a new connection"""
+    
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record_connection_phase("connect", time.perf_counter() - started)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    """HTTP connection that reports its connect time"""
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    """HTTPS connection that reports its connect and TLS handshake times"""
+    
+    def connect(self):
+        phases = getattr(_connection_phases, "current", None) or {}
+        connect_before = phases.get("connect", 0.0)
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            # Everything in connect() except the TCP connect is the handshake
+            tcp = phases.get("connect", 0.0) - connect_before
+            _record_connection_phase("tls", time.perf_counter() - started - tcp)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """Adapter whose connections report connect and TLS times to the request's hooks"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
+def _start_thread(func, *args):
+    """
+    Run one hedged attempt on a thread of its own
+    
+    Attempts never queue behind each other in a fixed-size pool, so hedging
+    does not cap how many requests the client's callers can run at once.
+    
+    Returns:
+        Future: Result or exception of ``func(*args)``
+    """
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+            
+    threading.Thread(target=run, name="b2brilliant-hedge", daemon=True).start()
+    return future
+
+
+def _first_success(futures, traces):
+    """
+    Wait for the first attempt that gets a response and discard the rest
+    
+    Args:
+        futures (list): Futures of the racing attempts, primary first
+        traces (list): RequestTrace of each attempt
+        
+    Returns:
+        Future: The winning future, or the primary if every attempt failed
+    """
+    winner = None
+    pending = set(futures)
+    while pending and winner is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = next((f for f in futures if f in done and f.exception() is None), None)
+        
+    winner = winner or futures[0]
+    for future, trace in zip(futures, traces):
+        if future is not winner:
+            # A request already on the wire can't be aborted, so the loser's
+            # response is closed as soon as it arrives
+            future.cancel()
+            future.add_done_callback(functools.partial(_discard_response, trace))
+    return winner
+
+
+def _discard_response(trace, future):
+    """End a losing attempt and release the connection it holds"""
+    if future.cancelled():
+        return
+    if trace.attempt:
+        # Started, and no other event will end it
+        trace.abandon()
+    if future.exception() is None:
+        future.result().close()
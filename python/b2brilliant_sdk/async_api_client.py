@@ -0,0 +1,453 @@
+"""
+Asynchronous API Client for making HTTP requests to the B2B Campaign Agent API
+"""
+
+import asyncio
+import functools
+import time
+from .api_client import STREAM_ACCEPT, BaseApiClient
+from .coalesce import AsyncSingleFlight, request_key
+from .exceptions import CircuitOpenError
+from .hedge import _HedgeSkipped
+from .sse import aiter_sse
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the async extra
+    httpx = None
+
+try:
+    from httpx._decoders import SUPPORTED_DECODERS
+except ImportError:  # pragma: no cover - fall back to what every httpx version decodes
+    SUPPORTED_DECODERS = {"gzip": None, "deflate": None}
+
+# httpcore trace events that mark connection phases
+TRACE_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls"
+}
+
+
+class AsyncApiClient(BaseApiClient):
+    """Asynchronous API Client for the B2B Campaign Agent API"""
+    
+    SINGLE_FLIGHT_CLASS = AsyncSingleFlight
+    SUPPORTED_ENCODINGS = tuple(SUPPORTED_DECODERS)
+    
+    DEFAULT_MAX_CONNECTIONS = 100
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+    
+    def __init__(self, api_key, base_url, max_connections=None, max_keepalive_connections=None,
+                 keep_alive=True, max_concurrency=None, timeout=None, client=None, **options):
+        """
+        Create a new asynchronous API client
+        
+        Requires the optional ``httpx`` dependency
+        (``pip install b2brilliant_sdk[async]``).
+        
+        Args:
+            api_key (str): API key for authentication
+            base_url (str): Base URL for the API
+            max_connections (int, optional): Maximum number of open connections
+            max_keepalive_connections (int, optional): Maximum number of idle
+                connections kept in the pool
+            keep_alive (bool, optional): Keep connections open between requests
+            max_concurrency (int, optional): Maximum number of requests in flight
+                at once. Extra calls wait on a semaphore instead of queueing on
+                the connection pool. An open stream holds its slot until it is
+                closed.
+            timeout (float, optional): Request timeout in seconds. LLM-backed
+                endpoints can take minutes, so there is no timeout by default.
+            client (httpx.AsyncClient, optional): Pre-configured client to use.
+                The API client will not close a client it did not create.
+            **options: Shared client options such as retry_policy,
+                rate_limiter, cache, coalesce and compression (see BaseApiClient)
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncApiClient requires httpx. Install it with: pip install b2brilliant_sdk[async]"
+            )
+            
+        super().__init__(api_key, base_url, keep_alive=keep_alive, **options)
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections or self.DEFAULT_MAX_CONNECTIONS,
+                max_keepalive_connections=(
+                    max_keepalive_connections or self.DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+                )
+            ),
+            timeout=timeout
+        )
+        
+    async def post(self, endpoint, data=None):
+        """
+        Make a POST request to the API
+        
+        Args:
+            endpoint (str): API endpoint
+            data (dict, optional): Request body
+            
+        Returns:
+            dict: Response data
+            
+        Raises:
+            ApiError: If the API request fails. ``retries`` holds the number
+                of retries made before giving up.
+        """
+        if self.single_flight is not None:
+            return await self.single_flight.do(
+                request_key(endpoint, data),
+                lambda: self._cached_post(endpoint, data)
+            )
+            
+        return await self._cached_post(endpoint, data)
+        
+    async def _cached_post(self, endpoint, data):
+        """Serve the request from the cache when possible"""
+        if self.cache is not None and self.cache.cacheable(endpoint):
+            cached = await self._cache_call(self.cache.get, endpoint, data, self.codec)
+            if cached is not None:
+                return self._from_cache(endpoint, cached)
+                
+            result = await self._post(endpoint, data)
+            await self._cache_call(self.cache.set, endpoint, data, result, self.codec)
+            return result
+            
+        return await self._post(endpoint, data)
+        
+    async def _cache_call(self, method, *args):
+        """Call a cache method, on the default executor when its backend does I/O"""
+        if not self.cache.blocking:
+            return method(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+        
+    async def _post(self, endpoint, data):
+        """Send the request, retrying transient failures"""
+        trace = self._trace(endpoint)
+        response = await self._send_with_retry(endpoint, data, self._send, trace, hedged=True)
+        
+        started = time.perf_counter()
+        try:
+            result, error = self._decode_response(endpoint, response.content), None
+        except ValueError as e:
+            result, error = None, self._network_error(e)
+        trace.record("decode", time.perf_counter() - started)
+        trace.respond(response.status_code, len(response.content))
+        
+        if error is not None:
+            trace.fail(error)
+            raise error
+        return result
+        
+
+    async def stream(self, endpoint, data=None):
+        """
+        Make a POST request and iterate the server-sent events it streams back
+        
+        Accepts the same arguments as :meth:`ApiClient.stream`.
+        
+        Yields:
+            ServerSentEvent: Events with their JSON ``data`` decoded
+            
+        Raises:
+            ApiError: If the request fails, the stream breaks off or the
+                server sends an ``error`` event
+        """
+        trace = self._trace(endpoint)
+        response = await self._send_with_retry(endpoint, data, self._open_stream, trace)
+        trace.respond(response.status_code, None)
+        try:
+            if not self._is_event_stream(response.headers.get("Content-Type", "")):
+                await response.aread()
+                yield self._result_event(response.content)
+                return
+                
+            try:
+                async for event in aiter_sse(response.aiter_bytes()):
+                    yield self._decode_event(event)
+            except httpx.HTTPError as e:
+                raise self._network_error(e)
+        finally:
+            await response.aclose()
+            if response._slot is not None:
+                response._slot.release()
+                
+    async def _send_with_retry(self, endpoint, data, send, trace, hedged=False):
+        """
+        Send a request with ``send``, retrying transient failures
+        
+        Attempts race a hedged duplicate when ``hedged`` is set and the
+        client's HedgePolicy covers the endpoint.
+        
+        Returns:
+            httpx.Response: The first successful response
+        """
+        url = f"{self.base_url}{endpoint}"
+        started = time.perf_counter()
+        headers, body = self._prepare_request(data)
+        trace.record("encode", time.perf_counter() - started)
+        send_attempt = self._hedged_attempt if hedged else self._send_attempt
+        attempt = 1
+        
+        while True:
+            retry_after = None
+            
+            if self.rate_limiter:
+                # Reserve a slot without blocking the event loop
+                delay = self.rate_limiter.reserve(endpoint)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    trace.record("rate_limit", delay)
+                    
+            try:
+                response = await send_attempt(send, endpoint, url, headers, body, trace, attempt)
+            except CircuitOpenError as e:
+                trace.fail(e)
+                raise
+            except httpx.HTTPError as e:
+                error = self._network_error(e)
+            else:
+                trace.add(getattr(response, "_phase_timings", None))
+                if response.is_success:
+                    return response
+                    
+                try:
+                    error_data = self._decode(response.content)
+                except ValueError:
+                    error_data = {}
+                    
+                trace.respond(response.status_code, len(response.content))
+                error = self._http_error(response.status_code, error_data)
+                retry_after = response.headers.get("Retry-After")
+                
+            if not self._should_retry(endpoint, error, attempt):
+                error.retries = attempt - 1
+                trace.fail(error)
+                raise error
+                
+            delay = self.retry_policy.get_delay(attempt, retry_after)
+            trace.retry(error, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            
+    async def _send_attempt(self, send, endpoint, url, headers, body, trace, attempt, hedge=False):
+        """
+        Send one attempt with ``send``, guarded by the circuit breaker and
+        holding a slot of its adaptive concurrency limit
+        
+        A hedged duplicate (``hedge``) never waits for a slot.
+        
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            _HedgeSkipped: If ``hedge`` is set and no slot is free
+        """
+        probe = False
+        if self.circuit_breaker is not None:
+            probe = self.circuit_breaker.check(endpoint, retries=attempt - 1)
+            
+        limit = self.adaptive_concurrency.limiter(endpoint) if self.adaptive_concurrency else None
+        if limit is not None and hedge:
+            if not limit.try_acquire():
+                self._finish_attempt(endpoint, None, probe, 0.0, None)
+                raise _HedgeSkipped()
+        elif limit is not None:
+            started = time.perf_counter()
+            await limit.acquire_async()
+            trace.record("concurrency", time.perf_counter() - started)
+            
+        status = None
+        sent = False
+        started = time.perf_counter()
+        try:
+            trace.start(attempt, len(body))
+            sent = True
+            response = await send(endpoint, url, headers, body)
+            status = response.status_code
+            return response
+        except httpx.HTTPError:
+            status = 0
+            raise
+        finally:
+            self._finish_attempt(endpoint, limit, probe, time.perf_counter() - started, status)
+            if sent and status is None:
+                # Cancelled or interrupted, so no other event ends the attempt
+                trace.abandon()
+            
+    def _concurrency_slots(self):
+        """Semaphore capping requests in flight at ``max_concurrency``, or None"""
+        if not self.max_concurrency:
+            return None
+            
+        # Created lazily so the semaphore binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+        
+    async def _send(self, endpoint, url, headers, body):
+        """Send one attempt, holding a concurrency slot only while it is in flight"""
+        slots = self._concurrency_slots()
+        if slots is None:
+            return await self._send_and_read(url, headers, body)
+            
+        async with slots:
+            return await self._send_and_read(url, headers, body)
+            
+    async def _send_and_read(self, url, headers, body):
+        """Send a POST and read the response, timing the body transfer on its own"""
+        response, received = await self._timed_post(url, headers, body)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        response._phase_timings["transfer"] = time.perf_counter() - received
+        return response
+        
+    async def _open_stream(self, endpoint, url, headers, body):
+        """
+        Send one attempt asking for an event stream, without reading a successful body
+        
+        A successful response keeps its concurrency slot in ``_slot`` while
+        the body streams, for :meth:`stream` to release once it is closed.
+        """
+        slots = self._concurrency_slots()
+        if slots is not None:
+            await slots.acquire()
+            
+        held = False
+        try:
+            response, _ = await self._timed_post(url, {**headers, "Accept": STREAM_ACCEPT}, body)
+            if response.is_success:
+                response._slot, held = slots, True
+            else:
+                # Error bodies are small and are decoded by the retry loop
+                await response.aread()
+            return response
+        finally:
+            if slots is not None and not held:
+                slots.release()
+        
+    async def _timed_post(self, url, headers, body):
+        """
+        Send a POST and wait for the response headers, timing each phase
+        
+        Returns:
+            tuple: ``(response, received)``, where ``received`` is the
+                ``time.perf_counter()`` reading when the headers arrived.
+                The phase timings are stored on ``response._phase_timings``.
+        """
+        phases = {}
+        started_at = {}
+        
+        async def trace(name, info):
+            step, _, stage = name.rpartition(".")
+            if step not in TRACE_PHASES:
+                return
+            if stage == "started":
+                started_at[step] = time.perf_counter()
+            elif step in started_at:
+                phases[TRACE_PHASES[step]] = time.perf_counter() - started_at.pop(step)
+                
+        request = self.client.build_request(
+            "POST",
+            url,
+            headers=headers,
+            content=body,
+            extensions={"trace": trace}
+        )
+        started = time.perf_counter()
+        response = await self.client.send(request, stream=True)
+        received = time.perf_counter()
+        
+        phases["ttfb"] = received - started - phases.get("connect", 0.0) - phases.get("tls", 0.0)
+        response._phase_timings = phases
+        return response, received
+        
+    async def _send_hedge(self, send, endpoint, url, headers, body, trace, attempt):
+        """Send a duplicate attempt, paced and guarded like any other attempt"""
+        if self.rate_limiter:
+            delay = self.rate_limiter.reserve(endpoint)
+            if delay > 0:
+                await asyncio.sleep(delay)
+                trace.record("rate_limit", delay)
+                
+        return await self._send_attempt(send, endpoint, url, headers, body, trace, attempt, hedge=True)
+        
+    async def _hedged_attempt(self, send, endpoint, url, headers, body, trace, attempt):
+        """Send one attempt, racing a duplicate against it if it runs slow"""
+        policy = self.hedge_policy
+        if policy is None or not policy.hedges(endpoint):
+            return await self._send_attempt(send, endpoint, url, headers, body, trace, attempt)
+            
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        delay = policy.hedge_delay(endpoint)
+        if delay is None:
+            response = await self._send_attempt(send, endpoint, url, headers, body, trace, attempt)
+            policy.record(endpoint, loop.time() - start)
+            return response
+            
+        # Each racer reports to a trace of its own; the request's trace
+        # carries on from the winner's and the loser's is abandoned
+        traces = [trace.fork()]
+        tasks = [asyncio.ensure_future(self._send_attempt(send, endpoint, url, headers, body, traces[0], attempt))]
+        winner = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and policy.acquire_hedge():
+                traces.append(trace.fork(hedge=True))
+                tasks.append(asyncio.ensure_future(
+                    self._send_hedge(send, endpoint, url, headers, body, traces[1], attempt)
+                ))
+                
+            winner = await _first_success(tasks)
+        finally:
+            # Cancel the loser, or every attempt if the caller was cancelled
+            for task, racer in zip(tasks, traces):
+                if task is not winner:
+                    task.cancel()
+                    task.add_done_callback(functools.partial(_end_loser, racer))
+                    
+        trace.adopt(traces[tasks.index(winner)])
+        response = winner.result()
+        policy.record(endpoint, loop.time() - start, hedge_won=winner is not tasks[0])
+        return response
+        
+    async def aclose(self):
+        """Close pooled connections held by the client"""
+        if self._owns_client:
+            await self.client.aclose()
+            
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+def _end_loser(trace, task):
+    """End a losing attempt that finished before it could be cancelled"""
+    # A cancelled attempt already reported itself as abandoned
+    if not task.cancelled() and trace.attempt:
+        trace.abandon()
+
+
+async def _first_success(tasks):
+    """
+    Wait for the first attempt that gets a response
+    
+    Args:
+        tasks (list): Racing attempts, primary first
+        
+    Returns:
+        asyncio.Task: The winning task, or the primary if every attempt failed
+    """
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done and task.exception() is None:
+                return task
+    return tasks[0]
@@ -0,0 +1,352 @@
+"""
+Bounded-concurrency batch helpers for running many API calls at once
+"""
+
+import asyncio
+import heapq
+from collections import namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .exceptions import ApiError, ValidationError
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Failed results kept by select_top; the rest are only counted
+DEFAULT_MAX_FAILED = 100
+
+
+class BatchResult(namedtuple("BatchResult", ["index", "input", "result", "error"])):
+    """
+    Outcome of a single item in a batch
+    
+    Attributes:
+        index (int): Position of the item in the input
+        input: The input item
+        result: Response data, or None if the call failed
+        error (Exception): ApiError or ValidationError raised for the item, or None
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def ok(self):
+        """bool: Whether the call succeeded"""
+        return self.error is None
+
+
+class TopResults(namedtuple("TopResults", ["top", "failed", "completed", "failed_count"])):
+    """
+    Best results selected from a batch
+    
+    Attributes:
+        top (list): BatchResult objects, best score first
+        failed (list): The first ``max_failed`` BatchResult objects whose
+            call raised an SDK error
+        completed (int): Number of calls that finished before selection stopped
+        failed_count (int): Number of calls that raised an SDK error,
+            including those not kept in ``failed``
+    """
+    
+    __slots__ = ()
+
+
+class _TopSelector:
+    """Keeps the ``top_k`` best-scoring results in a bounded min-heap"""
+    
+    def __init__(self, top_k, score, min_score, max_failed):
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        if max_failed < 0:
+            raise ValueError("max_failed must not be negative")
+            
+        self.top_k = top_k
+        self.score = score
+        self.min_score = min_score
+        self.max_failed = max_failed
+        self.cleared = 0
+        self.completed = 0
+        self.failed = []
+        self.failed_count = 0
+        self._heap = []
+        
+    def add(self, result):
+        """Consider one finished result"""
+        self.completed += 1
+        if not result.ok:
+            self.failed_count += 1
+            if len(self.failed) < self.max_failed:
+                self.failed.append(result)
+            return
+            
+        score = self.score(result.result)
+        if not isinstance(score, (int, float)):
+            return
+        if self.min_score is not None and score < self.min_score:
+            return
+            
+        self.cleared += 1
+        # Ties go to the earlier input, so the heap root is the lowest score
+        # with the highest index
+        entry = (score, -result.index, result)
+        if self.top_k is None or len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            
+    def results(self):
+        """Build the final TopResults"""
+        top = [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+        return TopResults(top, self.failed, self.completed, self.failed_count)
+
+
+def select_top(results, top_k=None, score=None, min_score=None, stop_after=None,
+               max_failed=DEFAULT_MAX_FAILED):
+    """
+    Select the best results from a stream of BatchResult
+    
+    Only ``top_k`` results and ``max_failed`` failures are held at a time,
+    so memory stays constant no matter how long the stream is.
+    
+    Args:
+        results (iterable): BatchResult objects, typically from
+            ``run_batch(..., as_completed=True)``
+        top_k (int, optional): Number of results to keep. All results that
+            clear ``min_score`` are kept when omitted.
+        score (callable, optional): Maps a result to its score. Defaults to
+            ``result["score"]``. Results without a numeric score are skipped.
+        min_score (float, optional): Minimum score for a result to be kept
+        stop_after (int, optional): Stop reading the stream once this many
+            results have cleared ``min_score``. Calls not yet started are
+            cancelled.
+        max_failed (int, optional): Number of failed results to keep. Later
+            failures are only counted in ``failed_count``.
+            
+    Returns:
+        TopResults: Best results first, plus failed items
+    """
+    selector = _TopSelector(top_k, score or _default_score, min_score, max_failed)
+    try:
+        for result in results:
+            selector.add(result)
+            if stop_after is not None and selector.cleared >= stop_after:
+                break
+    finally:
+        close = getattr(results, "close", None)
+        if close is not None:
+            close()
+    return selector.results()
+
+
+async def select_top_async(results, top_k=None, score=None, min_score=None, stop_after=None,
+                           max_failed=DEFAULT_MAX_FAILED):
+    """
+    Select the best results from an async stream of BatchResult
+    
+    Asynchronous counterpart of :func:`select_top`.
+    
+    Returns:
+        TopResults: Best results first, plus failed items
+    """
+    selector = _TopSelector(top_k, score or _default_score, min_score, max_failed)
+    try:
+        async for result in results:
+            selector.add(result)
+            if stop_after is not None and selector.cleared >= stop_after:
+                break
+    finally:
+        close = getattr(results, "aclose", None)
+        if close is not None:
+            await close()
+    return selector.results()
+
+
+def _default_score(result):
+    """Read the ``score`` field of a response"""
+    return result.get("score") if isinstance(result, Mapping) else None
+
+
+def run_batch(func, items, max_concurrency=DEFAULT_MAX_CONCURRENCY, as_completed=False, dedupe_key=None,
+              executor=None):
+    """
+    Call ``func`` for every item on a thread pool
+    
+    At most ``max_concurrency`` calls run at once and only a small window of
+    items is read ahead, so arbitrarily long iterables run in bounded memory.
+    API and validation errors are captured per item instead of aborting the
+    batch; any other exception propagates.
+    
+    Args:
+        func (callable): Function called with a single item
+        items (iterable): Items to process
+        max_concurrency (int, optional): Maximum number of calls in flight
+        as_completed (bool, optional): Yield results as they finish instead
+            of in input order
+        dedupe_key (callable, optional): Maps an item to a hashable key.
+            An item whose key already has a call in flight does not get its
+            own call; it waits, without taking a worker, and gets that call's
+            result or error. Keys are released when their call finishes, so
+            a later duplicate calls again (use a ResponseCache to reuse
+            finished responses).
+        executor (concurrent.futures.Executor, optional): Pool to run the
+            calls on, such as a ProcessPoolExecutor with ``max_concurrency``
+            workers. The caller shuts it down. A thread pool owned by the
+            batch is used when omitted.
+            
+    Yields:
+        BatchResult: One result per input item
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+        
+    window = max_concurrency * 2
+    source = enumerate(items)
+    pending = {}
+    buffered = {}
+    followers = _Followers(dedupe_key)
+    next_index = 0
+    
+    owned = executor is None
+    if owned:
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    try:
+        while True:
+            # Ordered mode counts buffered results against the window so a
+            # slow head-of-line item cannot make the buffer grow unbounded.
+            # Duplicates waiting on an in-flight key count too.
+            while len(pending) + len(followers) + len(buffered) < window:
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    break
+                if not followers.join(index, item):
+                    continue
+                pending[executor.submit(func, item)] = (index, item)
+                
+            if not pending:
+                break
+                
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                for result in followers.collect(index, item, future.result):
+                    if as_completed:
+                        yield result
+                    else:
+                        buffered[result.index] = result
+                        
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=True)
+
+
+async def run_batch_async(func, items, max_concurrency=DEFAULT_MAX_CONCURRENCY, as_completed=False,
+                          dedupe_key=None):
+    """
+    Await ``func`` for every item with bounded concurrency
+    
+    Asynchronous counterpart of :func:`run_batch`.
+    
+    Args:
+        func (callable): Coroutine function called with a single item
+        items (iterable): Items to process
+        max_concurrency (int, optional): Maximum number of calls in flight
+        as_completed (bool, optional): Yield results as they finish instead
+            of in input order
+        dedupe_key (callable, optional): Maps an item to a hashable key.
+            Items with the same key share an in-flight call (see
+            :func:`run_batch`).
+            
+    Yields:
+        BatchResult: One result per input item
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+        
+    window = max_concurrency
+    source = enumerate(items)
+    pending = {}
+    buffered = {}
+    followers = _Followers(dedupe_key)
+    next_index = 0
+    
+    try:
+        while True:
+            while len(pending) + len(followers) + len(buffered) < window:
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    break
+                if not followers.join(index, item):
+                    continue
+                pending[asyncio.ensure_future(func(item))] = (index, item)
+                
+            if not pending:
+                break
+                
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, item = pending.pop(task)
+                for result in followers.collect(index, item, task.result):
+                    if as_completed:
+                        yield result
+                    else:
+                        buffered[result.index] = result
+                        
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class _Followers:
+    """
+    Duplicates of in-flight items, keyed by ``dedupe_key``
+    
+    Only keys with a call in flight are tracked. A key is released as soon
+    as its call finishes, so memory is bounded by the batch window.
+    """
+    
+    def __init__(self, key):
+        self.key = key
+        self._waiting = {}
+        self._count = 0
+        
+    def __len__(self):
+        return self._count
+        
+    def join(self, index, item):
+        """Register an item, returning True if it needs its own call"""
+        if self.key is None:
+            return True
+        item_key = self.key(item)
+        waiting = self._waiting.get(item_key)
+        if waiting is None:
+            self._waiting[item_key] = []
+            return True
+        waiting.append((index, item))
+        self._count += 1
+        return False
+        
+    def collect(self, index, item, get_result):
+        """Build results for a finished call and every duplicate waiting on it"""
+        results = [_collect(index, item, get_result)]
+        if self.key is not None:
+            waiting = self._waiting.pop(self.key(item))
+            self._count -= len(waiting)
+            results.extend(_collect(i, other, get_result) for i, other in waiting)
+        return results
+
+
+def _collect(index, item, get_result):
+    """Wrap a finished call in a BatchResult, capturing SDK errors"""
+    try:
+        return BatchResult(index, item, get_result(), None)
+    except (ApiError, ValidationError) as e:
+        return BatchResult(index, item, None, e)
@@ -2,8 +2,19 @@
 Business service for interacting with target business API endpoints
 """
 
+from collections.abc import Mapping
 from .endpoints import BUSINESS_ENDPOINTS
 from .exceptions import ValidationError
+from .profile import BusinessProfile
+from .urls import canonical_urls, discover_key
+from .batch import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_FAILED,
+    run_batch,
+    run_batch_async,
+    select_top,
+    select_top_async
+)
 
 
 class BusinessService:
@@ -29,12 +40,51 @@ class BusinessService:
                 - deep_search (bool): Whether to perform a deep search
                     
         Returns:
-            dict: Business information
+            BusinessProfile: Business information
             
         Raises:
             ValidationError: If the input is invalid
             ApiError: If the API request fails
         """
+        return BusinessProfile.of(self.api_client.post(
+            BUSINESS_ENDPOINTS["DISCOVER"],
+            self._discover_payload(urls, options)
+        ))
+        
+    def discover_many(self, url_batches, options=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                      as_completed=False, dedupe=True):
+        """
+        Run :meth:`discover` for many businesses in parallel
+        
+        Results are produced lazily; wrap the call in ``list()`` to collect
+        them all. A failing item does not abort the batch: its ApiError or
+        ValidationError is returned on the corresponding result instead.
+        
+        Args:
+            url_batches (iterable): URL lists, one per business to discover
+            options (dict, optional): Discovery options applied to every batch,
+                as accepted by :meth:`discover`
+            max_concurrency (int, optional): Maximum number of requests in flight
+            as_completed (bool, optional): Yield results as they finish instead
+                of in input order
+            dedupe (bool, optional): Share calls between duplicates. A URL
+                list that is the same after canonicalization (see
+                :func:`~b2brilliant_sdk.urls.canonicalize_url`) as one whose
+                call is still in flight waits for that call's result.
+                
+        Yields:
+            BatchResult: Result or error for each URL list, with its input index
+        """
+        return run_batch(
+            lambda urls: self.discover(urls, options),
+            url_batches,
+            max_concurrency,
+            as_completed,
+            dedupe_key=discover_key if dedupe else None
+        )
+        
+    def _discover_payload(self, urls, options):
+        """Validate discover input and build the request body"""
         if not urls or not isinstance(urls, list):
             raise ValidationError("URLs must be a non-empty list", {"urls": "Must be a non-empty list"})
             
@@ -47,13 +97,13 @@ class BusinessService:
                 elif key == "deep_search":
                     transformed_options["deepSearch"] = value
                         
-        return self.api_client.post(
-            BUSINESS_ENDPOINTS["DISCOVER"],
-            {
-                "urls": urls,
-                **transformed_options
-            }
-        )
+        if getattr(self.api_client, "canonicalize_urls", False):
+            urls = canonical_urls(urls)
+            
+        return {
+            "urls": urls,
+            **transformed_options
+        }
         
     def refine(self, business_data, additional_info):
         """
@@ -64,13 +114,20 @@ class BusinessService:
             additional_info (str): Additional information to refine with
             
         Returns:
-            dict: Refined business information
+            BusinessProfile: Refined business information
             
         Raises:
             ValidationError: If the input is invalid
             ApiError: If the API request fails
         """
-        if not business_data or not isinstance(business_data, dict):
+        return BusinessProfile.of(self.api_client.post(
+            BUSINESS_ENDPOINTS["REFINE"],
+            self._refine_payload(business_data, additional_info)
+        ))
+        
+    def _refine_payload(self, business_data, additional_info):
+        """Validate refine input and build the request body"""
+        if not business_data or not isinstance(business_data, Mapping):
             raise ValidationError(
                 "business_data must be a dictionary", 
                 {"business_data": "Must be a dictionary"}
@@ -82,13 +139,10 @@ class BusinessService:
                 {"additional_info": "Must be a non-empty string"}
             )
             
-        return self.api_client.post(
-            BUSINESS_ENDPOINTS["REFINE"],
-            {
-                "businessData": business_data,
-                "additionalInfo": additional_info
-            }
-        )
+        return {
+            "businessData": business_data,
+            "additionalInfo": additional_info
+        }
         
     def compatibility(self, user_business, target_business):
         """
@@ -105,22 +159,170 @@ class BusinessService:
             ValidationError: If the input is invalid
             ApiError: If the API request fails
         """
-        if not user_business or not isinstance(user_business, dict):
+        return self.api_client.post(
+            BUSINESS_ENDPOINTS["COMPATIBILITY"],
+            self._compatibility_payload(user_business, target_business)
+        )
+        
+    def compatibility_many(self, user_business, targets, top_k=None, min_score=None,
+                           stop_after=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                           max_failed=DEFAULT_MAX_FAILED):
+        """
+        Score one user business against many targets and keep the best
+        
+        Calls run in parallel and are ranked as they finish. Only the
+        ``top_k`` best results and ``max_failed`` failures are held at a
+        time, so memory stays constant however many targets are scored. Targets are read lazily, so
+        ``targets`` may be a generator.
+        
+        Args:
+            user_business (dict): User business data
+            targets (iterable): Target business dicts
+            top_k (int, optional): Number of best results to keep. Every
+                result that clears ``min_score`` is kept when omitted.
+            min_score (float, optional): Minimum compatibility score to keep
+            stop_after (int, optional): Stop once this many targets have
+                cleared ``min_score``. Calls that have not started are
+                cancelled; calls in flight are allowed to finish.
+            max_concurrency (int, optional): Maximum number of requests in flight
+            max_failed (int, optional): Number of failed targets to keep.
+                Later failures are only counted.
+                
+        Returns:
+            TopResults: ``top`` holds BatchResult objects (input target and
+                compatibility result) best first, ``failed`` holds the first
+                targets whose call raised an ApiError or ValidationError and
+                ``failed_count`` counts all of them
+        """
+        # Encode the shared user business once rather than once per target
+        user_business = BusinessProfile.of(user_business)
+        return select_top(
+            run_batch(
+                lambda target: self.compatibility(user_business, target),
+                targets,
+                max_concurrency,
+                as_completed=True
+            ),
+            top_k,
+            min_score=min_score,
+            stop_after=stop_after,
+            max_failed=max_failed
+        )
+        
+    def _compatibility_payload(self, user_business, target_business):
+        """Validate compatibility input and build the request body"""
+        if not user_business or not isinstance(user_business, Mapping):
             raise ValidationError(
                 "user_business must be a dictionary", 
                 {"user_business": "Must be a dictionary"}
             )
             
-        if not target_business or not isinstance(target_business, dict):
+        if not target_business or not isinstance(target_business, Mapping):
             raise ValidationError(
                 "target_business must be a dictionary", 
                 {"target_business": "Must be a dictionary"}
             )
             
-        return self.api_client.post(
+        return {
+            "userBusiness": user_business,
+            "targetBusiness": target_business
+        }
+
+
+class AsyncBusinessService(BusinessService):
+    """Asynchronous service for target business operations"""
+    
+    async def discover(self, urls, options=None):
+        """
+        Discover information about a target business
+        
+        Accepts the same arguments as :meth:`BusinessService.discover`.
+        
+        Returns:
+            BusinessProfile: Business information
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails
+        """
+        return BusinessProfile.of(await self.api_client.post(
+            BUSINESS_ENDPOINTS["DISCOVER"],
+            self._discover_payload(urls, options)
+        ))
+        
+    def discover_many(self, url_batches, options=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                      as_completed=False, dedupe=True):
+        """
+        Run :meth:`discover` for many businesses concurrently
+        
+        Accepts the same arguments as :meth:`BusinessService.discover_many` and
+        returns an async iterator of BatchResult.
+        """
+        return run_batch_async(
+            lambda urls: self.discover(urls, options),
+            url_batches,
+            max_concurrency,
+            as_completed,
+            dedupe_key=discover_key if dedupe else None
+        )
+        
+    async def refine(self, business_data, additional_info):
+        """
+        Refine information about a target business
+        
+        Accepts the same arguments as :meth:`BusinessService.refine`.
+        
+        Returns:
+            BusinessProfile: Refined business information
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails
+        """
+        return BusinessProfile.of(await self.api_client.post(
+            BUSINESS_ENDPOINTS["REFINE"],
+            self._refine_payload(business_data, additional_info)
+        ))
+        
+    async def compatibility(self, user_business, target_business):
+        """
+        Assess compatibility between user business and target business
+        
+        Accepts the same arguments as :meth:`BusinessService.compatibility`.
+        
+        Returns:
+            dict: Compatibility assessment
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails
+        """
+        return await self.api_client.post(
             BUSINESS_ENDPOINTS["COMPATIBILITY"],
-            {
-                "userBusiness": user_business,
-                "targetBusiness": target_business
-            }
-        ) 
\ No newline at end of file
+            self._compatibility_payload(user_business, target_business)
+        )
+        
+    async def compatibility_many(self, user_business, targets, top_k=None, min_score=None,
+                                 stop_after=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                                 max_failed=DEFAULT_MAX_FAILED):
+        """
+        Score one user business against many targets and keep the best
+        
+        Accepts the same arguments as :meth:`BusinessService.compatibility_many`.
+        
+        Returns:
+            TopResults: Best results first, plus failed targets
+        """
+        user_business = BusinessProfile.of(user_business)
+        return await select_top_async(
+            run_batch_async(
+                lambda target: self.compatibility(user_business, target),
+                targets,
+                max_concurrency,
+                as_completed=True
+            ),
+            top_k,
+            min_score=min_score,
+            stop_after=stop_after,
+            max_failed=max_failed
+        )
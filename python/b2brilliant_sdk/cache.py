@@ -0,0 +1,378 @@
+"""
+Response caching for discover calls
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .codec import get_codec
+from .endpoints import USER_ENDPOINTS, BUSINESS_ENDPOINTS
+from .profile import PreEncoded
+from .urls import canonicalize_url
+
+# Discovery results only change when the website does, so they are the
+# endpoints worth caching. Refine/compatibility/campaign calls are not.
+CACHEABLE_ENDPOINTS = (
+    USER_ENDPOINTS["DISCOVER"],
+    BUSINESS_ENDPOINTS["DISCOVER"]
+)
+
+
+class MemoryCache:
+    """Thread-safe in-memory cache with LRU eviction and optional TTL"""
+    
+    def __init__(self, maxsize=1024, ttl=None, clock=time.time):
+        """
+        Create a new in-memory cache
+        
+        Args:
+            maxsize (int, optional): Maximum number of entries kept
+            ttl (float, optional): Default time to live in seconds. Entries
+                never expire when omitted.
+            clock (callable, optional): Clock returning seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get(self, key):
+        """
+        Get a value from the cache
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+                
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                return None
+                
+            self._entries.move_to_end(key)
+            return value
+            
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache
+        
+        Args:
+            key (str): Cache key
+            value: Value to store
+            ttl (float, optional): Time to live in seconds, overriding the default
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                
+    def delete(self, key):
+        """Remove a key from the cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+            
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._entries.clear()
+            
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+        
+    def __getstate__(self):
+        raise TypeError("MemoryCache cannot be shared between processes; use SQLiteCache")
+
+
+class SQLiteCache:
+    """Persistent cache stored in a SQLite database, with LRU eviction and optional TTL"""
+    
+    def __init__(self, path, maxsize=None, ttl=None, clock=time.time):
+        """
+        Create a new SQLite-backed cache
+        
+        Args:
+            path (str): Database file path. The file and table are created if needed.
+            maxsize (int, optional): Maximum number of entries kept. Unbounded
+                when omitted.
+            ttl (float, optional): Default time to live in seconds. Entries
+                never expire when omitted.
+            clock (callable, optional): Clock returning seconds
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connect()
+        
+    def _connect(self):
+        """Open the database and create the table if needed"""
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed_at)"
+        )
+        
+    def get(self, key):
+        """
+        Get a value from the cache
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            bytes: The cached value, or None if it is missing or expired
+        """
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+                
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+                
+            self._conn.execute(
+                "UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return value
+            
+    def set(self, key, value, ttl=None):
+        """
+        Store a value in the cache
+        
+        Args:
+            key (str): Cache key
+            value (bytes): Value to store
+            ttl (float, optional): Time to live in seconds, overriding the default
+        """
+        now = self._clock()
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = now + ttl if ttl is not None else None
+        
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, expires_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now)
+                )
+                if self.maxsize is not None:
+                    self._conn.execute(
+                        "DELETE FROM response_cache WHERE key IN ("
+                        " SELECT key FROM response_cache ORDER BY accessed_at DESC"
+                        " LIMIT -1 OFFSET ?)",
+                        (self.maxsize,)
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+                
+    def delete(self, key):
+        """Remove a key from the cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache")
+            
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+            
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+            
+    def __getstate__(self):
+        # Each process opens its own connection to the shared file
+        state = self.__dict__.copy()
+        del state["_lock"], state["_conn"]
+        return state
+        
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._connect()
+
+
+class ResponseCache:
+    """Caches discover responses keyed on normalized URLs and options"""
+    
+    def __init__(self, backend=None, ttl=None, endpoints=CACHEABLE_ENDPOINTS, codec=None):
+        """
+        Create a new response cache
+        
+        Args:
+            backend (optional): Storage backend such as MemoryCache or
+                SQLiteCache. Defaults to a MemoryCache.
+            ttl (float, optional): Time to live for cached responses in
+                seconds. Falls back to the backend's default TTL.
+            endpoints (iterable, optional): Endpoints whose responses are cached
+            codec (str or object, optional): JSON codec for stored responses
+                when the caller does not pass one (see get_codec). Clients
+                pass their own codec.
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.endpoints = frozenset(endpoints)
+        self.codec = get_codec(codec)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+    def cacheable(self, endpoint):
+        """
+        Check whether responses from an endpoint are cached
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            bool: Whether the endpoint is cached
+        """
+        return endpoint in self.endpoints
+        
+    @property
+    def blocking(self):
+        """bool: Whether the backend does I/O, so async callers run it off the event loop"""
+        return not isinstance(self.backend, MemoryCache)
+        
+    def key(self, endpoint, payload):
+        """
+        Build the cache key for a request
+        
+        URLs are canonicalized and de-duplicated so different spellings of
+        the same site share an entry; every other field (``findBranding``,
+        ``deepSearch``, ...) is part of the key as sent.
+        
+        Args:
+            endpoint (str): API endpoint
+            payload (dict): Request body
+            
+        Returns:
+            str: Hex digest identifying the request
+        """
+        payload = dict(payload or {})
+        if isinstance(payload.get("urls"), list):
+            payload["urls"] = sorted({canonicalize_url(url) for url in payload["urls"]}, key=str)
+            
+        # The key stays on the stdlib encoder: it needs sorted keys, and a
+        # shared SQLiteCache must give every client the same key whatever
+        # codec it uses
+        canonical = json.dumps(
+            [endpoint, payload],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        
+    def get(self, endpoint, payload, codec=None):
+        """
+        Look up a cached response
+        
+        Args:
+            endpoint (str): API endpoint
+            payload (dict): Request body
+            codec (optional): JSON codec that decodes the entry. Defaults to
+                the cache's codec.
+            
+        Returns:
+            dict: A fresh copy of the cached response, or None on a miss
+        """
+        value = self.backend.get(self.key(endpoint, payload))
+        
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Entries written before responses were stored as bytes
+            value = value.encode("utf-8")
+            
+        # Stored encoded, so every hit hands out an independent copy
+        return (codec or self.codec).loads(value)
+        
+    def set(self, endpoint, payload, response, codec=None):
+        """
+        Store a response
+        
+        Args:
+            endpoint (str): API endpoint
+            payload (dict): Request body
+            response (dict): Response data
+            codec (optional): JSON codec that encodes the entry. Defaults to
+                the cache's codec.
+        """
+        if isinstance(response, PreEncoded):
+            value = response.json_bytes
+        else:
+            value = (codec or self.codec).dumps(response)
+        self.backend.set(self.key(endpoint, payload), value, self.ttl)
+        
+    def stats(self):
+        """
+        Get hit/miss statistics
+        
+        Returns:
+            dict: ``hits``, ``misses``, ``hit_rate`` and current ``size``
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self.backend)
+        }
+        
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["hits"] = state["misses"] = 0
+        return state
+        
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
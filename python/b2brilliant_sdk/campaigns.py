@@ -2,8 +2,9 @@
 Campaign service for interacting with campaign API endpoints
 """
 
+from collections.abc import Mapping
 from .endpoints import CAMPAIGN_ENDPOINTS
-from .exceptions import ValidationError
+from .exceptions import ApiError, ValidationError
 
 
 class CampaignService:
@@ -37,13 +38,80 @@ class CampaignService:
             ValidationError: If the input is invalid
             ApiError: If the API request fails
         """
-        if not user_business or not isinstance(user_business, dict):
+        return self.api_client.post(
+            CAMPAIGN_ENDPOINTS["CREATE"],
+            self._create_payload(user_business, target_business, campaign_types)
+        )
+        
+    def create_stream(self, user_business, target_business, campaign_types=None):
+        """
+        Create campaigns, yielding each one as soon as it is generated
+        
+        Accepts the same arguments as :meth:`create`. The input is validated
+        immediately; the request is sent when iteration starts.
+        
+        Returns:
+            iterator: Campaign dicts (``type``, ``content``, ``rating``,
+                ``feedback``) in the order they finish
+                
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails or generation fails mid-stream
+        """
+        payload = self._create_payload(user_business, target_business, campaign_types)
+        return self._iter_campaigns(self.api_client.stream(CAMPAIGN_ENDPOINTS["CREATE"], payload))
+        
+    @staticmethod
+    def _campaigns_from_event(event):
+        """
+        Extract the campaigns carried by a streamed event
+        
+        Args:
+            event (ServerSentEvent): Decoded event
+            
+        Returns:
+            list: Campaigns in the event, or None once the stream is done
+        """
+        if event.event == "campaign":
+            return [event.data]
+        if event.event == "result":
+            # The server answered with the complete CampaignObject instead of streaming
+            return list(event.data.get("campaigns") or [])
+        if event.event == "done":
+            return None
+        return []
+        
+    @staticmethod
+    def _stream_ended():
+        """Error for a stream that stopped before its ``done`` event"""
+        return ApiError("Stream ended before done", 0)
+        
+    def _iter_campaigns(self, events):
+        """Yield campaigns from a stream of events"""
+        try:
+            complete = False
+            for event in events:
+                campaigns = self._campaigns_from_event(event)
+                if campaigns is None:
+                    return
+                # A plain JSON answer arrives whole as one result event
+                complete = complete or event.event == "result"
+                yield from campaigns
+            if not complete:
+                raise self._stream_ended()
+        finally:
+            # Release the connection as soon as the caller stops iterating
+            events.close()
+            
+    def _create_payload(self, user_business, target_business, campaign_types):
+        """Validate create input and build the request body"""
+        if not user_business or not isinstance(user_business, Mapping):
             raise ValidationError(
                 "user_business must be a dictionary", 
                 {"user_business": "Must be a dictionary"}
             )
             
-        if not target_business or not isinstance(target_business, dict):
+        if not target_business or not isinstance(target_business, Mapping):
             raise ValidationError(
                 "target_business must be a dictionary", 
                 {"target_business": "Must be a dictionary"}
@@ -76,10 +144,7 @@ class CampaignService:
                     
             payload["campaignTypes"] = campaign_types
             
-        return self.api_client.post(
-            CAMPAIGN_ENDPOINTS["CREATE"],
-            payload
-        )
+        return payload
         
     def refine(self, user_business, target_business, campaigns, feedback):
         """
@@ -98,19 +163,26 @@ class CampaignService:
             ValidationError: If the input is invalid
             ApiError: If the API request fails
         """
-        if not user_business or not isinstance(user_business, dict):
+        return self.api_client.post(
+            CAMPAIGN_ENDPOINTS["REFINE"],
+            self._refine_payload(user_business, target_business, campaigns, feedback)
+        )
+        
+    def _refine_payload(self, user_business, target_business, campaigns, feedback):
+        """Validate refine input and build the request body"""
+        if not user_business or not isinstance(user_business, Mapping):
             raise ValidationError(
                 "user_business must be a dictionary", 
                 {"user_business": "Must be a dictionary"}
             )
             
-        if not target_business or not isinstance(target_business, dict):
+        if not target_business or not isinstance(target_business, Mapping):
             raise ValidationError(
                 "target_business must be a dictionary", 
                 {"target_business": "Must be a dictionary"}
             )
             
-        if not campaigns or not isinstance(campaigns, dict):
+        if not campaigns or not isinstance(campaigns, Mapping):
             raise ValidationError(
                 "campaigns must be a dictionary", 
                 {"campaigns": "Must be a dictionary"}
@@ -122,12 +194,82 @@ class CampaignService:
                 {"feedback": "Must be a non-empty string"}
             )
             
-        return self.api_client.post(
+        return {
+            "userBusiness": user_business,
+            "targetBusiness": target_business,
+            "campaign": campaigns,
+            "feedback": feedback
+        }
+
+
+class AsyncCampaignService(CampaignService):
+    """Asynchronous service for campaign operations"""
+    
+    async def create(self, user_business, target_business, campaign_types=None):
+        """
+        Create campaigns
+        
+        Accepts the same arguments as :meth:`CampaignService.create`.
+        
+        Returns:
+            dict: Campaign data
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails
+        """
+        return await self.api_client.post(
+            CAMPAIGN_ENDPOINTS["CREATE"],
+            self._create_payload(user_business, target_business, campaign_types)
+        )
+        
+    def create_stream(self, user_business, target_business, campaign_types=None):
+        """
+        Create campaigns, yielding each one as soon as it is generated
+        
+        Accepts the same arguments as :meth:`CampaignService.create`.
+        
+        Returns:
+            async iterator: Campaign dicts in the order they finish
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails or generation fails mid-stream
+        """
+        payload = self._create_payload(user_business, target_business, campaign_types)
+        return self._aiter_campaigns(self.api_client.stream(CAMPAIGN_ENDPOINTS["CREATE"], payload))
+        
+    async def _aiter_campaigns(self, events):
+        """Yield campaigns from an async stream of events"""
+        try:
+            complete = False
+            async for event in events:
+                campaigns = self._campaigns_from_event(event)
+                if campaigns is None:
+                    return
+                complete = complete or event.event == "result"
+                for campaign in campaigns:
+                    yield campaign
+            if not complete:
+                raise self._stream_ended()
+        finally:
+            # Close the response now rather than when the stream is garbage collected
+            await events.aclose()
+            
+    async def refine(self, user_business, target_business, campaigns, feedback):
+        """
+        Refine campaigns with feedback
+        
+        Accepts the same arguments as :meth:`CampaignService.refine`.
+        
+        Returns:
+            dict: Refined campaign data
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails
+        """
+        return await self.api_client.post(
             CAMPAIGN_ENDPOINTS["REFINE"],
-            {
-                "userBusiness": user_business,
-                "targetBusiness": target_business,
-                "campaign": campaigns,
-                "feedback": feedback
-            }
-        ) 
+            self._refine_payload(user_business, target_business, campaigns, feedback)
+        )
@@ -0,0 +1,228 @@
+"""
+Per-endpoint circuit breakers that fail fast while the API is degraded
+"""
+
+import threading
+import time
+from collections import deque
+from .endpoints import USER_ENDPOINTS, BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS
+from .exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+ENDPOINTS = (*USER_ENDPOINTS.values(), *BUSINESS_ENDPOINTS.values(), *CAMPAIGN_ENDPOINTS.values())
+
+
+class _Circuit:
+    """State of the circuit of one endpoint"""
+    
+    __slots__ = ("state", "outcomes", "opened_at", "probes", "probe_successes", "opened", "rejected")
+    
+    def __init__(self, window):
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = None
+        self.probes = 0
+        self.probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    """
+    Opens the circuit of an endpoint when too many recent calls fail or run slow
+    
+    While a circuit is open, calls to its endpoint raise CircuitOpenError at
+    once instead of tying up a worker for a full request that will probably
+    fail. After ``open_duration`` the circuit goes half-open and lets a few
+    probe calls through. If they succeed it closes again; if one fails it
+    opens for another ``open_duration``. Each endpoint has its own circuit,
+    so a degraded campaign endpoint does not stop discovery.
+    """
+    
+    def __init__(self, error_rate=0.5, latency_threshold=None, slow_rate=0.5, window=20, min_calls=10,
+                 open_duration=30.0, half_open_probes=2, failure_statuses=None, endpoints=ENDPOINTS,
+                 clock=time.monotonic):
+        """
+        Create a new circuit breaker
+        
+        Args:
+            error_rate (float, optional): Fraction of failed calls in the
+                window that opens the circuit
+            latency_threshold (float, optional): Calls slower than this many
+                seconds count as slow. Latency is ignored when omitted.
+            slow_rate (float, optional): Fraction of slow calls in the window
+                that opens the circuit
+            window (int, optional): Number of recent calls considered
+            min_calls (int, optional): Calls needed in the window before the
+                circuit can open
+            open_duration (float, optional): Seconds a circuit stays open
+                before probing the endpoint again
+            half_open_probes (int, optional): Successful probes needed to
+                close the circuit. At most this many run at once.
+            failure_statuses (iterable, optional): HTTP statuses that count as
+                failures. Defaults to network errors (0) and 5xx statuses.
+            endpoints (iterable, optional): Endpoints reported in stats()
+                before their first call. Defaults to every API endpoint.
+            clock (callable, optional): Monotonic clock returning seconds
+        """
+        if not 0 < error_rate <= 1 or not 0 < slow_rate <= 1:
+            raise ValueError("error_rate and slow_rate must be between 0 and 1")
+        if not 1 <= min_calls <= window:
+            raise ValueError("min_calls must be between 1 and window")
+        if half_open_probes < 1:
+            raise ValueError("half_open_probes must be at least 1")
+            
+        self.error_rate = error_rate
+        self.latency_threshold = latency_threshold
+        self.slow_rate = slow_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.failure_statuses = frozenset(failure_statuses) if failure_statuses is not None else None
+        self._clock = clock
+        self._circuits = {endpoint: _Circuit(window) for endpoint in endpoints}
+        self._lock = threading.Lock()
+        
+    def _circuit(self, endpoint):
+        """Get the circuit of an endpoint, creating it on first use. Call with the lock held."""
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit(self.window)
+        return circuit
+        
+    def _is_failure(self, status):
+        if self.failure_statuses is not None:
+            return status in self.failure_statuses
+        return status == 0 or status >= 500
+        
+    def check(self, endpoint, retries=0):
+        """
+        Let a call through or fail it fast
+        
+        Args:
+            endpoint (str): API endpoint about to be called
+            retries (int, optional): Retries already made for the request,
+                stored on the error
+                
+        Returns:
+            bool: Whether the call is a half-open probe. Pass it on to
+                :meth:`record`.
+                
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open, or half-open
+                with every probe already running
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.open_duration - self._clock()
+                if remaining <= 0:
+                    circuit.state = HALF_OPEN
+                    circuit.probes = circuit.probe_successes = 0
+                    
+            if circuit.state == CLOSED:
+                return False
+            if circuit.state == HALF_OPEN and circuit.probes < self.half_open_probes:
+                circuit.probes += 1
+                return True
+                
+            circuit.rejected += 1
+            retry_after = max(0.0, circuit.opened_at + self.open_duration - self._clock())
+            
+        raise CircuitOpenError(endpoint, retry_after, retries)
+        
+    def record(self, endpoint, latency, status, probe=False):
+        """
+        Record the outcome of a call let through by :meth:`check`
+        
+        Args:
+            endpoint (str): API endpoint
+            latency (float): Seconds the call took
+            status (int): HTTP status of the response, 0 for a network error,
+                or None if the call was abandoned before it finished
+            probe (bool, optional): What :meth:`check` returned for the call
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if probe:
+                circuit.probes = max(0, circuit.probes - 1)
+                if status is None or circuit.state != HALF_OPEN:
+                    # Abandoned, or another probe already decided
+                    return
+                if self._is_failure(status) or self._is_slow(latency):
+                    self._open(circuit)
+                else:
+                    circuit.probe_successes += 1
+                    if circuit.probe_successes >= self.half_open_probes:
+                        circuit.state = CLOSED
+                        circuit.outcomes.clear()
+                return
+                
+            if status is None or circuit.state != CLOSED:
+                # Calls that started before the circuit opened don't count
+                return
+                
+            circuit.outcomes.append((self._is_failure(status), self._is_slow(latency)))
+            if len(circuit.outcomes) < self.min_calls:
+                return
+                
+            calls = len(circuit.outcomes)
+            failures = sum(failed for failed, _ in circuit.outcomes)
+            slow = sum(slow for _, slow in circuit.outcomes)
+            if failures >= self.error_rate * calls or slow >= self.slow_rate * calls:
+                self._open(circuit)
+                
+    def _is_slow(self, latency):
+        return self.latency_threshold is not None and latency is not None and latency > self.latency_threshold
+        
+    def _open(self, circuit):
+        """Open a circuit. Call with the lock held."""
+        circuit.state = OPEN
+        circuit.opened_at = self._clock()
+        circuit.opened += 1
+        circuit.outcomes.clear()
+        
+    def state(self, endpoint):
+        """
+        Get the state of an endpoint's circuit
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            str: ``"closed"``, ``"open"`` or ``"half_open"``. An open circuit
+                whose ``open_duration`` has passed reports ``"half_open"``.
+        """
+        with self._lock:
+            return self._state(self._circuit(endpoint))
+            
+    def _state(self, circuit):
+        """Current state of a circuit. Call with the lock held."""
+        if circuit.state == OPEN and self._clock() >= circuit.opened_at + self.open_duration:
+            return HALF_OPEN
+        return circuit.state
+            
+    def stats(self):
+        """
+        Get the state of every circuit
+        
+        Returns:
+            dict: Per endpoint, the ``state``, ``calls`` and ``failures`` in
+                the current window, how many times the circuit ``opened`` and
+                how many calls it ``rejected``
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "state": self._state(circuit),
+                    "calls": len(circuit.outcomes),
+                    "failures": sum(failed for failed, _ in circuit.outcomes),
+                    "opened": circuit.opened,
+                    "rejected": circuit.rejected
+                }
+                for endpoint, circuit in self._circuits.items()
+            }
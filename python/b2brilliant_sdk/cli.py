@@ -0,0 +1,360 @@
+"""
+Command line interface for running bulk jobs against the B2B Campaign Agent API
+
+Reads one input per row from CSV or JSON Lines and streams one JSON line per
+result, so jobs of any size run in constant memory:
+
+    cat urls.txt | b2brilliant business discover --concurrency 32 --rate 20 > targets.jsonl
+    b2brilliant business compatibility -i targets.jsonl --user-business me.json --resume scores.db
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from .agent import B2BrilliantAgent
+from .batch import DEFAULT_MAX_CONCURRENCY, run_batch
+from .codec import get_codec
+from .exceptions import ValidationError
+from .jobs import BatchJob, _error_record
+from .profile import BusinessProfile, encode_payload
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+
+API_KEY_ENV = "B2BRILLIANT_API_KEY"
+BASE_URL_ENV = "B2BRILLIANT_BASE_URL"
+
+# CSV columns that hold JSON documents rather than plain text
+JSON_COLUMNS = ("business", "user", "target", "campaigns")
+
+
+def _urls(record):
+    """URLs of a discover input: a URL, a list of URLs, or a row with ``urls``/``url``"""
+    if isinstance(record, str):
+        return record.split()
+    if isinstance(record, list):
+        return record
+    urls = record.get("urls") or record.get("url")
+    return urls.split() if isinstance(urls, str) else urls
+
+
+def _business(record, field):
+    """
+    A business from a row: its ``field`` column, the ``result`` of an earlier
+    discover command piped in, or the row itself when it is a business
+    """
+    if field in record:
+        return record[field]
+    if isinstance(record.get("result"), dict):
+        return record["result"]
+    if "profile" in record:
+        return record
+    raise KeyError(field)
+
+
+def _campaign_types(record, args):
+    types = record.get("campaign_types") or args.types
+    return types.replace(",", " ").split() if isinstance(types, str) else types
+
+
+def _user(record, args):
+    user = record.get("user") or args.user_business
+    if user is None:
+        raise KeyError("user")
+    return user
+
+
+def _discover_options(args):
+    return {
+        name: True
+        for name in ("find_competitors", "find_branding", "deep_search")
+        if getattr(args, name, False)
+    }
+
+
+# (service, method) -> (help, service method of an agent, function of (record, args)
+# returning the method's arguments)
+COMMANDS = {
+    ("user", "discover"): (
+        "Discover user businesses from their URLs",
+        lambda agent: agent.user.discover,
+        lambda record, args: (_urls(record), _discover_options(args))
+    ),
+    ("user", "refine"): (
+        "Refine user businesses with additional information",
+        lambda agent: agent.user.refine,
+        lambda record, args: (_business(record, "business"), record.get("additional_info") or args.additional_info)
+    ),
+    ("business", "discover"): (
+        "Discover target businesses from their URLs",
+        lambda agent: agent.business.discover,
+        lambda record, args: (_urls(record), _discover_options(args))
+    ),
+    ("business", "refine"): (
+        "Refine target businesses with additional information",
+        lambda agent: agent.business.refine,
+        lambda record, args: (_business(record, "business"), record.get("additional_info") or args.additional_info)
+    ),
+    ("business", "compatibility"): (
+        "Score target businesses against a user business",
+        lambda agent: agent.business.compatibility,
+        lambda record, args: (_user(record, args), _business(record, "target"))
+    ),
+    ("campaigns", "create"): (
+        "Create campaigns for target businesses",
+        lambda agent: agent.campaigns.create,
+        lambda record, args: (_user(record, args), _business(record, "target"), _campaign_types(record, args))
+    ),
+    ("campaigns", "refine"): (
+        "Refine campaigns with feedback",
+        lambda agent: agent.campaigns.refine,
+        lambda record, args: (
+            _user(record, args), record["target"], record["campaigns"], record.get("feedback") or args.feedback
+        )
+    )
+}
+
+
+class MalformedRow(str):
+    """
+    Text of an input row that could not be decoded
+    
+    It is passed through the batch like any other row and fails with a
+    ValidationError, so one bad line does not abort the job.
+    
+    Attributes:
+        line (int): Line number of the row in the input, starting at 1
+        reason (str): Why the row could not be decoded
+    """
+    
+    def __new__(cls, text, line, reason):
+        row = super().__new__(cls, text)
+        row.line = line
+        row.reason = reason
+        return row
+        
+    def error(self):
+        """The ValidationError reported for the row"""
+        return ValidationError(f"Line {self.line} is not valid JSON: {self.reason}", {"line": self.line})
+
+
+def read_jsonl(stream, codec):
+    """
+    Read JSON Lines, one input per line
+    
+    Lines that are not JSON, such as a bare URL, are read as strings, so a
+    plain list of URLs works too. A line that starts like JSON but does not
+    decode is yielded as a MalformedRow.
+    
+    Yields:
+        Decoded lines
+    """
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line[:1] in ("{", "[", '"'):
+            try:
+                yield codec.loads(line)
+            except ValueError as e:
+                yield MalformedRow(line, number, str(e))
+        else:
+            yield line
+
+
+def read_csv(stream):
+    """
+    Read CSV rows as dicts keyed by the header row
+    
+    Cells in the business, user, target and campaigns columns are decoded
+    as JSON; a row where one does not decode is yielded as a MalformedRow.
+    A file without a header row is read as URLs, one business per row.
+    
+    Yields:
+        dict or list: One input per row
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    if not {"url", "urls", "business", "target"} & set(header):
+        # No header: every row lists the URLs of one business
+        for row in _prepend(header, reader):
+            urls = [cell.strip() for cell in row if cell.strip()]
+            if urls:
+                yield urls
+        return
+        
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        record = dict(zip(header, row))
+        try:
+            for column in JSON_COLUMNS:
+                if record.get(column):
+                    record[column] = json.loads(record[column])
+        except ValueError as e:
+            yield MalformedRow(",".join(row), reader.line_num, f"{column}: {e}")
+            continue
+        yield record
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+def _input_format(args):
+    if args.format:
+        return args.format
+    return "csv" if args.input and args.input.lower().endswith(".csv") else "jsonl"
+
+
+def _load_user_business(args, agent):
+    """Read or discover the user business shared by every row"""
+    if args.user_business:
+        with open(args.user_business, encoding="utf-8") as f:
+            return BusinessProfile.of(json.load(f))
+    if args.user_url:
+        return agent.user.discover(args.user_url)
+    return None
+
+
+def build_parser():
+    """Build the argument parser with one subcommand per service method"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-i", "--input", help="input file (default: stdin)")
+    common.add_argument("-o", "--output", help="output JSON Lines file (default: stdout)")
+    common.add_argument("--format", choices=("jsonl", "csv"),
+                        help="input format (default: from the file extension, else jsonl)")
+    common.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="maximum requests in flight")
+    common.add_argument("--rate", type=float, help="maximum requests per second")
+    common.add_argument("--retries", type=int, default=3, help="attempts per request, including the first")
+    common.add_argument("--resume", metavar="CHECKPOINT",
+                        help="checkpoint file (.jsonl or SQLite); rows already done there are skipped")
+    common.add_argument("--ordered", action="store_true",
+                        help="write results in input order instead of as they finish (not with --resume)")
+    common.add_argument("--api-key", default=os.environ.get(API_KEY_ENV),
+                        help=f"API key (default: ${API_KEY_ENV})")
+    common.add_argument("--base-url", default=os.environ.get(BASE_URL_ENV),
+                        help=f"API base URL (default: ${BASE_URL_ENV} or the public API)")
+    
+    parser = argparse.ArgumentParser(prog="b2brilliant", description=__doc__.strip().splitlines()[0])
+    services = parser.add_subparsers(dest="service", required=True)
+    for service in ("user", "business", "campaigns"):
+        methods = services.add_parser(service, help=f"{service} methods").add_subparsers(dest="method", required=True)
+        for (command_service, method), (help_text, _, _) in COMMANDS.items():
+            if command_service != service:
+                continue
+            sub = methods.add_parser(method, parents=[common], help=help_text, description=help_text)
+            if method == "discover":
+                sub.add_argument("--find-branding", action="store_true")
+                sub.add_argument("--deep-search", action="store_true")
+                if service == "user":
+                    sub.add_argument("--find-competitors", action="store_true")
+            elif method == "refine" and service != "campaigns":
+                sub.add_argument("--additional-info", help="used for rows without additional_info")
+            else:
+                sub.add_argument("--user-business", help="JSON file with the user business for every row")
+                sub.add_argument("--user-url", nargs="+", help="discover the user business from these URLs first")
+                if service == "campaigns" and method == "create":
+                    sub.add_argument("--types", help="campaign types, such as email,dm")
+                if method == "refine":
+                    sub.add_argument("--feedback", help="used for rows without feedback")
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the CLI
+    
+    Args:
+        argv (list, optional): Arguments, defaulting to ``sys.argv[1:]``
+        
+    Returns:
+        int: Exit status: 0 when every row succeeded, 1 when some failed
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error(f"an API key is required: pass --api-key or set {API_KEY_ENV}")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.ordered and args.resume:
+        parser.error("--ordered cannot be combined with --resume")
+        
+    codec = get_codec()
+    _, method, read_arguments = COMMANDS[(args.service, args.method)]
+    options = {
+        "pool_maxsize": args.concurrency,
+        "retry_policy": RetryPolicy(max_attempts=args.retries)
+    }
+    if args.rate:
+        options["rate_limiter"] = RateLimiter(default=(args.rate, max(1, int(args.rate))))
+        
+    with B2BrilliantAgent(args.api_key, args.base_url, **options) as agent:
+        if hasattr(args, "user_business"):
+            args.user_business = _load_user_business(args, agent)
+            
+        call = method(agent)
+        
+        def run(record):
+            if isinstance(record, MalformedRow):
+                raise record.error()
+            # Only reading the row is guarded, so errors inside the SDK call propagate
+            try:
+                arguments = read_arguments(record, args)
+            except KeyError as e:
+                raise ValidationError(f"Input is missing {e.args[0]}", {e.args[0]: "Required"})
+            except (TypeError, AttributeError):
+                raise ValidationError("Input does not have the fields this command needs")
+            return call(*arguments)
+                
+        source = open(args.input, encoding="utf-8", newline="") if args.input else io.TextIOWrapper(
+            sys.stdin.buffer, encoding="utf-8", newline=""
+        )
+        output = open(args.output, "ab") if args.output else sys.stdout.buffer
+        records = read_csv(source) if _input_format(args) == "csv" else read_jsonl(source, codec)
+        job = None
+        counts = {"ok": 0, "failed": 0}
+        try:
+            if args.resume:
+                job = BatchJob(run, args.resume, max_concurrency=args.concurrency)
+                results = job.run(records)
+            else:
+                results = run_batch(run, records, args.concurrency, as_completed=not args.ordered)
+                
+            for result in results:
+                counts["ok" if result.ok else "failed"] += 1
+                line = {"index": result.index, "input": result.input}
+                if result.ok:
+                    line["result"] = result.result
+                else:
+                    line["error"] = _error_record(result.error)
+                output.write(encode_payload(codec, line) + b"\n")
+                output.flush()
+        except KeyboardInterrupt:
+            counts["interrupted"] = True
+        finally:
+            if job is not None:
+                counts["skipped"] = job.skipped
+                job.close()
+            if args.input:
+                source.close()
+            else:
+                # Leave stdin itself open
+                source.detach()
+            if args.output:
+                output.close()
+                
+    print(", ".join(f"{name}: {value}" for name, value in counts.items()), file=sys.stderr)
+    if counts.get("interrupted"):
+        return 130
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Single-flight coalescing of identical in-flight requests
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+from .profile import PreEncoded
+
+
+def request_key(endpoint, payload):
+    """
+    Build the coalescing key for a request
+    
+    Args:
+        endpoint (str): API endpoint
+        payload (dict): Request body
+        
+    Returns:
+        str: Hex digest of the endpoint and canonical JSON body
+    """
+    # Profiles and response models stand in by their cached hash instead of being encoded again
+    payload = {
+        key: {"$profile": value.content_hash} if isinstance(value, PreEncoded) else value
+        for key, value in (payload or {}).items()
+    }
+    canonical = json.dumps(
+        [endpoint, payload],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    """An in-flight call that other callers can wait on"""
+    
+    __slots__ = ("done", "result", "error")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs one call per key at a time and shares its outcome with concurrent callers"""
+    
+    def __init__(self):
+        """Create a new thread-safe single-flight group"""
+        self.executed = 0
+        self.merged = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+        
+    def do(self, key, func):
+        """
+        Call ``func`` unless an identical call is already in flight
+        
+        Callers that join an in-flight call block until it finishes and then
+        receive a deep copy of its result, or the same exception.
+        
+        Args:
+            key (str): Identity of the call
+            func (callable): Function performing the call
+            
+        Returns:
+            The call's result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.merged += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+                
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+            
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            
+    def stats(self):
+        """
+        Get coalescing statistics
+        
+        Returns:
+            dict: ``executed`` calls, ``merged`` callers and ``in_flight`` keys
+        """
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "merged": self.merged,
+                "in_flight": len(self._calls)
+            }
+
+
+class AsyncSingleFlight:
+    """Asynchronous counterpart of SingleFlight for use on one event loop"""
+    
+    def __init__(self):
+        """Create a new single-flight group"""
+        self.executed = 0
+        self.merged = 0
+        self._calls = {}
+        
+    async def do(self, key, func):
+        """
+        Await ``func()`` unless an identical call is already in flight
+        
+        Args:
+            key (str): Identity of the call
+            func (callable): Coroutine function performing the call
+            
+        Returns:
+            The call's result
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.merged += 1
+            result = await asyncio.shield(task)
+            return copy.deepcopy(result)
+            
+        # The call runs in a task of its own that every caller awaits through
+        # a shield, so cancelling one caller never cancels the call or the others
+        task = self._calls[key] = asyncio.ensure_future(func())
+        task.add_done_callback(lambda done: self._finish(key, done))
+        self.executed += 1
+        return await asyncio.shield(task)
+        
+    def _finish(self, key, task):
+        """Forget a finished call"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark retrieved so an error nobody awaited isn't logged
+            task.exception()
+            
+    def stats(self):
+        """
+        Get coalescing statistics
+        
+        Returns:
+            dict: ``executed`` calls, ``merged`` callers and ``in_flight`` keys
+        """
+        return {
+            "executed": self.executed,
+            "merged": self.merged,
+            "in_flight": len(self._calls)
+        }
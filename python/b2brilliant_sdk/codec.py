@@ -0,0 +1,117 @@
+"""
+JSON codecs for encoding request bodies and decoding responses
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional speedup
+    ujson = None
+
+
+class JsonCodec:
+    """Codec backed by the standard library ``json`` module"""
+    
+    name = "json"
+    
+    def dumps(self, obj):
+        """
+        Encode an object as JSON
+        
+        Args:
+            obj: JSON-serializable object
+            
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        
+    def loads(self, data):
+        """
+        Decode JSON
+        
+        Args:
+            data (bytes): UTF-8 encoded JSON
+            
+        Returns:
+            Decoded object
+            
+        Raises:
+            ValueError: If the data is not valid JSON
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec backed by orjson"""
+    
+    name = "orjson"
+    
+    def __init__(self):
+        """Create a new orjson codec"""
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson. Install it with: pip install orjson")
+            
+    def dumps(self, obj):
+        # Non-string keys are stringified like the stdlib does instead of rejected
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """Codec backed by ujson"""
+    
+    name = "ujson"
+    
+    def __init__(self):
+        """Create a new ujson codec"""
+        if ujson is None:
+            raise ImportError("UjsonCodec requires ujson. Install it with: pip install ujson")
+            
+    def dumps(self, obj):
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+        
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+    "json": JsonCodec
+}
+
+
+def get_codec(codec=None):
+    """
+    Resolve a JSON codec
+    
+    Args:
+        codec (str or object, optional): ``"orjson"``, ``"ujson"``, ``"json"``
+            or any object with ``dumps(obj) -> bytes`` and ``loads(bytes)``
+            methods. Defaults to the fastest installed library.
+            
+    Returns:
+        Codec instance
+    """
+    if codec is None:
+        if orjson is not None:
+            return OrjsonCodec()
+        if ujson is not None:
+            return UjsonCodec()
+        return JsonCodec()
+        
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown JSON codec: {codec}. Expected one of {tuple(CODECS)}")
+        return CODECS[codec]()
+        
+    return codec
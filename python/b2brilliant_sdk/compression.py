@@ -0,0 +1,48 @@
+"""
+Content-encoding negotiation and request body compression
+"""
+
+import gzip
+import zlib
+
+# Best compression ratio first. Only codings the transport can decode are
+# ever advertised, so br/zstd are used only when brotli/zstandard are installed.
+PREFERRED_ENCODINGS = ("zstd", "br", "gzip", "deflate")
+
+REQUEST_ENCODINGS = ("gzip", "deflate")
+
+DEFAULT_COMPRESS_THRESHOLD = 16 * 1024
+
+
+def accept_encoding(supported, preferred=PREFERRED_ENCODINGS):
+    """
+    Build an Accept-Encoding header value
+    
+    Args:
+        supported (iterable): Content codings the transport can decode
+        preferred (iterable, optional): Codings in order of preference
+        
+    Returns:
+        str: Header value such as ``"br, gzip, deflate"``
+    """
+    supported = {encoding.strip().lower() for encoding in supported}
+    return ", ".join(encoding for encoding in preferred if encoding in supported)
+
+
+def compress_body(body, encoding="gzip"):
+    """
+    Compress a request body
+    
+    Args:
+        body (bytes): Encoded request body
+        encoding (str, optional): ``"gzip"`` or ``"deflate"``
+        
+    Returns:
+        bytes: Compressed body
+    """
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic for identical bodies
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    raise ValueError(f"Unsupported request encoding: {encoding}")
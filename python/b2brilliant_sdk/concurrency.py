@@ -0,0 +1,263 @@
+"""
+Adaptive concurrency limits for API requests
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from .endpoints import ENDPOINT_GROUPS
+
+# Statuses that mean the server is shedding load
+THROTTLE_STATUSES = (429, 503)
+
+
+class AdaptiveLimit:
+    """
+    In-flight limit for one group of endpoints, adjusted by AIMD
+    
+    Each successful response adds ``increase / limit`` to the limit, so a
+    saturated limit grows by about ``increase`` per round of requests. A
+    throttling response, or latency well above its usual level, multiplies
+    the limit by ``decrease``. The limit is cut at most once per typical
+    response time, since every request already in flight sees the same
+    overload.
+    """
+    
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=64, increase=1.0, decrease=0.5,
+                 latency_tolerance=2.0, clock=time.monotonic):
+        """
+        Create a new adaptive limit
+        
+        Args:
+            initial_limit (int, optional): Requests allowed in flight at first
+            min_limit (int, optional): Lowest the limit is cut to
+            max_limit (int, optional): Highest the limit grows to
+            increase (float, optional): Growth per round of successful requests
+            decrease (float, optional): Factor applied to the limit on overload
+            latency_tolerance (float, optional): Recent latency this many times
+                its long-run average counts as overload
+            clock (callable, optional): Monotonic clock returning seconds
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        if latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be greater than 1")
+            
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(initial_limit)
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._clock = clock
+        self._baseline = None
+        self._recent = None
+        self._last_decrease = None
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._waiters = deque()
+        
+    def _has_room(self):
+        return self.in_flight < int(self.limit)
+        
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self._available:
+            while self._waiters or not self._has_room():
+                self._available.wait()
+            self.in_flight += 1
+            
+    def try_acquire(self):
+        """
+        Take a slot only if one is free right away
+        
+        Returns:
+            bool: Whether a slot was taken
+        """
+        with self._lock:
+            if self._waiters or not self._has_room():
+                return False
+            self.in_flight += 1
+            return True
+            
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        with self._lock:
+            if not self._waiters and self._has_room():
+                self.in_flight += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+            
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    granted = False
+                else:
+                    granted = waiter[1].done() and not waiter[1].cancelled()
+            if granted:
+                self.release()
+            raise
+            
+    def release(self, latency=None, status=None):
+        """
+        Free the slot of a finished request and adjust the limit
+        
+        Args:
+            latency (float, optional): Seconds the request took to get its
+                response. The limit is left alone when omitted.
+            status (int, optional): HTTP status of the response, or None if
+                no response arrived
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if status in THROTTLE_STATUSES:
+                self._cut(latency)
+            elif latency is not None and status is not None and status < 500:
+                self._observe(latency)
+            self._wake()
+            
+    def _observe(self, latency):
+        """Track latency and grow the limit while it stays normal. Call with the lock held."""
+        if self._baseline is None:
+            self._baseline = self._recent = latency
+        self._recent += (latency - self._recent) * 0.3
+        if self._recent > self._baseline * self.latency_tolerance:
+            self._cut(latency)
+            return
+            
+        # The long-run average only follows latency that counts as normal
+        self._baseline += (latency - self._baseline) * 0.05
+        if self.in_flight + 1 >= int(self.limit) and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self.increases += 1
+            
+    def _cut(self, latency):
+        """Shrink the limit, once per typical response time. Call with the lock held."""
+        now = self._clock()
+        cooldown = self._recent if self._recent is not None else latency or 0.0
+        if self._last_decrease is not None and now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+        self.decreases += 1
+        if self._recent is not None:
+            # Start over from the usual latency once the queue has drained
+            self._recent = self._baseline
+            
+    def _wake(self):
+        """Hand free slots to waiting tasks, then wake waiting threads. Call with the lock held."""
+        while self._waiters and self._has_room():
+            loop, future = self._waiters.popleft()
+            self.in_flight += 1
+            loop.call_soon_threadsafe(self._grant, future)
+        if self._has_room():
+            self._available.notify_all()
+            
+    def _grant(self, future):
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+            
+    def stats(self):
+        """
+        Get the state of the limit
+        
+        Returns:
+            dict: Current ``limit``, requests ``in_flight`` and how many
+                times the limit was raised and cut
+        """
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "increases": self.increases,
+                "decreases": self.decreases
+            }
+
+
+class AdaptiveConcurrency:
+    """
+    Adaptive in-flight limits per endpoint group (user, business, campaigns)
+    
+    The capacity of the LLM-backed endpoints shifts during the day, so any
+    fixed number of workers is too low at quiet times and causes bursts of
+    429s at peak. Requests queue on the client while their group is at its
+    limit, and the limit follows what the server can currently take. One
+    instance can be shared by several clients to share the limits.
+    """
+    
+    def __init__(self, groups=ENDPOINT_GROUPS, **options):
+        """
+        Create adaptive limits
+        
+        Args:
+            groups (dict, optional): Mapping of group name to its endpoints.
+                Endpoints outside every group get a limit of their own.
+            **options: AdaptiveLimit options for every group, such as
+                initial_limit, max_limit or decrease
+        """
+        self.options = options
+        self._groups = {endpoint: group for group, endpoints in groups.items() for endpoint in endpoints}
+        self._limits = {group: AdaptiveLimit(**options) for group in groups}
+        self._lock = threading.Lock()
+        
+    def group(self, endpoint):
+        """
+        Get the group an endpoint belongs to
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            str: Group name, or the endpoint itself when it is in no group
+        """
+        return self._groups.get(endpoint, endpoint)
+        
+    def limiter(self, endpoint):
+        """
+        Get the limit that applies to an endpoint
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            AdaptiveLimit: Limit shared by the endpoint's group
+        """
+        group = self.group(endpoint)
+        limit = self._limits.get(group)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.get(group)
+                if limit is None:
+                    limit = self._limits[group] = AdaptiveLimit(**self.options)
+        return limit
+        
+    def limits(self):
+        """
+        Get the current limit of every group
+        
+        Returns:
+            dict: Requests allowed in flight, keyed by group
+        """
+        return {group: int(limit.limit) for group, limit in list(self._limits.items())}
+        
+    def stats(self):
+        """
+        Get the state of every group
+        
+        Returns:
+            dict: AdaptiveLimit.stats() keyed by group
+        """
+        return {group: limit.stats() for group, limit in list(self._limits.items())}
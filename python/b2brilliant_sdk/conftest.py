@@ -0,0 +1,21 @@
+"""
+Shared fixtures for the B2B Campaign Agent SDK tests
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced clock, starting at zero"""
+    
+    def __init__(self):
+        self.now = 0.0
+        
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Clock for components that take a ``clock`` argument, advanced by setting ``now``"""
+    return FakeClock()
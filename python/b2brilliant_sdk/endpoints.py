@@ -19,4 +19,28 @@ BUSINESS_ENDPOINTS = {
 CAMPAIGN_ENDPOINTS = {
     "CREATE": "/api/v1/campaigns/create",
     "REFINE": "/api/v1/campaigns/refine"
-} 
\ No newline at end of file
+}
+
+# Statuses retried by default: throttling and gateway/availability errors
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+# Per-endpoint retry rules. Campaign generation is billed per call, so only
+# retry it when the server clearly rejected the request before doing any work.
+ENDPOINT_RETRY_STATUSES = {
+    CAMPAIGN_ENDPOINTS["CREATE"]: (429, 503),
+    CAMPAIGN_ENDPOINTS["REFINE"]: (429, 503)
+}
+
+# Endpoints whose requests are not retried after a network error. The
+# request may have reached the server, which then generated a billed campaign.
+ENDPOINT_NO_NETWORK_RETRY = (
+    CAMPAIGN_ENDPOINTS["CREATE"],
+    CAMPAIGN_ENDPOINTS["REFINE"]
+)
+
+# Endpoints that share server capacity, used to group adaptive concurrency limits
+ENDPOINT_GROUPS = {
+    "user": tuple(USER_ENDPOINTS.values()),
+    "business": tuple(BUSINESS_ENDPOINTS.values()),
+    "campaigns": tuple(CAMPAIGN_ENDPOINTS.values())
+}
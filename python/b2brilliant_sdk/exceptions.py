@@ -2,10 +2,19 @@
 Custom exceptions for the B2B Campaign Agent SDK
 """
 
+
+def _restore_error(cls, args, state):
+    """Rebuild a pickled error without calling its constructor"""
+    error = cls.__new__(cls)
+    error.args = args
+    error.__dict__.update(state)
+    return error
+
+
 class ApiError(Exception):
     """API Error class for handling API request errors"""
     
-    def __init__(self, message, status, data=None):
+    def __init__(self, message, status, data=None, retries=0):
         """
         Create a new API error
         
@@ -13,11 +22,39 @@ class ApiError(Exception):
             message (str): Error message
             status (int): HTTP status code
             data (dict, optional): Additional error data
+            retries (int, optional): Number of retries made before giving up
         """
         super().__init__(message)
         self.message = message
         self.status = status
         self.data = data or {}
+        self.retries = retries
+        
+    def __reduce__(self):
+        # Default exception pickling calls the class with the message alone
+        return _restore_error, (type(self), self.args, self.__dict__)
+
+
+class CircuitOpenError(ApiError):
+    """Raised without calling the API while an endpoint's circuit breaker is open"""
+    
+    def __init__(self, endpoint, retry_after, retries=0):
+        """
+        Create a new circuit open error
+        
+        Args:
+            endpoint (str): API endpoint whose circuit is open
+            retry_after (float): Seconds until the circuit lets a probe through
+            retries (int, optional): Number of retries made before the circuit opened
+        """
+        super().__init__(
+            f"Circuit open for {endpoint}, retry in {retry_after:.1f}s",
+            503,
+            {"endpoint": endpoint, "retry_after": retry_after},
+            retries
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
 
 
 class ValidationError(Exception):
@@ -0,0 +1,476 @@
+"""
+Local fake B2Brilliant API server for load and latency testing
+
+Serves every route in endpoints.py with realistic response shapes, so pool
+sizes, concurrency limits and retry policies can be tuned without spending
+credits. Only the standard library is used. Start it from Python:
+
+    with FakeServer(FakeRoute(latency=Latency(median=0.8, sigma=0.6), throttle_rate=0.05)) as server:
+        agent = B2BrilliantAgent(api_key="test", base_url=server.url)
+
+or from the command line:
+
+    python -m b2brilliant_sdk.fake_server --port 8080 --latency 0.8 --sigma 0.6 --throttle-rate 0.05
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from .endpoints import BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS, USER_ENDPOINTS
+from .sse import EVENT_STREAM
+
+CAMPAIGN_TYPES = ("email", "dm", "sms")
+
+WORDS = (
+    "growth marketing agency brand strategy content social audience campaign "
+    "software platform analytics customers revenue partners services retail "
+    "healthcare logistics finance automation outreach pipeline enterprise"
+).split()
+
+
+class Latency:
+    """Log-normal latency distribution, the usual shape of API response times"""
+    
+    def __init__(self, median=0.0, sigma=0.0, maximum=None):
+        """
+        Create a latency distribution
+        
+        Args:
+            median (float, optional): Median latency in seconds
+            sigma (float, optional): Spread of the distribution. 0 makes every
+                request take exactly ``median``; 0.5 to 1 gives the long tail
+                typical of LLM-backed endpoints.
+            maximum (float, optional): Cap on sampled latencies, in seconds
+        """
+        if median < 0 or sigma < 0:
+            raise ValueError("median and sigma must not be negative")
+            
+        self.median = median
+        self.sigma = sigma
+        self.maximum = maximum
+        
+    def sample(self, rng):
+        """
+        Draw a latency
+        
+        Args:
+            rng (random.Random): Random number generator
+            
+        Returns:
+            float: Latency in seconds
+        """
+        if self.median == 0 or self.sigma == 0:
+            value = self.median
+        else:
+            value = rng.lognormvariate(math.log(self.median), self.sigma)
+        return value if self.maximum is None else min(value, self.maximum)
+
+
+class FakeRoute:
+    """Behaviour of one or more fake API routes"""
+    
+    def __init__(self, latency=0.0, error_rate=0.0, error_status=503, throttle_rate=0.0,
+                 retry_after=1, size_kb=None):
+        """
+        Configure a route
+        
+        Args:
+            latency (Latency or float, optional): Time taken to answer, as a
+                distribution or a fixed number of seconds
+            error_rate (float, optional): Share of requests that fail with
+                ``error_status`` after the sampled latency
+            error_status (int, optional): HTTP status of injected errors
+            throttle_rate (float, optional): Share of requests rejected at once
+                with 429 Too Many Requests
+            retry_after (float, optional): Retry-After header sent with 429
+                responses, in seconds. None to omit the header.
+            size_kb (float, optional): Pad successful response bodies to at
+                least this many kilobytes
+        """
+        if not 0 <= error_rate <= 1 or not 0 <= throttle_rate <= 1:
+            raise ValueError("error_rate and throttle_rate must be between 0 and 1")
+            
+        self.latency = latency if isinstance(latency, Latency) else Latency(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.size_kb = size_kb
+
+
+class FakeServer:
+    """
+    Threaded HTTP server that answers like the B2Brilliant API
+    
+    Responses are generated from the request, so names flow through the way
+    they do with the real API: a discovered business is named after its URL,
+    and compatibility scores and campaigns name the businesses sent to them.
+    Campaign creation streams ``campaign`` events to clients that accept
+    ``text/event-stream``.
+    """
+    
+    ROUTES = (*USER_ENDPOINTS.values(), *BUSINESS_ENDPOINTS.values(), *CAMPAIGN_ENDPOINTS.values())
+    
+    def __init__(self, route=None, routes=None, host="127.0.0.1", port=0, api_key=None, seed=None):
+        """
+        Create a fake server. Call :meth:`start` or use it as a context manager.
+        
+        Args:
+            route (FakeRoute, optional): Behaviour of every route. Defaults to
+                instant, error-free responses.
+            routes (dict, optional): FakeRoute overrides keyed by endpoint
+            host (str, optional): Interface to listen on
+            port (int, optional): Port to listen on. 0 picks a free port.
+            api_key (str, optional): Reject requests without this x-api-key
+                with 401. Any key is accepted when omitted.
+            seed (int, optional): Seed for latencies, failures and content
+        """
+        default = route or FakeRoute()
+        self.routes = {endpoint: default for endpoint in self.ROUTES}
+        self.routes.update(routes or {})
+        self.api_key = api_key
+        self.rng = random.Random(seed)
+        self.calls = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = _FakeHTTPServer((host, port), _FakeHandler)
+        self._httpd.fake = self
+        self._thread = None
+        
+    @property
+    def url(self):
+        """str: Base URL to pass to a client or agent"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+        
+    def start(self):
+        """Serve requests on a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+            self._thread.start()
+        return self
+        
+    def serve_forever(self):
+        """Serve requests on the calling thread until interrupted"""
+        self._httpd.serve_forever()
+        
+    def stop(self):
+        """Stop serving and close the listening socket"""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+        
+    def __enter__(self):
+        return self.start()
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        
+    def _draw(self, sample):
+        """Call ``sample(rng)`` without letting threads interleave on the generator"""
+        with self._lock:
+            return sample(self.rng)
+            
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            
+    def _exit(self, endpoint, status):
+        with self._lock:
+            self.in_flight -= 1
+            self.calls[(endpoint, status)] += 1
+            
+    def _respond(self, endpoint, payload):
+        """Build the response document for a request"""
+        return self._draw(lambda rng: _BUILDERS[endpoint](payload, rng))
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once; the default backlog of 5 refuses them
+    request_queue_size = 1024
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_POST(self):
+        fake = self.server.fake
+        endpoint = urlparse(self.path).path
+        fake._enter()
+        status = 500
+        try:
+            status = self._handle(fake, endpoint)
+        finally:
+            fake._exit(endpoint, status)
+            
+    def _handle(self, fake, endpoint):
+        """Answer one request and return the status sent"""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        route = fake.routes.get(endpoint)
+        if route is None:
+            return self._send_json(404, {"message": f"Unknown endpoint {endpoint}"})
+        if fake.api_key is not None and self.headers.get("x-api-key") != fake.api_key:
+            return self._send_json(401, {"message": "Invalid API key"})
+            
+        try:
+            payload = json.loads(_decompress(body, self.headers.get("Content-Encoding")) or b"{}")
+        except (ValueError, OSError, zlib.error):
+            return self._send_json(400, {"message": "Request body is not valid JSON"})
+            
+        throttled, failed, latency = fake._draw(lambda rng: (
+            rng.random() < route.throttle_rate,
+            rng.random() < route.error_rate,
+            route.latency.sample(rng)
+        ))
+        if throttled:
+            headers = {} if route.retry_after is None else {"Retry-After": str(route.retry_after)}
+            return self._send_json(429, {"message": "Too many requests"}, headers)
+            
+        try:
+            document = fake._respond(endpoint, payload)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            return self._send_json(400, {"message": f"Invalid request: {e}"})
+            
+        if route.size_kb:
+            _pad(document, route.size_kb * 1024)
+            
+        if endpoint == CAMPAIGN_ENDPOINTS["CREATE"] and not failed and EVENT_STREAM in self.headers.get("Accept", ""):
+            return self._stream_campaigns(document["campaigns"], latency)
+            
+        time.sleep(latency)
+        if failed:
+            return self._send_json(route.error_status, {"message": "Injected failure"})
+        return self._send_json(200, document)
+        
+    def _send_json(self, status, document, headers=None):
+        body = json.dumps(document).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+        
+    def _stream_campaigns(self, campaigns, latency):
+        """Stream campaigns as server-sent events, spreading the latency between them"""
+        pause = latency / (len(campaigns) + 1)
+        time.sleep(pause)
+        self.send_response(200)
+        self.send_header("Content-Type", EVENT_STREAM)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        
+        for campaign in campaigns:
+            time.sleep(pause)
+            self.wfile.write(f"event: campaign\ndata: {json.dumps(campaign)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write(b"event: done\ndata: {}\n\n")
+        return 200
+        
+    def log_message(self, *args):
+        pass
+
+
+def _decompress(body, encoding):
+    """Undo the request compression ApiClient can apply"""
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    return body
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _points(rng):
+    return [_sentence(rng, 8) for _ in range(rng.randint(2, 4))]
+
+
+def _name_from_url(url):
+    """Turn ``https://www.acme-labs.com`` into ``Acme Labs``"""
+    host = urlparse(url if "//" in url else f"//{url}").hostname or url
+    if host.startswith("www."):
+        host = host[4:]
+    return host.split(".")[0].replace("-", " ").title()
+
+
+def _business_name(business):
+    return (business.get("profile") or {}).get("name") or "Unknown Business"
+
+
+def _business(name, rng, competitors=False, branding=True):
+    """Build a BusinessObject"""
+    slug = name.lower().replace(" ", "")
+    business = {
+        "profile": {
+            "name": name,
+            "summary": _sentence(rng),
+            "services": [_sentence(rng, 4) for _ in range(rng.randint(2, 5))],
+            "current_events": _sentence(rng),
+            "target_audience": _sentence(rng, 6),
+            "industry": rng.choice(("Software", "Marketing", "Retail", "Healthcare", "Logistics"))
+        },
+        "contacts": {
+            "point_of_contact": {"name": "Alex Morgan", "position": "Head of Partnerships"},
+            "social": [
+                {"platform": platform, "url": f"https://{platform}.com/{slug}"}
+                for platform in ("linkedin", "instagram")
+            ],
+            "email": f"hello@{slug}.com",
+            "phone": "+1 555 0100"
+        },
+        "confidence": {"score": round(rng.uniform(6, 10), 1), "reasoning": _sentence(rng)}
+    }
+    if branding:
+        business["branding"] = {
+            "voice": rng.choice(("friendly", "expert", "playful")),
+            "tone": rng.choice(("confident", "warm", "direct")),
+            "style": rng.choice(("concise", "storytelling", "data-driven")),
+            "phrases": [_sentence(rng, 3) for _ in range(3)]
+        }
+    if competitors:
+        business["competitors"] = [
+            {"name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}", "url": f"https://competitor{i}.com"}
+            for i in range(rng.randint(2, 4))
+        ]
+    return business
+
+
+def _discover(payload, rng):
+    return _business(
+        _name_from_url(payload["urls"][0]),
+        rng,
+        competitors=bool(payload.get("findCompetitors")),
+        branding=payload.get("findBranding", True)
+    )
+
+
+def _refine(payload, rng):
+    business = json.loads(json.dumps(payload["businessData"]))
+    profile = business.setdefault("profile", {})
+    profile["summary"] = f"{profile.get('summary', '')} {payload['additionalInfo']}".strip()
+    confidence = business.setdefault("confidence", {"score": 5.0})
+    confidence["score"] = min(10.0, round(confidence.get("score", 5.0) + rng.uniform(0, 1), 1))
+    return business
+
+
+def _compatibility(payload, rng):
+    return {
+        "target_business": _business_name(payload["targetBusiness"]),
+        "user_business": _business_name(payload["userBusiness"]),
+        "score": round(rng.uniform(0, 10), 1),
+        "reasoning": {"positives": _points(rng), "negatives": _points(rng), "recommendations": _points(rng)}
+    }
+
+
+def _campaign(campaign_type, target, rng):
+    return {
+        "type": campaign_type,
+        "content": f"Hi {target} team, " + " ".join(_sentence(rng) for _ in range(4)),
+        "rating": round(rng.uniform(5, 10), 1),
+        "feedback": {"strengths": _points(rng), "weaknesses": _points(rng), "suggestions": _points(rng)}
+    }
+
+
+def _create_campaigns(payload, rng):
+    target = _business_name(payload["targetBusiness"])
+    return {
+        "target_business": target,
+        "user_business": _business_name(payload["userBusiness"]),
+        "campaigns": [
+            _campaign(campaign_type, target, rng)
+            for campaign_type in payload.get("campaignTypes") or CAMPAIGN_TYPES
+        ]
+    }
+
+
+def _refine_campaigns(payload, rng):
+    previous = payload["campaign"]
+    target = previous.get("target_business") or _business_name(payload["targetBusiness"])
+    refined = []
+    for campaign in previous.get("campaigns") or [_campaign("email", target, rng)]:
+        campaign = _campaign(campaign.get("type", "email"), target, rng)
+        campaign["content"] += f" ({payload['feedback']})"
+        refined.append(campaign)
+    return {
+        "target_business": target,
+        "user_business": previous.get("user_business") or _business_name(payload["userBusiness"]),
+        "campaigns": refined
+    }
+
+
+_BUILDERS = {
+    USER_ENDPOINTS["DISCOVER"]: _discover,
+    USER_ENDPOINTS["REFINE"]: _refine,
+    BUSINESS_ENDPOINTS["DISCOVER"]: _discover,
+    BUSINESS_ENDPOINTS["REFINE"]: _refine,
+    BUSINESS_ENDPOINTS["COMPATIBILITY"]: _compatibility,
+    CAMPAIGN_ENDPOINTS["CREATE"]: _create_campaigns,
+    CAMPAIGN_ENDPOINTS["REFINE"]: _refine_campaigns
+}
+
+
+def _pad(document, size):
+    """Grow a response to at least ``size`` encoded bytes with filler its readers ignore"""
+    missing = int(size) - len(json.dumps(document))
+    if missing > 0:
+        filler = " ".join(WORDS) + " "
+        document["notes"] = (filler * (missing // len(filler) + 1))[:missing]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fake B2Brilliant API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="median latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.0, help="log-normal spread of the latency")
+    parser.add_argument("--max-latency", type=float, default=None, help="cap on latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1)
+    parser.add_argument("--size-kb", type=float, default=None)
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    
+    route = FakeRoute(
+        latency=Latency(args.latency, args.sigma, args.max_latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        size_kb=args.size_kb
+    )
+    server = FakeServer(route, host=args.host, port=args.port, api_key=args.api_key, seed=args.seed)
+    print(f"Fake B2Brilliant API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
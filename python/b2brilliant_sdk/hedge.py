@@ -0,0 +1,196 @@
+"""
+Hedged requests for cutting tail latency
+"""
+
+import math
+import threading
+from collections import deque
+from .endpoints import USER_ENDPOINTS, BUSINESS_ENDPOINTS
+
+# Discovery is read-only and has the longest tail, so it is safe and worth
+# hedging. Generation endpoints are billed per call and are never hedged by default.
+HEDGEABLE_ENDPOINTS = (
+    USER_ENDPOINTS["DISCOVER"],
+    BUSINESS_ENDPOINTS["DISCOVER"]
+)
+
+
+class _HedgeSkipped(Exception):
+    """A hedge was not sent because no concurrency slot was free"""
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies for one endpoint"""
+    
+    def __init__(self, window=200):
+        """
+        Create a new latency tracker
+        
+        Args:
+            window (int, optional): Number of recent samples kept
+        """
+        self._samples = deque(maxlen=window)
+        
+    def record(self, latency):
+        """
+        Add a latency sample
+        
+        Args:
+            latency (float): Latency in seconds
+        """
+        self._samples.append(latency)
+        
+    def percentile(self, percentile):
+        """
+        Get a percentile of the recent samples (nearest rank)
+        
+        Args:
+            percentile (float): Percentile between 0 and 100
+            
+        Returns:
+            float: Latency in seconds, or None without samples
+        """
+        if not self._samples:
+            return None
+            
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[rank - 1]
+        
+    def __len__(self):
+        return len(self._samples)
+
+
+class HedgePolicy:
+    """Decides when a slow request gets a duplicate and caps how often that happens"""
+    
+    def __init__(self, percentile=95, endpoints=HEDGEABLE_ENDPOINTS, max_hedge_ratio=0.1,
+                 max_hedge_burst=10, window=200, min_samples=20, min_delay=0.0,
+                 initial_delay=None):
+        """
+        Create a new hedge policy
+        
+        Args:
+            percentile (float, optional): A request that is still running after
+                this percentile of recent latency on its endpoint is hedged
+            endpoints (iterable, optional): Endpoints that may be hedged.
+                Only include endpoints that are safe to send twice.
+            max_hedge_ratio (float, optional): Maximum fraction of requests
+                that may be hedged. Each request earns this much hedge budget
+                and every hedge spends one.
+            max_hedge_burst (int, optional): Maximum hedge budget saved up
+                while latency is normal
+            window (int, optional): Number of recent latencies kept per endpoint
+            min_samples (int, optional): Samples needed before the percentile
+                is trusted
+            min_delay (float, optional): Never hedge sooner than this many seconds
+            initial_delay (float, optional): Hedge delay used until
+                min_samples latencies are known. Requests are not hedged
+                during warm-up when omitted.
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not 0 <= max_hedge_ratio <= 1:
+            raise ValueError("max_hedge_ratio must be between 0 and 1")
+            
+        self.percentile = percentile
+        self.endpoints = frozenset(endpoints)
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_hedge_burst = max_hedge_burst
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._budget = 0.0
+        self._trackers = {}
+        self._lock = threading.Lock()
+        
+    def hedges(self, endpoint):
+        """
+        Check whether requests to an endpoint may be hedged
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            bool: Whether the endpoint is hedged
+        """
+        return endpoint in self.endpoints
+        
+    def hedge_delay(self, endpoint):
+        """
+        Start a request and get how long to wait before hedging it
+        
+        Every call counts as one request and earns hedge budget.
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            float: Seconds to wait before sending a duplicate, or None if the
+                request should not be hedged
+        """
+        with self._lock:
+            self.requests += 1
+            self._budget = min(self.max_hedge_burst, self._budget + self.max_hedge_ratio)
+            
+            tracker = self._trackers.get(endpoint)
+            if tracker is not None and len(tracker) >= self.min_samples:
+                delay = tracker.percentile(self.percentile)
+            else:
+                delay = self.initial_delay
+                
+        if delay is None:
+            return None
+        return max(delay, self.min_delay)
+        
+    def acquire_hedge(self):
+        """
+        Spend hedge budget on a duplicate request
+        
+        Returns:
+            bool: Whether the hedge may be sent
+        """
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self.hedged += 1
+            return True
+            
+    def record(self, endpoint, latency, hedge_won=False):
+        """
+        Record how long a request took to get its first response
+        
+        Args:
+            endpoint (str): API endpoint
+            latency (float): Seconds from the first send to the first response
+            hedge_won (bool, optional): Whether the duplicate answered first
+        """
+        with self._lock:
+            tracker = self._trackers.get(endpoint)
+            if tracker is None:
+                tracker = self._trackers[endpoint] = LatencyTracker(self.window)
+            tracker.record(latency)
+            if hedge_won:
+                self.hedge_wins += 1
+                
+    def stats(self):
+        """
+        Get hedging statistics
+        
+        Returns:
+            dict: ``requests`` started, ``hedged`` duplicates sent,
+                ``hedge_wins`` where the duplicate answered first and the
+                resulting ``hedge_rate``
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedged / self.requests if self.requests else 0.0
+            }
@@ -0,0 +1,192 @@
+"""
+Request event hooks with per-phase timings
+"""
+
+from collections import namedtuple
+
+# Phases that can appear in RequestEvent.timings, in the order they happen
+PHASES = ("encode", "rate_limit", "concurrency", "connect", "tls", "ttfb", "transfer", "decode")
+
+
+class RequestEvent(namedtuple(
+    "RequestEvent",
+    ["endpoint", "attempt", "status", "request_size", "response_size", "timings", "error", "retry_delay", "hedge"],
+    defaults=(False,)
+)):
+    """
+    State of one attempt of a request when a hook is called
+    
+    Attributes:
+        endpoint (str): API endpoint
+        attempt (int): Attempt number, starting at 1
+        status (int): HTTP status of the response, or None if none arrived
+        request_size (int): Bytes in the request body as sent
+        response_size (int): Bytes in the response body, or None if it was
+            not read (streams) or no response arrived
+        timings (dict): Seconds spent in each phase of the attempt so far,
+            keyed by the names in PHASES. ``encode`` is only part of the
+            first attempt. ``concurrency`` is the wait for an adaptive
+            concurrency slot. ``connect`` (DNS lookup and TCP connect) and
+            ``tls`` only appear when a new connection was opened. ``ttfb``
+            runs from sending the request to receiving the response headers.
+        error (ApiError): Error that ended the attempt, or None
+        retry_delay (float): Seconds before the next attempt, or None
+        hedge (bool): Whether the attempt is a hedged duplicate. A hedge
+            that answers first carries the request's remaining events.
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def elapsed(self):
+        """float: Total seconds across the recorded phases"""
+        return sum(self.timings.values())
+
+
+class RequestHooks:
+    """
+    Receives events for the requests a client sends
+    
+    Subclass it and override the methods you need. Hooks run on the thread
+    or event loop making the request, or on the thread of a hedged attempt
+    of a synchronous client, so keep them quick. An exception
+    raised by a hook propagates to the caller. Responses served from the
+    cache or shared with a coalesced call send no events.
+    """
+    
+    def on_request_start(self, event):
+        """
+        Called before each attempt is sent, after any rate limiter or
+        concurrency limit wait
+        
+        Args:
+            event (RequestEvent): The attempt, with ``status`` still None
+        """
+        
+    def on_response(self, event):
+        """
+        Called when an attempt receives an HTTP response, whatever its status
+        
+        Args:
+            event (RequestEvent): The attempt with its status, size and timings
+        """
+        
+    def on_retry(self, event):
+        """
+        Called when a failed attempt is about to be retried
+        
+        Args:
+            event (RequestEvent): The failed attempt, with ``error`` and
+                ``retry_delay`` set
+        """
+        
+    def on_error(self, event):
+        """
+        Called when a request fails and will not be retried
+        
+        Args:
+            event (RequestEvent): The last attempt, with ``error`` set
+        """
+        
+    def on_abandon(self, event):
+        """
+        Called when an attempt ends with neither a response nor a network
+        error, such as when the task sending it is cancelled, or when it
+        loses a hedged race and its outcome is discarded
+        
+        Args:
+            event (RequestEvent): The abandoned attempt, with ``status`` None
+        """
+
+
+class RequestTrace:
+    """Timings of one request, reported to hooks as its attempts progress"""
+    
+    __slots__ = ("hooks", "endpoint", "hedge", "attempt", "request_size", "status", "response_size", "timings")
+    
+    def __init__(self, hooks, endpoint, hedge=False):
+        """
+        Start tracing a request
+        
+        Args:
+            hooks (list): RequestHooks to notify
+            endpoint (str): API endpoint
+            hedge (bool, optional): Whether the trace follows a hedged duplicate
+        """
+        self.hooks = hooks
+        self.endpoint = endpoint
+        self.hedge = hedge
+        self.attempt = 0
+        self.request_size = None
+        self.status = None
+        self.response_size = None
+        self.timings = {}
+        
+    def fork(self, hedge=False):
+        """Trace one of several racing attempts, starting from the timings so far"""
+        trace = RequestTrace(self.hooks, self.endpoint, hedge)
+        trace.timings = dict(self.timings)
+        return trace
+        
+    def adopt(self, other):
+        """Continue with the state of the racing attempt that won"""
+        self.hedge = other.hedge
+        self.attempt = other.attempt
+        self.request_size = other.request_size
+        self.status = other.status
+        self.response_size = other.response_size
+        self.timings = dict(other.timings)
+        
+    def record(self, phase, seconds):
+        """Add time spent in a phase of the current attempt"""
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+        
+    def add(self, timings):
+        """Add the phase timings measured by the transport"""
+        for phase, seconds in (timings or {}).items():
+            self.record(phase, seconds)
+            
+    def start(self, attempt, request_size):
+        """An attempt is about to be sent"""
+        self.attempt = attempt
+        self.request_size = request_size
+        self.status = None
+        self.response_size = None
+        self._emit("on_request_start")
+        
+    def respond(self, status, response_size):
+        """The current attempt received a response"""
+        self.status = status
+        self.response_size = response_size
+        self._emit("on_response")
+        
+    def retry(self, error, delay):
+        """The current attempt failed and will be retried"""
+        self._emit("on_retry", error, delay)
+        self.timings = {}
+        
+    def fail(self, error):
+        """The request failed for good"""
+        self._emit("on_error", error)
+        
+    def abandon(self):
+        """The current attempt ended without a response or a network error"""
+        self._emit("on_abandon")
+        
+    def _emit(self, name, error=None, retry_delay=None):
+        if not self.hooks:
+            return
+            
+        event = RequestEvent(
+            self.endpoint,
+            self.attempt,
+            self.status,
+            self.request_size,
+            self.response_size,
+            dict(self.timings),
+            error,
+            retry_delay,
+            self.hedge
+        )
+        for hook in self.hooks:
+            getattr(hook, name)(event)
@@ -0,0 +1,432 @@
+"""
+Checkpointed batch jobs that resume where they left off
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from .batch import DEFAULT_MAX_CONCURRENCY, BatchResult, run_batch, run_batch_async
+from .codec import get_codec
+from .exceptions import ApiError, ValidationError
+from .profile import PreEncoded, encode_payload
+
+DONE = "done"
+FAILED = "failed"
+
+
+def item_key(item):
+    """
+    Build the checkpoint key of a batch input
+    
+    Args:
+        item: Batch input, such as a list of URLs
+        
+    Returns:
+        str: Hex digest of the canonical JSON of the input
+    """
+    if isinstance(item, PreEncoded):
+        return item.content_hash
+        
+    canonical = json.dumps(
+        item,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=lambda value: dict(value) if isinstance(value, Mapping) else str(value)
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _error_record(error):
+    """Turn an SDK error into JSON-compatible data"""
+    if error is None:
+        return None
+    if isinstance(error, ValidationError):
+        return {"type": "ValidationError", "message": error.message, "validation_errors": error.validation_errors}
+    return {"type": "ApiError", "message": error.message, "status": error.status, "data": error.data,
+            "retries": error.retries}
+
+
+def _error_from_record(record):
+    """Rebuild the SDK error saved by _error_record"""
+    if record is None:
+        return None
+    if record["type"] == "ValidationError":
+        return ValidationError(record["message"], record.get("validation_errors"))
+    return ApiError(record["message"], record.get("status"), record.get("data"), record.get("retries", 0))
+
+
+class JsonlJobStore:
+    """
+    Append-only JSON Lines checkpoint file
+    
+    Each finished item is appended as one line, written with a single call
+    and flushed to disk, so a crash can at worst leave a torn last line. That
+    line is cut off when the file is opened again. Only a 16-byte digest and
+    a line number per item are kept in memory; results stay on disk.
+    """
+    
+    def __init__(self, path, fsync=True, codec=None):
+        """
+        Open or create a checkpoint file
+        
+        Args:
+            path (str): File path
+            fsync (bool, optional): Force every record to disk before the
+                item counts as done. Turn off to trade durability for speed.
+            codec (str or object, optional): JSON codec for records
+        """
+        self.path = path
+        self.fsync = fsync
+        self._codec = get_codec(codec)
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._lines = 0
+        self._load()
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        
+    @staticmethod
+    def _digest(key):
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        
+    def _load(self):
+        """Index the records already in the file, dropping a torn last line"""
+        if not os.path.exists(self.path):
+            return
+            
+        with open(self.path, "rb+") as f:
+            good = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = self._codec.loads(line)
+                except ValueError:
+                    break
+                self._latest[self._digest(record["key"])] = (self._lines, record["error"] is None)
+                self._lines += 1
+                good += len(line)
+            f.truncate(good)
+            
+    def status(self, key):
+        """
+        Get the checkpointed status of an item
+        
+        Args:
+            key (str): Item key
+            
+        Returns:
+            str: ``"done"``, ``"failed"`` or None if the item never finished
+        """
+        with self._lock:
+            latest = self._latest.get(self._digest(key))
+        if latest is None:
+            return None
+        return DONE if latest[1] else FAILED
+        
+    def record(self, key, result):
+        """
+        Append the outcome of an item
+        
+        Args:
+            key (str): Item key
+            result (BatchResult): Finished item
+        """
+        line = encode_payload(self._codec, {
+            "key": key,
+            "index": result.index,
+            "input": result.input,
+            "result": result.result,
+            "error": _error_record(result.error)
+        }) + b"\n"
+        with self._lock:
+            os.write(self._fd, line)
+            if self.fsync:
+                os.fsync(self._fd)
+            self._latest[self._digest(key)] = (self._lines, result.error is None)
+            self._lines += 1
+            
+    def results(self):
+        """
+        Read back the latest outcome of every checkpointed item
+        
+        Yields:
+            BatchResult: Items in the order they finished, with decoded
+                results and rebuilt errors
+        """
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f):
+                if number >= self._lines:
+                    break
+                record = self._codec.loads(line)
+                if self._latest[self._digest(record["key"])][0] == number:
+                    yield BatchResult(
+                        record["index"], record["input"], record["result"], _error_from_record(record["error"])
+                    )
+                    
+    def counts(self):
+        """
+        Count checkpointed items
+        
+        Returns:
+            dict: Number of ``"done"`` and ``"failed"`` items
+        """
+        with self._lock:
+            done = sum(1 for _, ok in self._latest.values() if ok)
+            return {DONE: done, FAILED: len(self._latest) - done}
+            
+    def close(self):
+        """Close the file"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SQLiteJobStore:
+    """
+    Checkpoint table in a SQLite database
+    
+    Every record is committed in its own transaction, and item statuses are
+    looked up in the database, so memory use does not grow with the job.
+    """
+    
+    def __init__(self, path, codec=None):
+        """
+        Open or create a checkpoint database
+        
+        Args:
+            path (str): Database file path. The file and table are created if needed.
+            codec (str or object, optional): JSON codec for inputs and results
+        """
+        self.path = path
+        self._codec = get_codec(codec)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS batch_job ("
+            " key TEXT PRIMARY KEY,"
+            " idx INTEGER NOT NULL,"
+            " record BLOB NOT NULL,"
+            " error TEXT,"
+            " status TEXT NOT NULL,"
+            " finished_at REAL NOT NULL)"
+        )
+        
+    def status(self, key):
+        """
+        Get the checkpointed status of an item
+        
+        Args:
+            key (str): Item key
+            
+        Returns:
+            str: ``"done"``, ``"failed"`` or None if the item never finished
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM batch_job WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+        
+    def record(self, key, result):
+        """
+        Save the outcome of an item, replacing any earlier failure
+        
+        Args:
+            key (str): Item key
+            result (BatchResult): Finished item
+        """
+        encoded = encode_payload(self._codec, {"input": result.input, "result": result.result})
+        error = _error_record(result.error)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO batch_job (key, idx, record, error, status, finished_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, result.index, encoded, json.dumps(error) if error else None,
+                 DONE if error is None else FAILED, time.time())
+            )
+            
+    def results(self):
+        """
+        Read back the latest outcome of every checkpointed item
+        
+        Yields:
+            BatchResult: Items in input order, with decoded results and
+                rebuilt errors
+        """
+        # A separate connection streams the rows without blocking writers
+        conn = sqlite3.connect(self.path)
+        try:
+            for index, encoded, error in conn.execute("SELECT idx, record, error FROM batch_job ORDER BY idx"):
+                record = self._codec.loads(encoded)
+                yield BatchResult(
+                    index, record["input"], record["result"], _error_from_record(json.loads(error) if error else None)
+                )
+        finally:
+            conn.close()
+            
+    def counts(self):
+        """
+        Count checkpointed items
+        
+        Returns:
+            dict: Number of ``"done"`` and ``"failed"`` items
+        """
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT status, COUNT(*) FROM batch_job GROUP BY status"))
+        return {DONE: rows.get(DONE, 0), FAILED: rows.get(FAILED, 0)}
+        
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_store(path, **options):
+    """
+    Open a checkpoint store, choosing the format from the file extension
+    
+    Args:
+        path (str): ``.jsonl`` for a JsonlJobStore, anything else for a SQLiteJobStore
+        **options: Store options
+        
+    Returns:
+        JsonlJobStore or SQLiteJobStore: The store
+    """
+    if str(path).endswith(".jsonl"):
+        return JsonlJobStore(path, **options)
+    return SQLiteJobStore(path, **options)
+
+
+class BatchJob:
+    """
+    Batch of API calls checkpointed to a local store as it runs
+    
+    Each item is recorded the moment its call finishes, from the worker that
+    made it, so results already paid for survive a crash. Running the job
+    again over the same inputs skips items that succeeded and retries only
+    the ones that failed or never finished. Inputs are read lazily and
+    results are not kept in memory.
+    """
+    
+    def __init__(self, func, store, key=item_key, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 retry_failed=True):
+        """
+        Create a batch job
+        
+        Args:
+            func (callable): Called with each input, such as
+                ``lambda urls: agent.business.discover(urls)``. A coroutine
+                function when the job is run with :meth:`run_async`.
+            store (str or object): Checkpoint file path (see :func:`open_store`)
+                or an open JsonlJobStore or SQLiteJobStore
+            key (callable, optional): Maps an input to its checkpoint key.
+                Defaults to a hash of the input's canonical JSON.
+            max_concurrency (int, optional): Maximum number of calls in flight
+            retry_failed (bool, optional): Retry items whose last attempt
+                failed. When False, only items never attempted are run.
+        """
+        self.func = func
+        self.store = open_store(store) if isinstance(store, (str, os.PathLike)) else store
+        self.key = key
+        self.max_concurrency = max_concurrency
+        self.retry_failed = retry_failed
+        self.skipped = 0
+        
+    def _pending(self, items):
+        """Inputs still to run, as ``(index, key, item)``"""
+        self.skipped = 0
+        for index, item in enumerate(items):
+            key = self.key(item)
+            status = self.store.status(key)
+            if status == DONE or (status == FAILED and not self.retry_failed):
+                self.skipped += 1
+                continue
+            yield index, key, item
+            
+    def _record(self, task, result=None, error=None):
+        index, key, item = task
+        finished = BatchResult(index, item, result, error)
+        self.store.record(key, finished)
+        return finished
+        
+    def run(self, items):
+        """
+        Run the calls that are not checkpointed as done yet
+        
+        Args:
+            items (iterable): Inputs, in the same order on every run
+            
+        Yields:
+            BatchResult: One result per item run now, as calls finish. Items
+                skipped because they were already done are counted in
+                ``skipped``.
+        """
+        def call(task):
+            try:
+                return self._record(task, result=self.func(task[2]))
+            except (ApiError, ValidationError) as e:
+                self._record(task, error=e)
+                raise
+                
+        for outcome in run_batch(call, self._pending(items), self.max_concurrency, as_completed=True):
+            yield outcome.result if outcome.ok else self._unwrap(outcome)
+            
+    async def run_async(self, items):
+        """
+        Await the calls that are not checkpointed as done yet
+        
+        Asynchronous counterpart of :meth:`run`. ``func`` must be a
+        coroutine function.
+        
+        Yields:
+            BatchResult: One result per item run now, as calls finish
+        """
+        async def call(task):
+            try:
+                return self._record(task, result=await self.func(task[2]))
+            except (ApiError, ValidationError) as e:
+                self._record(task, error=e)
+                raise
+                
+        async for outcome in run_batch_async(call, self._pending(items), self.max_concurrency, as_completed=True):
+            yield outcome.result if outcome.ok else self._unwrap(outcome)
+            
+    @staticmethod
+    def _unwrap(outcome):
+        """Turn the failed outcome of a task into a BatchResult for its item"""
+        index, _, item = outcome.input
+        return BatchResult(index, item, None, outcome.error)
+        
+    def results(self):
+        """
+        Read back every checkpointed outcome, including earlier runs
+        
+        Yields:
+            BatchResult: Latest outcome of each item
+        """
+        return self.store.results()
+        
+    def close(self):
+        """Close the checkpoint store"""
+        self.store.close()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
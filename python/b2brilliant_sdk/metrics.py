@@ -0,0 +1,257 @@
+"""
+In-process request metrics with Prometheus text export
+"""
+
+import bisect
+import threading
+from .endpoints import BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS, USER_ENDPOINTS
+from .exceptions import CircuitOpenError
+from .hooks import RequestHooks
+
+# Latency buckets in seconds. Discovery and generation calls take seconds, not milliseconds.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+ENDPOINTS = (*USER_ENDPOINTS.values(), *BUSINESS_ENDPOINTS.values(), *CAMPAIGN_ENDPOINTS.values())
+
+# Phases that happen before an attempt goes on the wire
+_QUEUED_PHASES = ("encode", "rate_limit", "concurrency")
+
+
+class _Histogram:
+    """Latency histogram with fixed upper bounds"""
+    
+    __slots__ = ("bounds", "counts", "sum", "count")
+    
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        
+    def cumulative(self):
+        """List of (upper bound, observations at or below it), ending with +Inf"""
+        total = 0
+        buckets = []
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+
+class _EndpointMetrics:
+    """Counters for one endpoint"""
+    
+    __slots__ = ("requests", "retries", "responses", "errors", "in_flight",
+                 "bytes_sent", "bytes_received", "latency")
+    
+    def __init__(self, buckets):
+        self.requests = 0
+        self.retries = 0
+        self.responses = {}
+        self.errors = {}
+        self.in_flight = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = _Histogram(buckets)
+
+
+class MetricsRegistry(RequestHooks):
+    """
+    Keeps request counts, errors, in-flight requests, latency and bytes per endpoint
+    
+    The registry is a RequestHooks implementation. Pass it to a client or
+    agent as ``metrics`` (or in ``hooks``). One registry can be shared by
+    several clients, and it is safe to use from many threads.
+    """
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS, endpoints=ENDPOINTS):
+        """
+        Create a new metrics registry
+        
+        Args:
+            buckets (tuple, optional): Upper bounds of the latency histogram
+                buckets, in seconds
+            endpoints (iterable, optional): Endpoints reported even before
+                their first request. Defaults to every API endpoint.
+        """
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        self._endpoints = {endpoint: _EndpointMetrics(self.buckets) for endpoint in endpoints}
+        self._concurrency = None
+        self._lock = threading.Lock()
+        
+    def watch_concurrency(self, adaptive_concurrency):
+        """
+        Report the current limits of an AdaptiveConcurrency
+        
+        Clients created with both ``metrics`` and ``adaptive_concurrency``
+        call this themselves.
+        
+        Args:
+            adaptive_concurrency (AdaptiveConcurrency): Limits to report
+        """
+        self._concurrency = adaptive_concurrency
+        
+    def _concurrency_limit(self, endpoint):
+        """Current adaptive limit of an endpoint's group, or None"""
+        if self._concurrency is None:
+            return None
+        return int(self._concurrency.limiter(endpoint).limit)
+        
+    def _endpoint(self, endpoint):
+        """Get the metrics of an endpoint, creating them on first use. Call with the lock held."""
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics(self.buckets)
+        return metrics
+        
+    def on_request_start(self, event):
+        with self._lock:
+            metrics = self._endpoint(event.endpoint)
+            metrics.requests += 1
+            metrics.in_flight += 1
+            metrics.bytes_sent += event.request_size or 0
+            
+    def on_response(self, event):
+        latency = sum(
+            seconds for phase, seconds in event.timings.items()
+            if phase not in _QUEUED_PHASES
+        )
+        with self._lock:
+            metrics = self._endpoint(event.endpoint)
+            metrics.in_flight -= 1
+            metrics.responses[event.status] = metrics.responses.get(event.status, 0) + 1
+            metrics.bytes_received += event.response_size or 0
+            metrics.latency.observe(latency)
+            
+    def on_retry(self, event):
+        with self._lock:
+            metrics = self._endpoint(event.endpoint)
+            metrics.retries += 1
+            if event.status is None:
+                # No response arrived, so on_response did not end the attempt
+                metrics.in_flight -= 1
+                
+    def on_error(self, event):
+        status = event.error.status if event.error is not None else 0
+        with self._lock:
+            metrics = self._endpoint(event.endpoint)
+            metrics.errors[status] = metrics.errors.get(status, 0) + 1
+            if event.status is None and not isinstance(event.error, CircuitOpenError):
+                # The failed attempt got no response, so on_response did not end it.
+                # A circuit breaker rejection never started one.
+                metrics.in_flight -= 1
+                
+    def on_abandon(self, event):
+        with self._lock:
+            self._endpoint(event.endpoint).in_flight -= 1
+                
+    def snapshot(self):
+        """
+        Get the current metrics as plain data
+        
+        Returns:
+            dict: Metrics keyed by endpoint. Each entry has ``requests``
+                (attempts sent), ``retries``, ``responses`` and ``errors``
+                (counts keyed by status, 0 for network errors), ``in_flight``,
+                ``bytes_sent``, ``bytes_received``, ``latency`` (``count``,
+                ``sum`` in seconds and cumulative ``buckets`` keyed by upper
+                bound) and ``concurrency_limit``, the adaptive limit of the
+                endpoint's group or None without adaptive concurrency.
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": metrics.requests,
+                    "retries": metrics.retries,
+                    "responses": dict(metrics.responses),
+                    "errors": dict(metrics.errors),
+                    "in_flight": metrics.in_flight,
+                    "bytes_sent": metrics.bytes_sent,
+                    "bytes_received": metrics.bytes_received,
+                    "latency": {
+                        "count": metrics.latency.count,
+                        "sum": metrics.latency.sum,
+                        "buckets": dict(metrics.latency.cumulative())
+                    },
+                    "concurrency_limit": self._concurrency_limit(endpoint)
+                }
+                for endpoint, metrics in self._endpoints.items()
+            }
+            
+    def prometheus(self, prefix="b2brilliant"):
+        """
+        Render the metrics in the Prometheus text exposition format
+        
+        Args:
+            prefix (str, optional): Prefix for every metric name
+            
+        Returns:
+            str: Metrics text, ready to serve on a ``/metrics`` endpoint
+        """
+        snapshot = self.snapshot()
+        lines = []
+        
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            
+        def sample(name, labels, value):
+            rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+            lines.append(f"{prefix}_{name}{{{rendered}}} {_number(value)}")
+            
+        simple = (
+            ("requests_total", "counter", "Request attempts sent, including retries", "requests"),
+            ("retries_total", "counter", "Attempts that failed and were retried", "retries"),
+            ("in_flight_requests", "gauge", "Attempts waiting for a response", "in_flight"),
+            ("sent_bytes_total", "counter", "Request body bytes sent", "bytes_sent"),
+            ("received_bytes_total", "counter", "Response body bytes received", "bytes_received")
+        )
+        for name, kind, help_text, key in simple:
+            family(name, kind, help_text)
+            for endpoint, metrics in snapshot.items():
+                sample(name, [("endpoint", endpoint)], metrics[key])
+                
+        for name, help_text, key in (
+            ("responses_total", "HTTP responses received by status", "responses"),
+            ("errors_total", "Requests that failed for good by status, 0 for network errors", "errors")
+        ):
+            family(name, "counter", help_text)
+            for endpoint, metrics in snapshot.items():
+                for status, count in sorted(metrics[key].items()):
+                    sample(name, [("endpoint", endpoint), ("status", status)], count)
+                    
+        if self._concurrency is not None:
+            name = "concurrency_limit"
+            family(name, "gauge", "Requests allowed in flight by the adaptive limit of the endpoint's group")
+            for endpoint, metrics in snapshot.items():
+                sample(name, [("endpoint", endpoint)], metrics["concurrency_limit"])
+                    
+        name = "request_duration_seconds"
+        family(name, "histogram", "Time from sending an attempt to its decoded response")
+        for endpoint, metrics in snapshot.items():
+            latency = metrics["latency"]
+            for bound, count in latency["buckets"].items():
+                sample(f"{name}_bucket", [("endpoint", endpoint), ("le", _number(bound))], count)
+            sample(f"{name}_sum", [("endpoint", endpoint)], latency["sum"])
+            sample(f"{name}_count", [("endpoint", endpoint)], latency["count"])
+            
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value):
+    """Format a sample value the way Prometheus expects"""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.1f}"
+    return str(value)
@@ -0,0 +1,190 @@
+"""
+Compact response models that keep the raw JSON and decode nested fields on demand
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from .codec import get_codec
+from .endpoints import BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS, USER_ENDPOINTS
+from .profile import PreEncoded, _freeze
+
+_CODEC = get_codec()
+
+# Responses of one kind share a single key tuple instead of holding one each
+_KEY_TUPLES = {}
+_MAX_KEY_TUPLES = 1024
+
+
+def _slots(fields):
+    """Slot names backing the given fields"""
+    return tuple("_" + name for name in fields)
+
+
+def _field(name):
+    """Build the property for a field, decoding it from the raw JSON on first access"""
+    slot = "_" + name
+    
+    def get(self):
+        try:
+            return getattr(self, slot)
+        except AttributeError:
+            pass
+        value = _freeze(self._document().get(name))
+        setattr(self, slot, value)
+        return value
+        
+    return property(get, doc=f"The ``{name}`` field, or None if the response has none")
+
+
+class ResponseModel(PreEncoded, Mapping):
+    """
+    Read-only response that keeps its raw JSON and decodes nested fields when read
+    
+    Scalar fields are kept when the response arrives. Nested objects and
+    arrays in ``FIELDS`` stay encoded until they are first read, and other
+    keys are decoded each time they are read. Models behave as read-only
+    mappings, so code that reads responses like dicts keeps working, and
+    they can be passed back to the API without being encoded again.
+    """
+    
+    FIELDS = ()
+    
+    __slots__ = ("_raw", "_codec", "_keys", "_hash")
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls.FIELDS:
+            setattr(cls, name, _field(name))
+            
+    def __init__(self, raw, codec=None):
+        """
+        Create a model from a response body
+        
+        Args:
+            raw (bytes): UTF-8 encoded JSON object
+            codec (optional): JSON codec used to decode fields. Defaults to
+                the fastest installed library.
+                
+        Raises:
+            ValueError: If the body is not a JSON object
+        """
+        self._raw = bytes(raw)
+        self._codec = codec or _CODEC
+        
+        document = self._codec.loads(self._raw)
+        if not isinstance(document, dict):
+            raise ValueError(f"{type(self).__name__} expects a JSON object")
+            
+        keys = tuple(document)
+        if len(_KEY_TUPLES) < _MAX_KEY_TUPLES:
+            keys = _KEY_TUPLES.setdefault(keys, keys)
+        self._keys = keys
+        
+        for name in self.FIELDS:
+            value = document.get(name)
+            if not isinstance(value, (dict, list)):
+                setattr(self, "_" + name, value)
+                
+    def _document(self):
+        """Decode the whole raw response"""
+        return self._codec.loads(self._raw)
+        
+    @property
+    def json_bytes(self):
+        """bytes: Raw JSON of the response"""
+        return self._raw
+        
+    @property
+    def content_hash(self):
+        """str: SHA-256 hex digest of the canonical (key-sorted) JSON encoding"""
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+        canonical = json.dumps(self._document(), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        self._hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return self._hash
+        
+    def to_dict(self):
+        """
+        Decode the whole response into plain, mutable dicts and lists
+        
+        Returns:
+            dict: Response data
+        """
+        return self._document()
+        
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return _freeze(self._document()[key])
+        
+    def __iter__(self):
+        return iter(self._keys)
+        
+    def __len__(self):
+        return len(self._keys)
+        
+    def __contains__(self, key):
+        return key in self._keys
+        
+    def __eq__(self, other):
+        if isinstance(other, ResponseModel):
+            other = other.to_dict()
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == other
+        
+    def __hash__(self):
+        return hash(self.content_hash)
+        
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+        
+    def __copy__(self):
+        return self
+        
+    def __deepcopy__(self, memo):
+        return self
+        
+    def __reduce__(self):
+        return type(self), (self._raw,)
+
+
+class BusinessModel(ResponseModel):
+    """Business information returned by the discover and refine methods"""
+    
+    FIELDS = ("profile", "contacts", "branding", "competitors", "confidence")
+    
+    __slots__ = _slots(FIELDS)
+
+
+class CompatibilityModel(ResponseModel):
+    """Compatibility assessment between a user and a target business"""
+    
+    FIELDS = ("target_business", "user_business", "score", "reasoning")
+    
+    __slots__ = _slots(FIELDS)
+
+
+class CampaignModel(ResponseModel):
+    """Campaigns generated or refined for a target business"""
+    
+    FIELDS = ("target_business", "user_business", "campaigns")
+    
+    __slots__ = _slots(FIELDS)
+
+
+# Model used for each endpoint when a client is created with response_models=True
+RESPONSE_MODELS = {
+    USER_ENDPOINTS["DISCOVER"]: BusinessModel,
+    USER_ENDPOINTS["REFINE"]: BusinessModel,
+    BUSINESS_ENDPOINTS["DISCOVER"]: BusinessModel,
+    BUSINESS_ENDPOINTS["REFINE"]: BusinessModel,
+    BUSINESS_ENDPOINTS["COMPATIBILITY"]: CompatibilityModel,
+    CAMPAIGN_ENDPOINTS["CREATE"]: CampaignModel,
+    CAMPAIGN_ENDPOINTS["REFINE"]: CampaignModel
+}
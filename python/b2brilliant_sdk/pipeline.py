@@ -0,0 +1,287 @@
+"""
+Streaming prospecting pipeline: discover targets, score them and write campaigns
+"""
+
+import queue
+import threading
+from collections import namedtuple
+from .batch import DEFAULT_MAX_CONCURRENCY
+from .exceptions import ApiError, ValidationError
+from .profile import BusinessProfile
+
+DEFAULT_MIN_SCORE = 7
+
+# How often blocked workers check whether the run was stopped
+_POLL_INTERVAL = 0.1
+
+_STOP = object()
+
+
+class ProspectResult(namedtuple(
+    "ProspectResult",
+    ["index", "urls", "target_business", "compatibility", "campaigns", "error", "stage"]
+)):
+    """
+    Outcome of one target in a pipeline run
+    
+    Attributes:
+        index (int): Position of the target in the input
+        urls (list): URLs the target was discovered from
+        target_business (dict): Discovered target business, or None
+        compatibility (dict): Compatibility score, or None
+        campaigns (dict): Generated campaigns, or None if the target did not
+            qualify or a stage failed
+        error (Exception): ApiError or ValidationError that stopped the
+            target, or None
+        stage (str): Stage the error was raised in (``"discover"``,
+            ``"compatibility"`` or ``"campaigns"``), or None
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def ok(self):
+        """bool: Whether every stage the target reached succeeded"""
+        return self.error is None
+        
+    @property
+    def qualified(self):
+        """bool: Whether campaigns were generated for the target"""
+        return self.campaigns is not None
+
+
+class _Failure:
+    """Unexpected exception raised by a worker, re-raised to the consumer"""
+    
+    __slots__ = ("error",)
+    
+    def __init__(self, error):
+        self.error = error
+
+
+class ProspectingPipeline:
+    """Runs discover, compatibility and campaign generation as overlapping stages"""
+    
+    def __init__(self, agent, user_business, min_score=DEFAULT_MIN_SCORE, qualify=None,
+                 campaign_types=None, discover_options=None,
+                 discover_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 compatibility_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 campaign_concurrency=DEFAULT_MAX_CONCURRENCY, queue_size=None):
+        """
+        Create a new prospecting pipeline
+        
+        Each stage has its own worker threads, and stages are connected by
+        bounded queues. A target moves on as soon as its previous stage
+        finishes. When a later stage falls behind, the earlier stages wait
+        instead of piling up results.
+        
+        Args:
+            agent (B2BrilliantAgent): Agent used for every call. Size its
+                connection pool to the total concurrency.
+            user_business (dict): Discovered user business, sent with every
+                compatibility and campaign call. Plain dicts are wrapped in a
+                BusinessProfile so they are encoded only once.
+            min_score (float, optional): Minimum compatibility score for a
+                target to get campaigns
+            qualify (callable, optional): Called with the compatibility result;
+                return True to generate campaigns. Replaces min_score.
+            campaign_types (list or str, optional): Campaign types to create
+            discover_options (dict, optional): Options for target discovery
+            discover_concurrency (int, optional): Discover calls in flight
+            compatibility_concurrency (int, optional): Compatibility calls in flight
+            campaign_concurrency (int, optional): Campaign calls in flight
+            queue_size (int, optional): Maximum targets waiting in front of
+                each stage. Defaults to twice that stage's concurrency.
+        """
+        concurrency = (discover_concurrency, compatibility_concurrency, campaign_concurrency)
+        if min(concurrency) < 1:
+            raise ValueError("stage concurrency must be at least 1")
+            
+        self.agent = agent
+        self.user_business = BusinessProfile.of(user_business)
+        self.min_score = min_score
+        self.qualify = qualify or self._meets_min_score
+        self.campaign_types = campaign_types
+        self.discover_options = discover_options
+        self.discover_concurrency = discover_concurrency
+        self.compatibility_concurrency = compatibility_concurrency
+        self.campaign_concurrency = campaign_concurrency
+        self.queue_size = queue_size
+        
+    @classmethod
+    def for_user(cls, agent, urls, options=None, **kwargs):
+        """
+        Discover the user business once and build a pipeline around it
+        
+        Args:
+            agent (B2BrilliantAgent): Agent used for every call
+            urls (list): User business URLs
+            options (dict, optional): User discovery options
+            **kwargs: Other ProspectingPipeline arguments
+            
+        Returns:
+            ProspectingPipeline: Pipeline reusing the discovered user business
+        """
+        return cls(agent, agent.user.discover(urls, options), **kwargs)
+        
+    def _meets_min_score(self, compatibility):
+        """Default qualification: the compatibility score reaches min_score"""
+        score = (compatibility or {}).get("score")
+        return isinstance(score, (int, float)) and score >= self.min_score
+        
+    def _discover(self, prospect):
+        """Discover a target business"""
+        target = self.agent.business.discover(prospect.urls, self.discover_options)
+        return prospect._replace(target_business=target), True
+        
+    def _score(self, prospect):
+        """Score a target and decide whether it gets campaigns"""
+        compatibility = self.agent.business.compatibility(self.user_business, prospect.target_business)
+        return prospect._replace(compatibility=compatibility), bool(self.qualify(compatibility))
+        
+    def _create_campaigns(self, prospect):
+        """Generate campaigns for a qualified target"""
+        campaigns = self.agent.campaigns.create(
+            self.user_business,
+            prospect.target_business,
+            self.campaign_types
+        )
+        return prospect._replace(campaigns=campaigns), False
+        
+    def run(self, target_url_batches):
+        """
+        Run every target through the pipeline
+        
+        Targets are read from the input lazily. Results are yielded as soon
+        as each target leaves the pipeline, which is not necessarily in
+        input order. API and validation errors are captured in the result.
+        Any other exception stops the run and is raised. Calls already in
+        flight finish before the generator closes.
+        
+        Args:
+            target_url_batches (iterable): One list of URLs per target business
+            
+        Yields:
+            ProspectResult: One result per target
+        """
+        stages = [
+            ("discover", self._discover, self.discover_concurrency),
+            ("compatibility", self._score, self.compatibility_concurrency),
+            ("campaigns", self._create_campaigns, self.campaign_concurrency)
+        ]
+        run = _PipelineRun(stages, self.queue_size)
+        run.start(target_url_batches)
+        try:
+            while True:
+                item = run.output.get()
+                if item is _STOP:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            run.close()
+
+
+class _PipelineRun:
+    """Threads and queues of a single pipeline run"""
+    
+    def __init__(self, stages, queue_size):
+        self.stages = stages
+        self.inboxes = [
+            queue.Queue(maxsize=queue_size or 2 * workers)
+            for _, _, workers in stages
+        ]
+        self.output = queue.Queue(maxsize=queue_size or 2 * stages[-1][2])
+        self.remaining = [workers for _, _, workers in stages]
+        self.stopped = threading.Event()
+        self.threads = []
+        self._lock = threading.Lock()
+        
+    def start(self, items):
+        """Start the feeder and the stage workers"""
+        self.threads.append(threading.Thread(target=self._feed, args=(items,), daemon=True))
+        for position, (name, _, workers) in enumerate(self.stages):
+            for number in range(workers):
+                self.threads.append(threading.Thread(
+                    target=self._work,
+                    args=(position,),
+                    name=f"b2brilliant-{name}-{number}",
+                    daemon=True
+                ))
+        for thread in self.threads:
+            thread.start()
+            
+    def close(self):
+        """Stop every thread and wait for in-flight calls to finish"""
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+            
+    def _put(self, target, item):
+        """Put an item on a queue, giving up if the run is stopped"""
+        while not self.stopped.is_set():
+            try:
+                target.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+        
+    def _get(self, source):
+        """Take an item from a queue, returning _STOP if the run is stopped"""
+        while not self.stopped.is_set():
+            try:
+                return source.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return _STOP
+        
+    def _feed(self, items):
+        """Read targets from the input into the first stage"""
+        try:
+            for index, urls in enumerate(items):
+                prospect = ProspectResult(index, urls, None, None, None, None, None)
+                if not self._put(self.inboxes[0], prospect):
+                    return
+        except BaseException as e:
+            self._put(self.output, _Failure(e))
+        finally:
+            for _ in range(self.stages[0][2]):
+                self._put(self.inboxes[0], _STOP)
+                
+    def _work(self, position):
+        """Process targets for one stage until its input is exhausted"""
+        name, func, _ = self.stages[position]
+        try:
+            while True:
+                prospect = self._get(self.inboxes[position])
+                if prospect is _STOP:
+                    return
+                    
+                try:
+                    prospect, forward = func(prospect)
+                except (ApiError, ValidationError) as e:
+                    prospect, forward = prospect._replace(error=e, stage=name), False
+                except BaseException as e:
+                    self._put(self.output, _Failure(e))
+                    return
+                    
+                destination = self.inboxes[position + 1] if forward else self.output
+                self._put(destination, prospect)
+        finally:
+            self._finish(position)
+            
+    def _finish(self, position):
+        """Close the next stage once every worker of this stage is done"""
+        with self._lock:
+            self.remaining[position] -= 1
+            last = self.remaining[position] == 0
+            
+        if not last:
+            return
+        if position + 1 < len(self.stages):
+            for _ in range(self.stages[position + 1][2]):
+                self._put(self.inboxes[position + 1], _STOP)
+        else:
+            self._put(self.output, _STOP)
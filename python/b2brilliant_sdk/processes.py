@@ -0,0 +1,84 @@
+"""
+Worker processes for batch runs with CPU-bound work on the results
+"""
+
+import functools
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from .batch import run_batch
+
+# Agent of the current worker process, built by _init_worker
+_worker_agent = None
+
+
+def _init_worker(agent_factory):
+    """Build the worker's own agent from the pickled factory"""
+    global _worker_agent
+    _worker_agent = pickle.loads(agent_factory)()
+
+
+def _call_in_worker(func, item):
+    """Run one item on the worker's agent"""
+    return func(_worker_agent, item)
+
+
+def run_batch_processes(agent_factory, func, items, processes, as_completed=False, mp_context=None):
+    """
+    Call ``func(agent, item)`` for every item in a pool of worker processes
+    
+    Every worker builds its own agent with ``agent_factory``, so the factory
+    and everything it holds must be picklable. Options pickle into the
+    workers as copies, so only state kept outside the process is shared:
+    a RateLimiter created with ``path`` and a ResponseCache backed by
+    SQLiteCache share one budget and one cache across all workers.
+    
+    Args:
+        agent_factory (callable): Picklable callable returning a new agent
+        func (callable): Module-level function called with the worker's
+            agent and one item. Its result is pickled back to the caller.
+        items (iterable): Picklable items to process
+        processes (int): Number of worker processes
+        as_completed (bool, optional): Yield results as they finish instead
+            of in input order
+        mp_context (optional): multiprocessing context used to start the
+            workers. Defaults to ``spawn``, which is safe for callers that
+            run threads, such as a fake server or another batch.
+            
+    Returns:
+        iterator: One BatchResult per input item
+        
+    Raises:
+        ValueError: If ``processes`` is below 1 or the factory cannot be
+            pickled. Raised by this call, before any worker starts.
+    """
+    if processes < 1:
+        raise ValueError("processes must be at least 1")
+    try:
+        # Pickled once up front, so workers never inherit open connections
+        # through fork and unshareable options fail before any work starts
+        payload = pickle.dumps(agent_factory)
+    except (TypeError, AttributeError, pickle.PicklingError) as e:
+        raise ValueError(f"Agent options cannot be shared with worker processes: {e}") from e
+        
+    return _run_in_processes(payload, func, items, processes, as_completed, mp_context)
+
+
+def _run_in_processes(payload, func, items, processes, as_completed, mp_context):
+    """Run the batch on a process pool whose workers build their agent from ``payload``"""
+    executor = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=mp_context or multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(payload,)
+    )
+    try:
+        yield from run_batch(
+            functools.partial(_call_in_worker, func),
+            items,
+            processes,
+            as_completed,
+            executor=executor
+        )
+    finally:
+        executor.shutdown(wait=True)
@@ -0,0 +1,174 @@
+"""
+Immutable business profiles that cache their encoded JSON
+"""
+
+import hashlib
+import json
+from .codec import get_codec
+
+# Profiles are encoded once with the fastest installed library. The bytes are
+# spliced into request bodies as they are, whatever codec the client uses.
+_CODEC = get_codec()
+
+
+class PreEncoded:
+    """Base for immutable values that carry their own encoded JSON in ``json_bytes``"""
+    
+    __slots__ = ()
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable")
+
+
+class FrozenDict(dict):
+    """Read-only dict used for the nested objects of a BusinessProfile"""
+    
+    __slots__ = ()
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def __copy__(self):
+        return self
+        
+    def __deepcopy__(self, memo):
+        return self
+        
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class FrozenList(list):
+    """Read-only list used for the nested arrays of a BusinessProfile"""
+    
+    __slots__ = ()
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+    
+    def __copy__(self):
+        return self
+        
+    def __deepcopy__(self, memo):
+        return self
+        
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+def _freeze(value):
+    """Return a read-only copy of a decoded JSON value"""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Return a mutable deep copy of a frozen value"""
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class BusinessProfile(FrozenDict, PreEncoded):
+    """
+    Immutable business profile returned by the discover and refine methods
+    
+    A profile is a read-only dict, so existing code that reads it keeps
+    working. Its JSON encoding and content hash are computed once and reused.
+    When a profile is sent back to the API, the cached bytes go into the
+    request body without being encoded again.
+    """
+    
+    __slots__ = ("_json_bytes", "_content_hash")
+    
+    def __init__(self, data=(), **kwargs):
+        """
+        Create a profile from business data
+        
+        Args:
+            data (dict): Business data, e.g. a discover response. Nested dicts
+                and lists are copied into read-only equivalents.
+        """
+        super().__init__((key, _freeze(value)) for key, value in dict(data, **kwargs).items())
+        self._json_bytes = None
+        self._content_hash = None
+        
+    @classmethod
+    def of(cls, data):
+        """
+        Wrap business data in a profile unless it already is one
+        
+        Args:
+            data: Business data
+            
+        Returns:
+            BusinessProfile for dicts, anything else unchanged
+        """
+        if isinstance(data, cls) or not isinstance(data, dict):
+            return data
+        return cls(data)
+        
+    @property
+    def json_bytes(self):
+        """bytes: Compact UTF-8 JSON encoding of the profile"""
+        if self._json_bytes is None:
+            self._json_bytes = _CODEC.dumps(self)
+        return self._json_bytes
+        
+    @property
+    def content_hash(self):
+        """str: SHA-256 hex digest of the canonical (key-sorted) JSON encoding"""
+        if self._content_hash is None:
+            canonical = json.dumps(self, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+            self._content_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return self._content_hash
+        
+    def __hash__(self):
+        return hash(self.content_hash)
+        
+    def __repr__(self):
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+        
+    def to_dict(self):
+        """
+        Copy the profile into plain, mutable dicts and lists
+        
+        Returns:
+            dict: Editable business data; wrap it in a new BusinessProfile
+                to send it again
+        """
+        return _thaw(self)
+
+
+def encode_payload(codec, payload):
+    """
+    Encode a request body, splicing in the cached JSON of any profiles
+    
+    Top-level values that are BusinessProfile objects or response models
+    are not encoded again.
+    
+    Args:
+        codec: JSON codec used for everything else
+        payload (dict): Request body
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    spliced = [key for key, value in payload.items() if isinstance(value, PreEncoded)]
+    if not spliced:
+        return codec.dumps(payload)
+        
+    # Encode everything else in one call, then put the cached members in front of it
+    rest = codec.dumps({key: value for key, value in payload.items() if key not in spliced})
+    members = b",".join(codec.dumps(key) + b":" + payload[key].json_bytes for key in spliced)
+    if rest == b"{}":
+        return b"{" + members + b"}"
+    return b"{" + members + b"," + rest.lstrip()[1:]
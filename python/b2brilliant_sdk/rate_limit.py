@@ -0,0 +1,281 @@
+"""
+Client-side rate limiting for API requests
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from .endpoints import USER_ENDPOINTS, BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of polling"""
+    
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        """
+        Create a new token bucket
+        
+        Args:
+            rate (float): Tokens added per second (requests per second)
+            burst (int, optional): Bucket capacity, i.e. how many requests may
+                be sent back to back after an idle period. Defaults to one
+                second's worth of tokens.
+            clock (callable, optional): Monotonic clock returning seconds
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+            
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+            
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+        
+    def reserve(self, tokens=1):
+        """
+        Take tokens from the bucket, going into debt if it is empty
+        
+        Callers that go into debt are queued behind each other, so concurrent
+        callers are spaced exactly ``1 / rate`` apart without retrying.
+        
+        Args:
+            tokens (int, optional): Number of tokens to take
+            
+        Returns:
+            float: Seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            
+    def acquire(self, tokens=1):
+        """
+        Block until tokens are available
+        
+        Args:
+            tokens (int, optional): Number of tokens to take
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+            
+    def __getstate__(self):
+        raise TypeError(
+            "TokenBucket keeps its tokens in memory and cannot be shared between processes; "
+            "use SQLiteTokenBucket"
+        )
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    Token bucket stored in a SQLite database, shared by every process using the file
+    
+    Each reservation updates the bucket in a write transaction, so worker
+    processes on one machine draw from a single budget. Instances can be
+    pickled; each process opens its own connection on first use.
+    """
+    
+    def __init__(self, path, rate, burst=None, name="default", clock=time.time):
+        """
+        Create a new shared token bucket
+        
+        Args:
+            path (str): Database file path. The file and table are created if needed.
+            rate (float): Tokens added per second (requests per second)
+            burst (int, optional): Bucket capacity. Defaults to one second's
+                worth of tokens.
+            name (str, optional): Bucket name, so one file can hold several buckets
+            clock (callable, optional): Clock returning seconds. It must agree
+                across processes, so it defaults to wall-clock time.
+        """
+        super().__init__(rate, burst, clock)
+        self.path = path
+        self.name = name
+        self._conn = None
+        self._pid = None
+        
+    def _connection(self):
+        """Open this process's connection on first use. Call with the lock held."""
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                " name TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+        
+    def reserve(self, tokens=1):
+        """
+        Take tokens from the shared bucket, going into debt if it is empty
+        
+        Args:
+            tokens (int, optional): Number of tokens to take
+            
+        Returns:
+            float: Seconds the caller must wait before sending
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self._clock()
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                if row is None:
+                    available = self.burst
+                else:
+                    available = min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+                available -= tokens
+                conn.execute(
+                    "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (self.name, available, now)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+                
+        return 0.0 if available >= 0 else -available / self.rate
+        
+    def close(self):
+        """Close this process's database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_conn"] = state["_pid"] = None
+        return state
+        
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class RateLimiter:
+    """Per-endpoint rate limiter backed by token buckets"""
+    
+    def __init__(self, limits=None, default=None, path=None):
+        """
+        Create a new rate limiter
+        
+        Args:
+            limits (dict, optional): Mapping of endpoint path to a
+                ``(requests_per_second, burst)`` tuple or a TokenBucket
+            default (tuple, optional): ``(requests_per_second, burst)`` applied to
+                endpoints without their own limit. Each such endpoint gets its
+                own bucket. Endpoints are unlimited when omitted.
+            path (str, optional): SQLite database holding the buckets built
+                from tuples. Every process using the same file shares one
+                budget per endpoint. Buckets are kept in memory when omitted.
+        """
+        self.default = default
+        self.path = path
+        self._buckets = {
+            endpoint: self._make_bucket(endpoint, limit)
+            for endpoint, limit in (limits or {}).items()
+        }
+        self._lock = threading.Lock()
+        
+    @classmethod
+    def per_endpoint(cls, rate, burst=None, path=None):
+        """
+        Create a limiter with the same limit on every known API endpoint
+        
+        Args:
+            rate (float): Requests per second allowed on each endpoint
+            burst (int, optional): Burst size for each endpoint
+            path (str, optional): SQLite database shared between processes
+                (see :class:`RateLimiter`)
+            
+        Returns:
+            RateLimiter: Limiter keyed by the paths in endpoints.py
+        """
+        endpoints = [
+            *USER_ENDPOINTS.values(),
+            *BUSINESS_ENDPOINTS.values(),
+            *CAMPAIGN_ENDPOINTS.values()
+        ]
+        return cls({endpoint: (rate, burst) for endpoint in endpoints}, path=path)
+        
+    def _make_bucket(self, endpoint, limit):
+        """Build a bucket from a ``(rate, burst)`` tuple"""
+        if isinstance(limit, TokenBucket):
+            return limit
+        rate, burst = limit
+        if self.path is not None:
+            return SQLiteTokenBucket(self.path, rate, burst, name=endpoint)
+        return TokenBucket(rate, burst)
+        
+    def bucket(self, endpoint):
+        """
+        Get the bucket that paces an endpoint
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            TokenBucket: Bucket for the endpoint, or None if it is unlimited
+        """
+        bucket = self._buckets.get(endpoint)
+        if bucket is None and self.default is not None:
+            with self._lock:
+                bucket = self._buckets.get(endpoint)
+                if bucket is None:
+                    bucket = self._buckets[endpoint] = self._make_bucket(endpoint, self.default)
+        return bucket
+        
+    def reserve(self, endpoint):
+        """
+        Reserve a request slot on an endpoint
+        
+        Args:
+            endpoint (str): API endpoint
+            
+        Returns:
+            float: Seconds the caller must wait before sending
+        """
+        bucket = self.bucket(endpoint)
+        return bucket.reserve() if bucket is not None else 0.0
+        
+    def acquire(self, endpoint):
+        """
+        Block until a request may be sent to an endpoint
+        
+        Args:
+            endpoint (str): API endpoint
+        """
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            time.sleep(delay)
+            
+    def __getstate__(self):
+        if self.default is not None and self.path is None:
+            raise TypeError(
+                "RateLimiter keeps default buckets in memory and cannot be shared between "
+                "processes; create it with path"
+            )
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+        
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,133 @@
+"""
+Retry policy for transient API failures
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from .endpoints import DEFAULT_RETRY_STATUSES, ENDPOINT_NO_NETWORK_RETRY, ENDPOINT_RETRY_STATUSES
+
+
+class RetryPolicy:
+    """Decides whether a failed request is retried and how long to wait first"""
+    
+    def __init__(self, max_attempts=3, backoff_factor=0.5, max_backoff=30.0, jitter=True,
+                 retry_statuses=None, status_max_attempts=None, endpoint_statuses=None,
+                 retry_network_errors=True, endpoint_network_errors=None, respect_retry_after=True,
+                 max_retry_after=120.0):
+        """
+        Create a new retry policy
+        
+        Args:
+            max_attempts (int, optional): Total attempts per request, including
+                the first one
+            backoff_factor (float, optional): Base delay in seconds. The backoff
+                before retry ``n`` is ``backoff_factor * 2 ** (n - 1)``
+            max_backoff (float, optional): Upper bound for the computed backoff
+            jitter (bool, optional): Pick a random delay between zero and the
+                computed backoff ("full jitter") so parallel workers don't retry
+                in lockstep
+            retry_statuses (iterable, optional): HTTP statuses retried on endpoints
+                without a specific rule. Defaults to DEFAULT_RETRY_STATUSES.
+            status_max_attempts (dict, optional): Per-status override of
+                max_attempts, e.g. ``{429: 6}``
+            endpoint_statuses (dict, optional): Per-endpoint retryable statuses,
+                merged over ENDPOINT_RETRY_STATUSES
+            retry_network_errors (bool, optional): Retry requests that failed
+                without a response (status 0) on endpoints without a specific rule
+            endpoint_network_errors (dict, optional): Per-endpoint override of
+                retry_network_errors. Endpoints in ENDPOINT_NO_NETWORK_RETRY
+                are not retried unless set to True here.
+            respect_retry_after (bool, optional): Wait for the server's
+                Retry-After header when it is present
+            max_retry_after (float, optional): Cap on honoured Retry-After values
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+            
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(
+            DEFAULT_RETRY_STATUSES if retry_statuses is None else retry_statuses
+        )
+        self.status_max_attempts = dict(status_max_attempts or {})
+        self.endpoint_statuses = {
+            endpoint: frozenset(statuses)
+            for endpoint, statuses in {**ENDPOINT_RETRY_STATUSES, **(endpoint_statuses or {})}.items()
+        }
+        self.retry_network_errors = retry_network_errors
+        self.endpoint_network_errors = {
+            **{endpoint: False for endpoint in ENDPOINT_NO_NETWORK_RETRY},
+            **(endpoint_network_errors or {})
+        }
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        
+    def should_retry(self, endpoint, status, attempt):
+        """
+        Check whether a failed attempt should be retried
+        
+        Args:
+            endpoint (str): API endpoint that was called
+            status (int): HTTP status of the failure, or 0 for network errors
+            attempt (int): Number of the attempt that just failed, starting at 1
+            
+        Returns:
+            bool: Whether to retry
+        """
+        if status == 0:
+            retryable = self.endpoint_network_errors.get(endpoint, self.retry_network_errors)
+        else:
+            retryable = status in self.endpoint_statuses.get(endpoint, self.retry_statuses)
+            
+        return retryable and attempt < self.status_max_attempts.get(status, self.max_attempts)
+        
+    def get_delay(self, attempt, retry_after=None):
+        """
+        Compute how long to wait before the next attempt
+        
+        Args:
+            attempt (int): Number of the attempt that just failed, starting at 1
+            retry_after (str, optional): Raw Retry-After header from the response
+            
+        Returns:
+            float: Delay in seconds
+        """
+        if self.respect_retry_after:
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                return min(server_delay, self.max_retry_after)
+                
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header
+    
+    Args:
+        value (str): Header value, either delay-seconds or an HTTP date
+        
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+        
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+        
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+        
+    if retry_at is None:
+        return None
+        
+    return max(0.0, retry_at.timestamp() - time.time())
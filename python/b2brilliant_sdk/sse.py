@@ -0,0 +1,113 @@
+"""
+Server-sent events decoding for streamed responses
+"""
+
+from collections import namedtuple
+
+EVENT_STREAM = "text/event-stream"
+
+ServerSentEvent = namedtuple("ServerSentEvent", ["event", "data", "id"])
+
+
+class SSEDecoder:
+    """Incremental decoder that turns response bytes into server-sent events"""
+    
+    def __init__(self):
+        """Create a new decoder"""
+        self._buffer = b""
+        self._skip_lf = False
+        self._event = None
+        self._data = []
+        self._last_id = None
+        
+    def feed(self, chunk):
+        """
+        Decode a chunk of the response body
+        
+        Lines may be split across chunks; incomplete lines are kept until the
+        rest arrives.
+        
+        Args:
+            chunk (bytes): Bytes read from the response
+            
+        Returns:
+            list: ServerSentEvent objects completed by this chunk
+        """
+        if not chunk:
+            return []
+            
+        # A chunk ending in CR may be followed by the LF of the same CRLF
+        if self._skip_lf and chunk.startswith(b"\n"):
+            chunk = chunk[1:]
+            
+        lines = (self._buffer + chunk).splitlines(keepends=True)
+        if lines and not lines[-1].endswith((b"\n", b"\r")):
+            self._buffer = lines.pop()
+        else:
+            self._buffer = b""
+        self._skip_lf = bool(lines) and lines[-1].endswith(b"\r")
+        
+        events = []
+        for line in lines:
+            event = self._process_line(line.rstrip(b"\r\n").decode("utf-8"))
+            if event is not None:
+                events.append(event)
+        return events
+        
+    def _process_line(self, line):
+        """Apply one line to the pending event, returning it when a blank line ends it"""
+        if not line:
+            if not self._data:
+                self._event = None
+                return None
+                
+            event = ServerSentEvent(self._event or "message", "\n".join(self._data), self._last_id)
+            self._event = None
+            self._data = []
+            return event
+            
+        if line.startswith(":"):
+            return None
+            
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+            
+        if field == "event":
+            self._event = value
+        elif field == "data":
+            self._data.append(value)
+        elif field == "id":
+            self._last_id = value
+        return None
+
+
+def iter_sse(chunks):
+    """
+    Decode server-sent events from an iterable of byte chunks
+    
+    Args:
+        chunks (iterable): Response body chunks
+        
+    Yields:
+        ServerSentEvent: Events in the order they were sent
+    """
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+
+
+async def aiter_sse(chunks):
+    """
+    Decode server-sent events from an async iterable of byte chunks
+    
+    Args:
+        chunks (async iterable): Response body chunks
+        
+    Yields:
+        ServerSentEvent: Events in the order they were sent
+    """
+    decoder = SSEDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
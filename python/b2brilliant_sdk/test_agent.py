@@ -186,4 +186,33 @@ class TestB2BrilliantAgent:
         assert campaigns == mock_campaigns
         
         # Verify API calls were made
-        assert agent.api_client.post.call_count == 4 
\ No newline at end of file
+        assert agent.api_client.post.call_count == 4
+    
+    @patch('b2brilliant_sdk.agent.ApiClient')
+    def test_client_options_forwarded(self, mock_api_client):
+        """Test that extra options are forwarded to the ApiClient"""
+        B2BrilliantAgent(api_key="test-key", pool_maxsize=50, keep_alive=False)
+        
+        mock_api_client.assert_called_once_with(
+            api_key="test-key",
+            base_url="https://api.b2brilliant.app",
+            pool_maxsize=50,
+            keep_alive=False
+        )
+    
+    def test_close_closes_api_client(self):
+        """Test that closing the agent closes the API client"""
+        agent = B2BrilliantAgent(api_key="test-key")
+        agent.api_client.close = Mock()
+        
+        agent.close()
+        
+        agent.api_client.close.assert_called_once()
+    
+    def test_context_manager(self):
+        """Test that the agent closes its client when used as a context manager"""
+        with B2BrilliantAgent(api_key="test-key") as agent:
+            agent.api_client.close = Mock()
+            assert isinstance(agent, B2BrilliantAgent)
+        
+        agent.api_client.close.assert_called_once()
@@ -4,6 +4,7 @@ Tests for ApiClient in the B2B Campaign Agent SDK
 
 import pytest
 import requests
+from unittest.mock import Mock
 from .api_client import ApiClient
 from .exceptions import ApiError
 
@@ -45,7 +46,7 @@ class TestApiClient:
         
         # Check headers
         assert request.headers["x-api-key"] == "test-api-key"
-        assert request.headers["Accept-Encoding"] == "deflate"
+        assert "gzip" in request.headers["Accept-Encoding"].split(", ")
         assert request.headers["Content-Type"] == "application/json"
         
         # Check response
@@ -174,7 +175,8 @@ class TestApiClient:
         headers = request.headers
         
         assert headers["x-api-key"] == "test-api-key"
-        assert headers["Accept-Encoding"] == "deflate"
+        assert headers["Accept-Encoding"] == self.api_client.accept_encoding
+        assert "deflate" in headers["Accept-Encoding"].split(", ")
         assert headers["Content-Type"] == "application/json"
     
     def test_json_decode_error_on_success(self, requests_mock):
@@ -225,4 +227,64 @@ class TestApiClient:
         error = exc_info.value
         assert error.message == "HTTP error 400"
         assert error.status == 400
-        assert error.data == error_data 
\ No newline at end of file
+        assert error.data == error_data
+    
+    def test_session_is_reused_across_requests(self, requests_mock):
+        """Test that every request goes through the client's pooled session"""
+        requests_mock.post("https://api.test.com/test", json={})
+        
+        session = self.api_client.session
+        self.api_client.post("/test")
+        self.api_client.post("/test")
+        
+        assert self.api_client.session is session
+        assert requests_mock.call_count == 2
+    
+    def test_pool_size_configuration(self):
+        """Test that pool settings are applied to the mounted adapters"""
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            pool_connections=4,
+            pool_maxsize=32,
+            pool_block=True
+        )
+        
+        adapter = client.session.get_adapter("https://api.test.com")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+    
+    def test_keep_alive_disabled(self, requests_mock):
+        """Test that disabling keep-alive asks the server to close the connection"""
+        requests_mock.post("https://api.test.com/test", json={})
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            keep_alive=False
+        )
+        
+        client.post("/test")
+        
+        assert requests_mock.request_history[0].headers["Connection"] == "close"
+    
+    def test_close_and_context_manager(self):
+        """Test that the owned session is closed on exit"""
+        with ApiClient(api_key="test-api-key", base_url="https://api.test.com") as client:
+            client.session.close = Mock()
+        
+        client.session.close.assert_called_once()
+    
+    def test_external_session_not_closed(self):
+        """Test that a caller-provided session is left open"""
+        session = Mock(spec=requests.Session)
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            session=session
+        )
+        
+        client.close()
+        
+        assert client.session is session
+        session.close.assert_not_called()
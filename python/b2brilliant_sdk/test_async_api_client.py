@@ -0,0 +1,214 @@
+"""
+Tests for AsyncApiClient and the asynchronous services in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import json
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from .agent import AsyncB2BrilliantAgent
+from .async_api_client import AsyncApiClient
+from .exceptions import ApiError, ValidationError
+
+
+def make_client(handler, **options):
+    """Build an AsyncApiClient backed by an in-process mock transport"""
+    return AsyncApiClient(
+        api_key="test-api-key",
+        base_url="https://api.test.com",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **options
+    )
+
+
+class TestAsyncApiClient:
+    """Test cases for AsyncApiClient class"""
+    
+    def test_successful_post_request(self):
+        """Test successful POST request"""
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={"success": True})
+            
+        result = asyncio.run(make_client(handler).post("/test-endpoint", {"test": "data"}))
+        
+        request = requests_seen[0]
+        assert request.method == "POST"
+        assert str(request.url) == "https://api.test.com/test-endpoint"
+        assert json.loads(request.content) == {"test": "data"}
+        assert request.headers["x-api-key"] == "test-api-key"
+        assert request.headers["Content-Type"] == "application/json"
+        assert result == {"success": True}
+        
+    def test_post_request_with_none_data(self):
+        """Test POST request with None data sends an empty object"""
+        bodies = []
+        
+        def handler(request):
+            bodies.append(json.loads(request.content))
+            return httpx.Response(200, json={})
+            
+        asyncio.run(make_client(handler).post("/test-endpoint"))
+        
+        assert bodies == [{}]
+        
+    def test_api_error_with_json_response(self):
+        """Test handling API error with JSON response"""
+        error_data = {"message": "Bad Request", "code": "INVALID_INPUT"}
+        client = make_client(lambda request: httpx.Response(400, json=error_data))
+        
+        with pytest.raises(ApiError) as exc_info:
+            asyncio.run(client.post("/test-endpoint"))
+            
+        assert exc_info.value.message == "Bad Request"
+        assert exc_info.value.status == 400
+        assert exc_info.value.data == error_data
+        
+    def test_api_error_without_json_response(self):
+        """Test handling API error without JSON response"""
+        client = make_client(lambda request: httpx.Response(500, text="Internal Server Error"))
+        
+        with pytest.raises(ApiError) as exc_info:
+            asyncio.run(client.post("/test-endpoint"))
+            
+        assert exc_info.value.message == "HTTP error 500"
+        assert exc_info.value.status == 500
+        assert exc_info.value.data == {}
+        
+    def test_network_error(self):
+        """Test handling network errors"""
+        def handler(request):
+            raise httpx.ConnectError("Network error")
+            
+        with pytest.raises(ApiError) as exc_info:
+            asyncio.run(make_client(handler).post("/test-endpoint"))
+            
+        assert "Network error" in exc_info.value.message
+        assert exc_info.value.status == 0
+        assert "original_error" in exc_info.value.data
+        
+    def test_json_decode_error_on_success(self):
+        """Test handling JSON decode error on successful response"""
+        client = make_client(lambda request: httpx.Response(200, text="invalid json"))
+        
+        with pytest.raises(ApiError) as exc_info:
+            asyncio.run(client.post("/test-endpoint"))
+            
+        assert exc_info.value.status == 0
+        assert "original_error" in exc_info.value.data
+        
+    def test_stdlib_codec(self):
+        """Test that the configured codec encodes requests and decodes responses"""
+        bodies = []
+        
+        def handler(request):
+            bodies.append(request.content)
+            return httpx.Response(200, json={"name": "Café"})
+            
+        client = make_client(handler, codec="json")
+        result = asyncio.run(client.post("/test-endpoint", {"name": "Café"}))
+        
+        assert result == {"name": "Café"}
+        assert bodies == ['{"name":"Café"}'.encode("utf-8")]
+        
+    def test_max_concurrency_bounds_in_flight_requests(self):
+        """Test that the semaphore caps the number of concurrent requests"""
+        state = {"in_flight": 0, "peak": 0}
+        
+        async def handler(request):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return httpx.Response(200, json={})
+            
+        async def run():
+            client = make_client(handler, max_concurrency=3)
+            await asyncio.gather(*(client.post("/test") for _ in range(20)))
+            
+        asyncio.run(run())
+        
+        assert state["peak"] == 3
+        
+    def test_external_client_not_closed(self):
+        """Test that a caller-provided httpx client is left open"""
+        client = make_client(lambda request: httpx.Response(200, json={}))
+        
+        asyncio.run(client.aclose())
+        
+        assert not client.client.is_closed
+
+
+class TestAsyncB2BrilliantAgent:
+    """Test cases for AsyncB2BrilliantAgent and the async services"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.requests_seen = []
+        
+        def handler(request):
+            self.requests_seen.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(200, json={"ok": True})
+            
+        self.agent = AsyncB2BrilliantAgent(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        
+    def test_default_base_url(self):
+        """Test that the async agent shares the sync agent's default base URL"""
+        agent = AsyncB2BrilliantAgent(api_key="test-api-key")
+        
+        assert agent.api_client.base_url == "https://api.b2brilliant.app"
+        asyncio.run(agent.aclose())
+        
+    def test_payloads_match_sync_services(self):
+        """Test that async services send the same payload shapes"""
+        user = {"name": "User Co"}
+        target = {"name": "Target Co"}
+        
+        async def run():
+            async with self.agent as agent:
+                await agent.user.discover(["https://example.com"], {"find_competitors": True})
+                await agent.user.refine(user, "More info")
+                await agent.business.discover(["https://target.com"], {"deep_search": True})
+                await agent.business.refine(target, "More info")
+                await agent.business.compatibility(user, target)
+                await agent.campaigns.create(user, target, "email")
+                await agent.campaigns.refine(user, target, {"campaigns": []}, "Shorter")
+                
+        asyncio.run(run())
+        
+        assert self.requests_seen == [
+            ("/api/v1/user/discover", {"urls": ["https://example.com"], "findCompetitors": True}),
+            ("/api/v1/user/refine", {"businessData": user, "additionalInfo": "More info"}),
+            ("/api/v1/business/discover", {"urls": ["https://target.com"], "deepSearch": True}),
+            ("/api/v1/business/refine", {"businessData": target, "additionalInfo": "More info"}),
+            ("/api/v1/business/compatibility", {"userBusiness": user, "targetBusiness": target}),
+            ("/api/v1/campaigns/create", {
+                "userBusiness": user,
+                "targetBusiness": target,
+                "campaignTypes": ["email"]
+            }),
+            ("/api/v1/campaigns/refine", {
+                "userBusiness": user,
+                "targetBusiness": target,
+                "campaign": {"campaigns": []},
+                "feedback": "Shorter"
+            }),
+        ]
+        
+    def test_validation_matches_sync_services(self):
+        """Test that async services reject invalid input before any request"""
+        with pytest.raises(ValidationError):
+            asyncio.run(self.agent.user.discover("https://example.com"))
+            
+        with pytest.raises(ValidationError):
+            asyncio.run(self.agent.campaigns.create({"name": "User"}, {"name": "Target"}, "fax"))
+            
+        assert self.requests_seen == []
@@ -0,0 +1,283 @@
+"""
+Tests for batch helpers and discover_many in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from .batch import BatchResult, TopResults, run_batch, run_batch_async, select_top
+from .business import BusinessService, AsyncBusinessService
+from .user import UserService
+from .exceptions import ApiError, ValidationError
+
+
+class TestRunBatch:
+    """Test cases for run_batch"""
+    
+    def test_preserves_input_order(self):
+        """Test that results come back in input order by default"""
+        def slow_for_small(n):
+            time.sleep(0.02 if n < 3 else 0)
+            return n * 10
+        
+        results = list(run_batch(slow_for_small, range(8), max_concurrency=4))
+        
+        assert [r.index for r in results] == list(range(8))
+        assert [r.result for r in results] == [n * 10 for n in range(8)]
+        assert all(r.ok for r in results)
+    
+    def test_as_completed_yields_fast_items_first(self):
+        """Test that as_completed yields results as they finish"""
+        def slow_first(n):
+            time.sleep(0.1 if n == 0 else 0)
+            return n
+        
+        results = list(run_batch(slow_first, range(4), max_concurrency=4, as_completed=True))
+        
+        assert results[-1].index == 0
+        assert sorted(r.index for r in results) == [0, 1, 2, 3]
+    
+    def test_errors_are_collected_per_item(self):
+        """Test that API and validation errors don't abort the batch"""
+        def flaky(n):
+            if n == 1:
+                raise ApiError("Too many requests", 429)
+            if n == 2:
+                raise ValidationError("Bad input")
+            return n
+        
+        results = list(run_batch(flaky, range(4), max_concurrency=2))
+        
+        assert [r.ok for r in results] == [True, False, False, True]
+        assert results[1].error.status == 429
+        assert isinstance(results[2].error, ValidationError)
+        assert results[1].result is None
+        assert results[3].input == 3
+    
+    def test_unexpected_errors_propagate(self):
+        """Test that non-SDK exceptions are not swallowed"""
+        def broken(n):
+            raise RuntimeError("bug")
+        
+        with pytest.raises(RuntimeError):
+            list(run_batch(broken, range(3)))
+    
+    def test_max_concurrency_is_respected(self):
+        """Test that no more than max_concurrency calls run at once"""
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+        
+        def tracked(n):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.01)
+            with lock:
+                state["in_flight"] -= 1
+            return n
+        
+        results = list(run_batch(tracked, range(30), max_concurrency=3))
+        
+        assert len(results) == 30
+        assert state["peak"] <= 3
+    
+    def test_invalid_max_concurrency(self):
+        """Test that max_concurrency must be positive"""
+        with pytest.raises(ValueError):
+            list(run_batch(lambda n: n, range(3), max_concurrency=0))
+    
+    def test_async_preserves_order_and_collects_errors(self):
+        """Test the asynchronous batch runner"""
+        async def call(n):
+            await asyncio.sleep(0.01 * (5 - n))
+            if n == 2:
+                raise ApiError("Bad gateway", 502)
+            return n
+        
+        async def run():
+            return [r async for r in run_batch_async(call, range(5), max_concurrency=5)]
+        
+        results = asyncio.run(run())
+        
+        assert [r.index for r in results] == [0, 1, 2, 3, 4]
+        assert results[2].error.status == 502
+        assert results[4] == BatchResult(4, 4, 4, None)
+
+
+class TestDiscoverMany:
+    """Test cases for discover_many on the discover services"""
+    
+    def test_business_discover_many(self):
+        """Test that each URL list is discovered with the shared options"""
+        api_client = Mock()
+        api_client.post.side_effect = lambda endpoint, payload: {"urls": payload["urls"]}
+        service = BusinessService(api_client)
+        
+        results = list(service.discover_many(
+            [["https://a.com"], ["https://b.com"]],
+            {"deep_search": True},
+            max_concurrency=2
+        ))
+        
+        assert [r.result for r in results] == [{"urls": ["https://a.com"]}, {"urls": ["https://b.com"]}]
+        api_client.post.assert_any_call(
+            "/api/v1/business/discover",
+            {"urls": ["https://a.com"], "deepSearch": True}
+        )
+    
+    def test_user_discover_many_captures_validation_errors(self):
+        """Test that an invalid item is reported without stopping the batch"""
+        api_client = Mock()
+        api_client.post.return_value = {"ok": True}
+        service = UserService(api_client)
+        
+        results = list(service.discover_many([["https://a.com"], "https://b.com"]))
+        
+        assert results[0].ok
+        assert isinstance(results[1].error, ValidationError)
+        assert api_client.post.call_count == 1
+    
+    def test_async_business_discover_many(self):
+        """Test discover_many on the async business service"""
+        async def post(endpoint, payload):
+            return {"urls": payload["urls"]}
+        
+        api_client = Mock()
+        api_client.post.side_effect = post
+        service = AsyncBusinessService(api_client)
+        
+        async def run():
+            return [r async for r in service.discover_many([["https://a.com"], ["https://b.com"]])]
+        
+        results = asyncio.run(run())
+        
+        assert [r.result["urls"] for r in results] == [["https://a.com"], ["https://b.com"]]
+
+
+class TestSelectTop:
+    """Test cases for select_top"""
+    
+    def results(self, scores):
+        return [BatchResult(i, f"t{i}", {"score": score}, None) for i, score in enumerate(scores)]
+    
+    def test_keeps_best_k(self):
+        """Test that only the k best results are kept, best first"""
+        top = select_top(self.results([3, 9, 5, 9, 1, 7]), top_k=3)
+        
+        assert [(r.index, r.result["score"]) for r in top.top] == [(1, 9), (3, 9), (5, 7)]
+        assert top.completed == 6
+    
+    def test_min_score_and_failures(self):
+        """Test that low scores are dropped and failures reported"""
+        error = BatchResult(3, "t3", None, ApiError("Bad gateway", 502))
+        results = self.results([8, 2, None]) + [error]
+        
+        top = select_top(results, min_score=5)
+        
+        assert top == TopResults([results[0]], [error], 4, 1)
+    
+    def test_stop_after_closes_stream(self):
+        """Test early stop once enough results clear the threshold"""
+        consumed = []
+        
+        def stream():
+            for result in self.results([9, 1, 8, 7, 10]):
+                consumed.append(result.index)
+                yield result
+        
+        top = select_top(stream(), min_score=5, stop_after=2)
+        
+        assert [r.index for r in top.top] == [0, 2]
+        assert consumed == [0, 1, 2]
+    
+    def test_failures_are_capped(self):
+        """Test that only max_failed failures are kept and the rest are counted"""
+        errors = [BatchResult(i, f"t{i}", None, ApiError("Unavailable", 503)) for i in range(5)]
+        
+        top = select_top(self.results([8]) + errors, max_failed=2)
+        
+        assert top.failed == errors[:2]
+        assert top.failed_count == 5
+        assert top.completed == 6
+        
+    def test_invalid_top_k(self):
+        """Test argument validation"""
+        with pytest.raises(ValueError):
+            select_top([], top_k=0)
+        with pytest.raises(ValueError):
+            select_top([], max_failed=-1)
+
+
+class TestCompatibilityMany:
+    """Test cases for compatibility_many on the business services"""
+    
+    def make_service(self, scores, delay=0):
+        calls = []
+        lock = threading.Lock()
+        
+        def post(endpoint, payload):
+            name = payload["targetBusiness"]["name"]
+            with lock:
+                calls.append(name)
+            time.sleep(delay)
+            if scores[name] is None:
+                raise ApiError("Too many requests", 429)
+            return {"score": scores[name]}
+        
+        api_client = Mock()
+        api_client.post.side_effect = post
+        return BusinessService(api_client), calls
+    
+    def test_top_k(self):
+        """Test that targets are scored concurrently and ranked"""
+        scores = {f"t{i}": i % 10 for i in range(50)}
+        scores["t3"] = None
+        service, calls = self.make_service(scores)
+        user = {"name": "User Co"}
+        
+        top = service.compatibility_many(
+            user,
+            ({"name": name} for name in scores),
+            top_k=3,
+            min_score=8,
+            max_concurrency=8
+        )
+        
+        assert [r.input["name"] for r in top.top] == ["t9", "t19", "t29"]
+        assert [r.result["score"] for r in top.top] == [9, 9, 9]
+        assert [r.input["name"] for r in top.failed] == ["t3"]
+        assert top.completed == 50
+        assert len(calls) == 50
+    
+    def test_stop_after(self):
+        """Test that scoring stops once enough targets qualify"""
+        scores = {f"t{i}": 9 for i in range(200)}
+        service, calls = self.make_service(scores, delay=0.005)
+        
+        top = service.compatibility_many(
+            {"name": "User Co"},
+            [{"name": name} for name in scores],
+            min_score=7,
+            stop_after=5,
+            max_concurrency=4
+        )
+        
+        assert len(top.top) >= 5
+        assert len(calls) < 50
+    
+    def test_async_compatibility_many(self):
+        """Test compatibility_many on the async business service"""
+        async def post(endpoint, payload):
+            return {"score": payload["targetBusiness"]["score"]}
+        
+        api_client = Mock()
+        api_client.post.side_effect = post
+        service = AsyncBusinessService(api_client)
+        targets = [{"score": score} for score in (4, 8, 6)]
+        
+        top = asyncio.run(service.compatibility_many({"name": "User Co"}, targets, top_k=2))
+        
+        assert [r.result["score"] for r in top.top] == [8, 6]
+        assert top.failed == []
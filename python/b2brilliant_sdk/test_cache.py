@@ -0,0 +1,274 @@
+"""
+Tests for response caching in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import threading
+import pytest
+from .api_client import ApiClient
+from .codec import JsonCodec
+from .cache import MemoryCache, SQLiteCache, ResponseCache
+from .exceptions import ApiError
+
+
+class RecordingCodec(JsonCodec):
+    """Codec that records its calls"""
+    
+    def __init__(self):
+        self.calls = []
+        
+    def dumps(self, obj):
+        self.calls.append("dumps")
+        return super().dumps(obj)
+        
+    def loads(self, data):
+        self.calls.append("loads")
+        return super().loads(data)
+
+
+class ThreadRecordingCache(SQLiteCache):
+    """SQLiteCache that records the thread of each call"""
+    
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+        
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+        
+    def set(self, key, value, ttl=None):
+        self.threads.append(threading.get_ident())
+        super().set(key, value, ttl)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend_factory(request, tmp_path):
+    """Build either cache backend with the same arguments"""
+    def factory(**kwargs):
+        if request.param == "memory":
+            return MemoryCache(**kwargs)
+        return SQLiteCache(str(tmp_path / "cache.db"), **kwargs)
+    return factory
+
+
+class TestCacheBackends:
+    """Test cases shared by MemoryCache and SQLiteCache"""
+    
+    def test_get_and_set(self, backend_factory):
+        """Test storing and reading a value"""
+        cache = backend_factory()
+        
+        assert cache.get("key") is None
+        cache.set("key", "value")
+        
+        assert cache.get("key") == "value"
+        assert len(cache) == 1
+    
+    def test_ttl_expiry(self, backend_factory, clock):
+        """Test that entries expire after their TTL"""
+        cache = backend_factory(ttl=60, clock=clock)
+        cache.set("default", "a")
+        cache.set("short", "b", ttl=5)
+        
+        clock.now += 10
+        assert cache.get("short") is None
+        assert cache.get("default") == "a"
+        
+        clock.now += 60
+        assert cache.get("default") is None
+    
+    def test_lru_eviction(self, backend_factory, clock):
+        """Test that the least recently used entry is evicted first"""
+        cache = backend_factory(maxsize=2, clock=clock)
+        cache.set("a", "1")
+        clock.now += 1
+        cache.set("b", "2")
+        clock.now += 1
+        cache.get("a")
+        clock.now += 1
+        cache.set("c", "3")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+    
+    def test_delete_and_clear(self, backend_factory):
+        """Test removing entries"""
+        cache = backend_factory()
+        cache.set("a", "1")
+        cache.set("b", "2")
+        
+        cache.delete("a")
+        assert cache.get("a") is None
+        
+        cache.clear()
+        assert len(cache) == 0
+    
+    def test_sqlite_survives_restart(self, tmp_path):
+        """Test that the SQLite backend persists across instances"""
+        path = str(tmp_path / "cache.db")
+        first = SQLiteCache(path)
+        first.set("key", "value")
+        first.close()
+        
+        assert SQLiteCache(path).get("key") == "value"
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache class"""
+    
+    def test_key_normalizes_urls(self):
+        """Test that URL spelling and order don't change the key"""
+        cache = ResponseCache()
+        endpoint = "/api/v1/business/discover"
+        
+        key = cache.key(endpoint, {"urls": ["https://Example.com/", "https://b.com"]})
+        
+        assert key == cache.key(endpoint, {"urls": ["https://b.com", "HTTPS://example.com#top"]})
+    
+    def test_key_includes_options_and_endpoint(self):
+        """Test that options and endpoint are part of the key"""
+        cache = ResponseCache()
+        payload = {"urls": ["https://a.com"]}
+        
+        base = cache.key("/api/v1/business/discover", payload)
+        
+        assert base != cache.key("/api/v1/business/discover", {**payload, "deepSearch": True})
+        assert base != cache.key("/api/v1/user/discover", payload)
+    
+    def test_hits_return_independent_copies(self):
+        """Test that callers cannot mutate cached data"""
+        cache = ResponseCache()
+        payload = {"urls": ["https://a.com"]}
+        cache.set("/api/v1/business/discover", payload, {"profile": {"name": "A"}})
+        
+        first = cache.get("/api/v1/business/discover", payload)
+        first["profile"]["name"] = "changed"
+        
+        assert cache.get("/api/v1/business/discover", payload) == {"profile": {"name": "A"}}
+    
+    def test_stats(self):
+        """Test hit/miss statistics"""
+        cache = ResponseCache()
+        payload = {"urls": ["https://a.com"]}
+        
+        cache.get("/api/v1/business/discover", payload)
+        cache.set("/api/v1/business/discover", payload, {"ok": True})
+        cache.get("/api/v1/business/discover", payload)
+        cache.get("/api/v1/business/discover", payload)
+        
+        assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 1}
+    
+    def test_entries_go_through_the_codec(self):
+        """Test that responses are stored and read with the codec passed in"""
+        codec = RecordingCodec()
+        cache = ResponseCache()
+        payload = {"urls": ["https://a.com"]}
+        
+        cache.set("/api/v1/business/discover", payload, {"name": "A"}, codec)
+        
+        assert cache.get("/api/v1/business/discover", payload, codec) == {"name": "A"}
+        assert codec.calls == ["dumps", "loads"]
+        
+    def test_text_entries_are_still_read(self, tmp_path):
+        """Test that entries stored as text by earlier versions decode"""
+        cache = ResponseCache(SQLiteCache(str(tmp_path / "cache.db")))
+        payload = {"urls": ["https://a.com"]}
+        cache.backend.set(cache.key("/api/v1/business/discover", payload), '{"name": "A"}')
+        
+        assert cache.get("/api/v1/business/discover", payload) == {"name": "A"}
+        
+    def test_only_discover_endpoints_are_cacheable(self):
+        """Test the default cacheable endpoints"""
+        cache = ResponseCache()
+        
+        assert cache.cacheable("/api/v1/user/discover")
+        assert cache.cacheable("/api/v1/business/discover")
+        assert not cache.cacheable("/api/v1/business/compatibility")
+        assert not cache.cacheable("/api/v1/campaigns/create")
+
+
+class TestApiClientCaching:
+    """Test cases for caching in ApiClient"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cache = ResponseCache()
+        self.api_client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            cache=self.cache
+        )
+    
+    def test_repeated_discover_is_served_from_cache(self, requests_mock):
+        """Test that the second identical discover call skips the API"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", json={"profile": {"name": "A"}})
+        
+        first = self.api_client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+        second = self.api_client.post("/api/v1/business/discover", {"urls": ["https://a.com/"]})
+        
+        assert first == second == {"profile": {"name": "A"}}
+        assert requests_mock.call_count == 1
+        assert self.cache.stats()["hits"] == 1
+    
+    def test_errors_are_not_cached(self, requests_mock):
+        """Test that failed calls are retried against the API"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", [
+            {"status_code": 500, "json": {}},
+            {"status_code": 200, "json": {"ok": True}},
+        ])
+        
+        with pytest.raises(ApiError):
+            self.api_client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+        
+        assert self.api_client.post("/api/v1/business/discover", {"urls": ["https://a.com"]}) == {"ok": True}
+    
+    def test_other_endpoints_bypass_cache(self, requests_mock):
+        """Test that non-discover calls always hit the API"""
+        requests_mock.post("https://api.test.com/api/v1/business/compatibility", json={"score": 8})
+        payload = {"userBusiness": {"a": 1}, "targetBusiness": {"b": 2}}
+        
+        self.api_client.post("/api/v1/business/compatibility", payload)
+        self.api_client.post("/api/v1/business/compatibility", payload)
+        
+        assert requests_mock.call_count == 2
+        assert self.cache.stats()["misses"] == 0
+
+
+class TestAsyncApiClientCaching:
+    """Test cases for caching in AsyncApiClient"""
+    
+    def test_sqlite_cache_runs_off_the_event_loop(self, tmp_path):
+        """Test that SQLite lookups and writes run on an executor thread"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        backend = ThreadRecordingCache(str(tmp_path / "cache.db"))
+        codec = RecordingCodec()
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            cache=ResponseCache(backend),
+            codec=codec,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json={"ok": True})
+            ))
+        )
+        
+        async def run():
+            first = await client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+            second = await client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+            return first, second, threading.get_ident()
+            
+        first, second, loop_thread = asyncio.run(run())
+        
+        assert first == second == {"ok": True}
+        assert len(backend.threads) == 3
+        assert loop_thread not in backend.threads
+        assert "dumps" in codec.calls and "loads" in codec.calls
+        
+    def test_memory_cache_stays_on_the_event_loop(self):
+        """Test that in-memory lookups are not sent to an executor"""
+        assert ResponseCache().blocking is False
+        assert ResponseCache(SQLiteCache(":memory:")).blocking is True
@@ -0,0 +1,213 @@
+"""
+Tests for circuit breakers in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import pytest
+import requests
+from .api_client import ApiClient
+from .circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from .endpoints import BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS
+from .exceptions import ApiError, CircuitOpenError
+from .hooks import RequestHooks
+from .retry import RetryPolicy
+
+CREATE = CAMPAIGN_ENDPOINTS["CREATE"]
+DISCOVER = BUSINESS_ENDPOINTS["DISCOVER"]
+
+
+def call(breaker, endpoint, status, latency=1.0):
+    """Let a call through the breaker and record its outcome"""
+    probe = breaker.check(endpoint)
+    breaker.record(endpoint, latency, status, probe)
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker"""
+    
+    def test_opens_on_error_rate(self, clock):
+        """Test that the circuit opens once enough calls in the window fail"""
+        breaker = CircuitBreaker(error_rate=0.5, window=10, min_calls=4, open_duration=30, clock=clock)
+        for status in (200, 503, 200):
+            call(breaker, CREATE, status)
+        assert breaker.state(CREATE) == CLOSED
+        
+        call(breaker, CREATE, 0)
+        assert breaker.state(CREATE) == OPEN
+        
+        clock.now = 10
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.check(CREATE, retries=2)
+        assert isinstance(error.value, ApiError)
+        assert error.value.endpoint == CREATE
+        assert error.value.retry_after == pytest.approx(20)
+        assert error.value.retries == 2
+        assert error.value.status == 503
+        
+    def test_client_errors_do_not_count(self, clock):
+        """Test that 4xx responses are not failures by default"""
+        breaker = CircuitBreaker(window=4, min_calls=4, clock=clock)
+        for _ in range(8):
+            call(breaker, CREATE, 400)
+            
+        assert breaker.state(CREATE) == CLOSED
+        
+    def test_opens_on_latency(self, clock):
+        """Test that slow successful calls open the circuit too"""
+        breaker = CircuitBreaker(latency_threshold=10, slow_rate=0.5, window=4, min_calls=4, clock=clock)
+        for latency in (1, 30, 2, 45):
+            call(breaker, CREATE, 200, latency)
+            
+        assert breaker.state(CREATE) == OPEN
+        
+    def test_endpoints_have_their_own_circuits(self, clock):
+        """Test that a degraded endpoint does not block others"""
+        breaker = CircuitBreaker(window=2, min_calls=2, clock=clock)
+        call(breaker, CREATE, 503)
+        call(breaker, CREATE, 503)
+        
+        assert breaker.check(DISCOVER) is False
+        stats = breaker.stats()
+        assert stats[CREATE] == {"state": OPEN, "calls": 0, "failures": 0, "opened": 1, "rejected": 0}
+        assert stats[DISCOVER]["state"] == CLOSED
+        
+    def test_half_open_probes_close_the_circuit(self, clock):
+        """Test that successful probes close the circuit"""
+        breaker = CircuitBreaker(window=2, min_calls=2, open_duration=30, half_open_probes=2, clock=clock)
+        call(breaker, CREATE, 503)
+        call(breaker, CREATE, 503)
+        
+        clock.now = 31
+        assert breaker.state(CREATE) == HALF_OPEN
+        assert breaker.check(CREATE) is True
+        assert breaker.check(CREATE) is True
+        with pytest.raises(CircuitOpenError):
+            breaker.check(CREATE)
+            
+        breaker.record(CREATE, 1.0, 200, probe=True)
+        assert breaker.state(CREATE) == HALF_OPEN
+        breaker.record(CREATE, 1.0, 200, probe=True)
+        assert breaker.state(CREATE) == CLOSED
+        assert breaker.stats()[CREATE]["rejected"] == 1
+        
+    def test_failed_probe_reopens(self, clock):
+        """Test that a failed probe opens the circuit for another open_duration"""
+        breaker = CircuitBreaker(window=2, min_calls=2, open_duration=30, clock=clock)
+        call(breaker, CREATE, 503)
+        call(breaker, CREATE, 503)
+        
+        clock.now = 31
+        call(breaker, CREATE, 502)
+        assert breaker.state(CREATE) == OPEN
+        
+        clock.now = 60
+        with pytest.raises(CircuitOpenError) as error:
+            breaker.check(CREATE)
+        assert error.value.retry_after == pytest.approx(1)
+        
+    def test_abandoned_probe_frees_its_slot(self, clock):
+        """Test that a probe that never finished lets another probe through"""
+        breaker = CircuitBreaker(window=2, min_calls=2, half_open_probes=1, clock=clock)
+        call(breaker, CREATE, 503)
+        call(breaker, CREATE, 503)
+        clock.now = 100
+        
+        breaker.record(CREATE, 0.1, None, breaker.check(CREATE))
+        call(breaker, CREATE, 200)
+        
+        assert breaker.state(CREATE) == CLOSED
+        
+    def test_invalid_configuration(self):
+        """Test that thresholds are validated"""
+        with pytest.raises(ValueError):
+            CircuitBreaker(error_rate=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker(window=5, min_calls=10)
+        with pytest.raises(ValueError):
+            CircuitBreaker(half_open_probes=0)
+
+
+class TestClientCircuitBreaker:
+    """Test cases for circuit breakers in the API clients"""
+    
+    def test_fails_fast_once_open(self, requests_mock):
+        """Test that an open circuit stops retries and later calls without a request"""
+        requests_mock.post(f"https://api.test.com{CREATE}", status_code=503, json={"message": "Overloaded"})
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            retry_policy=RetryPolicy(max_attempts=5, backoff_factor=0),
+            circuit_breaker=CircuitBreaker(window=3, min_calls=3)
+        )
+        
+        with pytest.raises(CircuitOpenError) as error:
+            client.post(CREATE)
+        assert requests_mock.call_count == 3
+        assert error.value.retries == 3
+        
+        with pytest.raises(CircuitOpenError):
+            client.post(CREATE)
+        assert requests_mock.call_count == 3
+        
+    def test_network_errors_count(self, requests_mock):
+        """Test that requests without a response count as failures"""
+        requests_mock.post(f"https://api.test.com{CREATE}", exc=requests.ConnectionError("refused"))
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            circuit_breaker=CircuitBreaker(window=2, min_calls=2)
+        )
+        
+        for _ in range(2):
+            with pytest.raises(ApiError):
+                client.post(CREATE)
+                
+        assert client.circuit_breaker.state(CREATE) == OPEN
+        
+    def test_rejections_reach_hooks_and_metrics(self, requests_mock):
+        """Test that fail-fast rejections send on_error and are counted as errors"""
+        requests_mock.post(f"https://api.test.com{CREATE}", status_code=500, json={})
+        errors = []
+        hooks = RequestHooks()
+        hooks.on_error = errors.append
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            circuit_breaker=CircuitBreaker(window=2, min_calls=2),
+            hooks=hooks,
+            metrics=True
+        )
+        
+        for _ in range(3):
+            with pytest.raises(ApiError):
+                client.post(CREATE)
+                
+        assert isinstance(errors[-1].error, CircuitOpenError)
+        metrics = client.metrics.snapshot()[CREATE]
+        assert metrics["errors"] == {500: 2, 503: 1}
+        assert metrics["in_flight"] == 0
+        
+    def test_async_client(self):
+        """Test the circuit breaker through AsyncApiClient"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        calls = []
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: calls.append(request) or httpx.Response(502, json={})
+            )),
+            circuit_breaker=CircuitBreaker(window=2, min_calls=2)
+        )
+        
+        async def run():
+            for _ in range(4):
+                with pytest.raises(ApiError):
+                    await client.post(CREATE)
+                    
+        asyncio.run(run())
+        
+        assert len(calls) == 2
+        assert client.circuit_breaker.stats()[CREATE]["rejected"] == 2
@@ -0,0 +1,172 @@
+"""
+Tests for the command line interface of the B2B Campaign Agent SDK
+"""
+
+import io
+import json
+import sys
+import pytest
+from .cli import MalformedRow, main, read_csv, read_jsonl
+from .codec import get_codec
+
+BASE = "https://api.test.com"
+
+
+def run_cli(args, stdin=b""):
+    """Run the CLI against the mocked API, returning (status, output lines)"""
+    stdout = io.BytesIO()
+    old_stdin, old_stdout = sys.stdin, sys.stdout
+    sys.stdin = io.TextIOWrapper(io.BytesIO(stdin))
+    sys.stdout = io.TextIOWrapper(stdout)
+    try:
+        status = main([*args, "--api-key", "test-api-key", "--base-url", BASE])
+        output = stdout.getvalue()
+    finally:
+        sys.stdin, sys.stdout = old_stdin, old_stdout
+    return status, [json.loads(line) for line in output.splitlines()]
+
+
+@pytest.fixture
+def api(requests_mock):
+    requests_mock.post(
+        f"{BASE}/api/v1/business/discover",
+        json=lambda request, context: {"profile": {"name": request.json()["urls"][0]}}
+    )
+    requests_mock.post(
+        f"{BASE}/api/v1/business/compatibility",
+        json=lambda request, context: {
+            "target_business": request.json()["targetBusiness"]["profile"]["name"],
+            "user_business": request.json()["userBusiness"]["profile"]["name"],
+            "score": 7
+        }
+    )
+    return requests_mock
+
+
+class TestReaders:
+    """Test cases for the input readers"""
+    
+    def test_jsonl(self):
+        """Test JSON lines, bare URLs and blank lines"""
+        lines = io.StringIO('{"url": "https://a.com"}\n\nhttps://b.com\n["https://c.com"]\n')
+        
+        assert list(read_jsonl(lines, get_codec())) == [{"url": "https://a.com"}, "https://b.com", ["https://c.com"]]
+        
+    def test_malformed_lines(self):
+        """Test that undecodable rows are yielded with their line number"""
+        lines = io.StringIO('{"url": "https://a.com"}\n{"url": \n\n["https://c.com"\n')
+        rows = list(read_jsonl(lines, get_codec()))
+        
+        assert rows[0] == {"url": "https://a.com"}
+        assert [(row, row.line) for row in rows[1:]] == [('{"url":', 2), ('["https://c.com"', 4)]
+        assert all(isinstance(row, MalformedRow) for row in rows[1:])
+        
+        rows = list(read_csv(io.StringIO('target,additional_info\n"{""profile"": ",x\n')))
+        assert rows[0].line == 2
+        assert rows[0].reason.startswith("target: ")
+        
+    def test_csv_with_header(self):
+        """Test that JSON columns are decoded"""
+        rows = io.StringIO('target,additional_info\n"{""profile"": {""name"": ""A""}}",new office\n,\n')
+        
+        assert list(read_csv(rows)) == [{"target": {"profile": {"name": "A"}}, "additional_info": "new office"}]
+        
+    def test_csv_without_header(self):
+        """Test that a headerless CSV lists URLs"""
+        rows = io.StringIO("https://a.com,https://a.com/about\nhttps://b.com\n")
+        
+        assert list(read_csv(rows)) == [["https://a.com", "https://a.com/about"], ["https://b.com"]]
+
+
+class TestCli:
+    """Test cases for the b2brilliant command"""
+    
+    def test_discover_from_stdin(self, api):
+        """Test that results stream out as JSON lines in input order"""
+        status, lines = run_cli(["business", "discover", "--ordered"], b"https://a.com\nhttps://b.com\n")
+        
+        assert status == 0
+        assert [line["index"] for line in lines] == [0, 1]
+        assert [line["result"]["profile"]["name"] for line in lines] == ["https://a.com", "https://b.com"]
+        assert api.call_count == 2
+        
+    def test_piped_compatibility_with_failures(self, api, tmp_path):
+        """Test chaining discover output into compatibility, with a bad row"""
+        user = tmp_path / "user.json"
+        user.write_text(json.dumps({"profile": {"name": "Me"}}))
+        targets = tmp_path / "targets.jsonl"
+        targets.write_text('{"result": {"profile": {"name": "A"}}}\n{"nothing": 1}\n')
+        
+        status, lines = run_cli(["business", "compatibility", "-i", str(targets), "--user-business", str(user),
+                                 "--ordered"])
+        
+        assert status == 1
+        assert lines[0]["result"] == {"target_business": "A", "user_business": "Me", "score": 7}
+        assert lines[1]["error"]["type"] == "ValidationError"
+        assert lines[1]["error"]["message"] == "Input is missing target"
+        
+    def test_malformed_line_fails_only_its_row(self, api):
+        """Test that a line that is not valid JSON is reported and the job carries on"""
+        status, lines = run_cli(
+            ["business", "discover", "--ordered"],
+            b'{"url": "https://a.com"}\n{"url": \n{"url": "https://b.com"}\n'
+        )
+        
+        assert status == 1
+        assert [line["index"] for line in lines] == [0, 1, 2]
+        assert lines[1]["input"] == '{"url":'
+        assert lines[1]["error"]["type"] == "ValidationError"
+        assert lines[1]["error"]["validation_errors"] == {"line": 2}
+        assert lines[1]["error"]["message"].startswith("Line 2 is not valid JSON")
+        assert [lines[0]["result"], lines[2]["result"]] == [
+            {"profile": {"name": "https://a.com"}}, {"profile": {"name": "https://b.com"}}
+        ]
+        assert api.call_count == 2
+        
+    def test_resume(self, api, tmp_path):
+        """Test that a resumed run skips rows already done"""
+        checkpoint = str(tmp_path / "discover.db")
+        output = tmp_path / "out.jsonl"
+        urls = b"https://a.com\nhttps://b.com\n"
+        
+        run_cli(["business", "discover", "--resume", checkpoint, "-o", str(output)], urls)
+        status, _ = run_cli(["business", "discover", "--resume", checkpoint, "-o", str(output)],
+                            urls + b"https://c.com\n")
+        
+        assert status == 0
+        assert api.call_count == 3
+        assert len(output.read_text().splitlines()) == 3
+        
+    def test_rate_and_concurrency_flags(self, api):
+        """Test that --rate and --concurrency configure the agent"""
+        status, lines = run_cli(["business", "discover", "--rate", "1000", "--concurrency", "2", "--retries", "1"],
+                                b"https://a.com\n")
+        
+        assert status == 0
+        assert len(lines) == 1
+        
+    def test_requires_api_key(self, monkeypatch, capsys):
+        """Test that a missing API key is reported"""
+        monkeypatch.delenv("B2BRILLIANT_API_KEY", raising=False)
+        
+        with pytest.raises(SystemExit):
+            main(["business", "discover"])
+            
+        assert "API key is required" in capsys.readouterr().err
+        
+    def test_ordered_with_resume_is_rejected(self, capsys, tmp_path):
+        """Test that --ordered is not silently ignored with --resume"""
+        with pytest.raises(SystemExit):
+            run_cli(["business", "discover", "--ordered", "--resume", str(tmp_path / "done.jsonl")])
+            
+        assert "--ordered cannot be combined with --resume" in capsys.readouterr().err
+        
+    def test_sdk_errors_are_not_reported_as_bad_input(self, api, monkeypatch):
+        """Test that a TypeError inside the SDK call propagates instead of failing the row"""
+        def broken(self, urls, options=None):
+            raise TypeError("codec bug")
+            
+        monkeypatch.setattr("b2brilliant_sdk.business.BusinessService.discover", broken)
+        
+        with pytest.raises(TypeError, match="codec bug"):
+            run_cli(["business", "discover"], b"https://a.com\n")
@@ -0,0 +1,219 @@
+"""
+Tests for single-flight request coalescing in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from .api_client import ApiClient
+from .coalesce import SingleFlight, AsyncSingleFlight, request_key
+from .exceptions import ApiError
+
+
+def run_threads(count, target):
+    """Start ``count`` threads running ``target`` and wait for them"""
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestRequestKey:
+    """Test cases for request_key"""
+    
+    def test_key_ignores_dict_ordering(self):
+        """Test that the key is built from canonical JSON"""
+        assert request_key("/e", {"a": 1, "b": 2}) == request_key("/e", {"b": 2, "a": 1})
+    
+    def test_key_depends_on_endpoint_and_body(self):
+        """Test that different requests get different keys"""
+        assert request_key("/e", {"a": 1}) != request_key("/f", {"a": 1})
+        assert request_key("/e", {"a": 1}) != request_key("/e", {"a": 2})
+        assert request_key("/e", None) == request_key("/e", {})
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight class"""
+    
+    def test_concurrent_calls_are_merged(self):
+        """Test that only one of many identical concurrent calls executes"""
+        group = SingleFlight()
+        calls = []
+        results = []
+        started = threading.Barrier(5)
+        
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"profile": {"name": "A"}}
+        
+        def worker():
+            started.wait()
+            results.append(group.do("key", slow_call))
+        
+        run_threads(5, worker)
+        
+        assert len(calls) == 1
+        assert results == [{"profile": {"name": "A"}}] * 5
+        assert group.stats() == {"executed": 1, "merged": 4, "in_flight": 0}
+    
+    def test_followers_get_independent_copies(self):
+        """Test that callers can't mutate each other's results"""
+        group = SingleFlight()
+        results = []
+        started = threading.Barrier(2)
+        
+        def slow_call():
+            time.sleep(0.05)
+            return {"items": [1]}
+        
+        def worker():
+            started.wait()
+            results.append(group.do("key", slow_call))
+        
+        run_threads(2, worker)
+        
+        assert results[0] == results[1]
+        assert results[0] is not results[1]
+    
+    def test_errors_are_shared(self):
+        """Test that every merged caller sees the error"""
+        group = SingleFlight()
+        errors = []
+        started = threading.Barrier(3)
+        
+        def failing_call():
+            time.sleep(0.05)
+            raise ApiError("Bad gateway", 502)
+        
+        def worker():
+            started.wait()
+            try:
+                group.do("key", failing_call)
+            except ApiError as e:
+                errors.append(e.status)
+        
+        run_threads(3, worker)
+        
+        assert errors == [502, 502, 502]
+        assert group.stats()["executed"] == 1
+    
+    def test_sequential_calls_are_not_merged(self):
+        """Test that a finished call is not reused"""
+        group = SingleFlight()
+        
+        group.do("key", lambda: 1)
+        group.do("key", lambda: 2)
+        
+        assert group.stats() == {"executed": 2, "merged": 0, "in_flight": 0}
+
+
+class TestAsyncSingleFlight:
+    """Test cases for AsyncSingleFlight class"""
+    
+    def test_concurrent_calls_are_merged(self):
+        """Test that identical concurrent coroutines share one call"""
+        group = AsyncSingleFlight()
+        calls = []
+        
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+        
+        async def run():
+            return await asyncio.gather(*(group.do("key", slow_call) for _ in range(10)))
+        
+        results = asyncio.run(run())
+        
+        assert len(calls) == 1
+        assert results == [{"ok": True}] * 10
+        assert group.stats() == {"executed": 1, "merged": 9, "in_flight": 0}
+    
+    def test_errors_are_shared(self):
+        """Test that merged coroutines see the leader's error"""
+        group = AsyncSingleFlight()
+        
+        async def failing_call():
+            await asyncio.sleep(0.01)
+            raise ApiError("Unavailable", 503)
+        
+        async def run():
+            return await asyncio.gather(
+                *(group.do("key", failing_call) for _ in range(3)),
+                return_exceptions=True
+            )
+        
+        results = asyncio.run(run())
+        
+        assert [e.status for e in results] == [503, 503, 503]
+    
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        """Test that cancelling the caller that started a call leaves the call running for the others"""
+        group = AsyncSingleFlight()
+        calls = []
+        
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+        
+        async def run():
+            leader = asyncio.ensure_future(group.do("key", slow_call))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(group.do("key", slow_call))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            result = await follower
+            await asyncio.sleep(0)
+            return leader, result
+        
+        leader, result = asyncio.run(run())
+        
+        assert leader.cancelled()
+        assert result == {"ok": True}
+        assert len(calls) == 1
+        assert group.stats() == {"executed": 1, "merged": 1, "in_flight": 0}
+
+
+class TestApiClientCoalescing:
+    """Test cases for coalescing in ApiClient"""
+    
+    def test_identical_requests_share_one_call(self, requests_mock):
+        """Test that concurrent identical posts hit the API once"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", json={"ok": True})
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", coalesce=True)
+        original = client._cached_post
+        started = threading.Barrier(4)
+        
+        def slow_post(endpoint, data):
+            time.sleep(0.1)
+            return original(endpoint, data)
+        
+        client._cached_post = slow_post
+        
+        def worker():
+            started.wait()
+            client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+        
+        run_threads(4, worker)
+        
+        assert requests_mock.call_count == 1
+        assert client.single_flight.stats()["merged"] == 3
+    
+    def test_coalescing_is_off_by_default(self):
+        """Test that clients don't coalesce unless asked"""
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com")
+        
+        assert client.single_flight is None
+    
+    def test_async_client_uses_async_single_flight(self):
+        """Test that the async client coalesces on the event loop"""
+        pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        client = AsyncApiClient(api_key="test-api-key", base_url="https://api.test.com", coalesce=True)
+        
+        assert isinstance(client.single_flight, AsyncSingleFlight)
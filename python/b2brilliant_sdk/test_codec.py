@@ -0,0 +1,122 @@
+"""
+Tests for the JSON codecs in the B2B Campaign Agent SDK
+"""
+
+import json
+import pytest
+from . import codec as codec_module
+from .api_client import ApiClient
+from .codec import CODECS, JsonCodec, OrjsonCodec, get_codec
+from .exceptions import ApiError
+
+AVAILABLE = ["json"] + [name for name in ("orjson", "ujson") if getattr(codec_module, name)]
+
+PAYLOAD = {
+    "userBusiness": {
+        "profile": {"name": "Café Ünïcode", "services": ["a/b", "c"], "score": 1.5},
+        "contacts": {"social": [], "email": None},
+        "active": True
+    }
+}
+
+
+class TestCodecs:
+    """Test cases for the built-in codecs"""
+    
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_round_trip(self, name):
+        """Test that every installed codec encodes to bytes and decodes them back"""
+        codec = get_codec(name)
+        
+        encoded = codec.dumps(PAYLOAD)
+        
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == PAYLOAD
+        assert codec.loads(encoded) == PAYLOAD
+        
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_invalid_json_raises_value_error(self, name):
+        """Test that decode errors surface as ValueError"""
+        with pytest.raises(ValueError):
+            get_codec(name).loads(b"invalid json")
+            
+    def test_default_prefers_fastest_installed(self, monkeypatch):
+        """Test automatic codec selection"""
+        monkeypatch.setattr(codec_module, "orjson", None)
+        monkeypatch.setattr(codec_module, "ujson", None)
+        
+        assert isinstance(get_codec(), JsonCodec)
+        assert get_codec().name == "json"
+        
+    @pytest.mark.skipif(codec_module.orjson is None, reason="orjson not installed")
+    def test_default_uses_orjson(self):
+        """Test that orjson is picked when installed"""
+        assert isinstance(get_codec(), OrjsonCodec)
+        
+    def test_missing_library(self, monkeypatch):
+        """Test requesting a codec whose library is not installed"""
+        monkeypatch.setattr(codec_module, "orjson", None)
+        
+        with pytest.raises(ImportError):
+            get_codec("orjson")
+            
+    def test_unknown_name(self):
+        """Test that unknown codec names are rejected"""
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+        assert set(CODECS) == {"orjson", "ujson", "json"}
+        
+    def test_custom_codec_passed_through(self):
+        """Test that codec objects are used as given"""
+        custom = JsonCodec()
+        
+        assert get_codec(custom) is custom
+
+
+class TestApiClientCodec:
+    """Test cases for codec use in ApiClient"""
+    
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_request_and_response(self, requests_mock, name):
+        """Test that the configured codec encodes requests and decodes responses"""
+        requests_mock.post("https://api.test.com/test", json={"result": PAYLOAD})
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", codec=name)
+        
+        result = client.post("/test", PAYLOAD)
+        
+        assert client.codec.name == name
+        assert result == {"result": PAYLOAD}
+        assert requests_mock.last_request.json() == PAYLOAD
+        
+    def test_custom_codec(self, requests_mock):
+        """Test that a user-supplied codec is used for both directions"""
+        class RecordingCodec(JsonCodec):
+            def __init__(self):
+                self.calls = []
+                
+            def dumps(self, obj):
+                self.calls.append("dumps")
+                return super().dumps(obj)
+                
+            def loads(self, data):
+                self.calls.append("loads")
+                return super().loads(data)
+                
+        requests_mock.post("https://api.test.com/test", json={"ok": True})
+        codec = RecordingCodec()
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", codec=codec)
+        
+        assert client.post("/test", {"a": 1}) == {"ok": True}
+        assert codec.calls == ["dumps", "loads"]
+        
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_invalid_response_is_network_error(self, requests_mock, name):
+        """Test that undecodable success bodies still raise a status 0 ApiError"""
+        requests_mock.post("https://api.test.com/test", status_code=200, text="invalid json")
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", codec=name)
+        
+        with pytest.raises(ApiError) as exc_info:
+            client.post("/test")
+            
+        assert exc_info.value.status == 0
+        assert "original_error" in exc_info.value.data
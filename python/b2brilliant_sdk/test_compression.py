@@ -0,0 +1,123 @@
+"""
+Tests for content-encoding negotiation and request compression in the B2B Campaign Agent SDK
+"""
+
+import gzip
+import json
+import zlib
+import pytest
+from .api_client import ApiClient
+from .compression import accept_encoding, compress_body
+
+
+class TestAcceptEncoding:
+    """Test cases for accept_encoding"""
+    
+    def test_orders_by_preference(self):
+        """Test that codings are listed best first"""
+        assert accept_encoding(["gzip", "deflate", "br", "zstd"]) == "zstd, br, gzip, deflate"
+    
+    def test_only_advertises_supported_codings(self):
+        """Test that codings the transport can't decode are left out"""
+        assert accept_encoding(["deflate", "gzip"]) == "gzip, deflate"
+        assert accept_encoding([" GZIP "]) == "gzip"
+    
+    def test_ignores_unknown_codings(self):
+        """Test that codings without a preference are not advertised"""
+        assert accept_encoding(["identity", "gzip"]) == "gzip"
+
+
+class TestCompressBody:
+    """Test cases for compress_body"""
+    
+    def test_gzip_round_trip(self):
+        """Test gzip compression"""
+        body = b'{"a": "' + b"x" * 1000 + b'"}'
+        
+        compressed = compress_body(body, "gzip")
+        
+        assert gzip.decompress(compressed) == body
+        assert compressed == compress_body(body, "gzip")
+    
+    def test_deflate_round_trip(self):
+        """Test deflate compression"""
+        body = b"y" * 1000
+        
+        assert zlib.decompress(compress_body(body, "deflate")) == body
+    
+    def test_unknown_encoding(self):
+        """Test that unsupported codings are rejected"""
+        with pytest.raises(ValueError):
+            compress_body(b"{}", "br")
+
+
+class TestApiClientCompression:
+    """Test cases for compression in ApiClient"""
+    
+    def test_default_accept_encoding_includes_gzip(self, requests_mock):
+        """Test that gzip is negotiated instead of deflate only"""
+        requests_mock.post("https://api.test.com/test", json={})
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com")
+        
+        client.post("/test")
+        
+        encodings = requests_mock.request_history[0].headers["Accept-Encoding"].split(", ")
+        assert "gzip" in encodings
+        assert "deflate" in encodings
+    
+    def test_explicit_accept_encoding(self, requests_mock):
+        """Test overriding the Accept-Encoding header"""
+        requests_mock.post("https://api.test.com/test", json={})
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", accept_encoding="identity")
+        
+        client.post("/test")
+        
+        assert requests_mock.request_history[0].headers["Accept-Encoding"] == "identity"
+    
+    def test_large_bodies_are_compressed(self, requests_mock):
+        """Test that bodies above the threshold are gzipped"""
+        requests_mock.post("https://api.test.com/test", json={})
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            compress_requests=True,
+            compress_threshold=100
+        )
+        payload = {"businessData": {"summary": "word " * 100}}
+        
+        client.post("/test", payload)
+        
+        request = requests_mock.request_history[0]
+        assert request.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(request.body)) == payload
+        assert len(request.body) < len(json.dumps(payload))
+    
+    def test_small_bodies_are_sent_as_is(self, requests_mock):
+        """Test that bodies below the threshold are not compressed"""
+        requests_mock.post("https://api.test.com/test", json={})
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            compress_requests=True,
+            compress_threshold=1000
+        )
+        
+        client.post("/test", {"urls": ["https://a.com"]})
+        
+        request = requests_mock.request_history[0]
+        assert "Content-Encoding" not in request.headers
+        assert request.json() == {"urls": ["https://a.com"]}
+    
+    def test_compression_is_off_by_default(self, requests_mock):
+        """Test that request bodies are not compressed unless enabled"""
+        requests_mock.post("https://api.test.com/test", json={})
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", compress_threshold=1)
+        
+        client.post("/test", {"a": "b"})
+        
+        assert "Content-Encoding" not in requests_mock.request_history[0].headers
+    
+    def test_invalid_request_encoding(self):
+        """Test that only gzip and deflate can be used for request bodies"""
+        with pytest.raises(ValueError):
+            ApiClient(api_key="test-api-key", base_url="https://api.test.com", request_encoding="br")
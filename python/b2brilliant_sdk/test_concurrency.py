@@ -0,0 +1,222 @@
+"""
+Tests for adaptive concurrency limits in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import threading
+import pytest
+from .api_client import ApiClient
+from .concurrency import AdaptiveConcurrency, AdaptiveLimit
+from .endpoints import BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS, USER_ENDPOINTS
+from .fake_server import FakeRoute, FakeServer
+
+DISCOVER = BUSINESS_ENDPOINTS["DISCOVER"]
+
+
+def saturate(limit, latency, completions):
+    """Keep the limit full while requests finish with the same latency, then drain it"""
+    for _ in range(completions):
+        while limit.in_flight < int(limit.limit):
+            limit.acquire()
+        limit.release(latency, 200)
+    while limit.in_flight:
+        limit.release()
+
+
+class TestAdaptiveLimit:
+    """Test cases for AdaptiveLimit"""
+    
+    def test_grows_while_latency_is_steady(self):
+        """Test that a saturated limit grows by about one per round"""
+        limit = AdaptiveLimit(initial_limit=4, max_limit=6)
+        
+        saturate(limit, 1.0, 5)
+        assert int(limit.limit) == 5
+        saturate(limit, 1.0, 50)
+        assert int(limit.limit) == 6
+        
+    def test_idle_limit_does_not_grow(self):
+        """Test that requests well under the limit leave it alone"""
+        limit = AdaptiveLimit(initial_limit=8)
+        
+        for _ in range(20):
+            limit.acquire()
+            limit.release(1.0, 200)
+            
+        assert limit.stats() == {"limit": 8, "in_flight": 0, "increases": 0, "decreases": 0}
+        
+    def test_throttling_cuts_once_per_response_time(self, clock):
+        """Test that a burst of 429s halves the limit once"""
+        limit = AdaptiveLimit(initial_limit=16, clock=clock)
+        saturate(limit, 2.0, 1)
+        
+        for _ in range(8):
+            limit.acquire()
+        for _ in range(8):
+            limit.release(2.0, 429)
+        assert int(limit.limit) == 8
+        
+        clock.now += 2.5
+        limit.acquire()
+        limit.release(2.0, 429)
+        assert int(limit.limit) == 4
+        
+    def test_latency_spike_cuts(self, clock):
+        """Test that latency far above its usual level cuts the limit"""
+        limit = AdaptiveLimit(initial_limit=10, clock=clock)
+        saturate(limit, 1.0, 30)
+        before = limit.limit
+        
+        for _ in range(3):
+            limit.acquire()
+            limit.release(6.0, 200)
+            
+        assert limit.limit == pytest.approx(before / 2)
+        assert limit.stats()["decreases"] == 1
+        
+    def test_bounds(self, clock):
+        """Test that the limit stays between min_limit and max_limit"""
+        limit = AdaptiveLimit(initial_limit=2, min_limit=2, max_limit=3, clock=clock)
+        for _ in range(5):
+            clock.now += 10
+            limit.acquire()
+            limit.release(1.0, 503)
+        assert int(limit.limit) == 2
+        
+        saturate(limit, 1.0, 100)
+        assert int(limit.limit) == 3
+        
+    def test_errors_without_throttling_leave_the_limit(self):
+        """Test that network errors and other failures do not move the limit"""
+        limit = AdaptiveLimit(initial_limit=1)
+        limit.acquire()
+        limit.release(1.0, None)
+        limit.acquire()
+        limit.release(1.0, 500)
+        
+        assert limit.stats()["increases"] == limit.stats()["decreases"] == 0
+        
+    def test_invalid_configuration(self):
+        """Test that limits and factors are validated"""
+        with pytest.raises(ValueError):
+            AdaptiveLimit(initial_limit=0)
+        with pytest.raises(ValueError):
+            AdaptiveLimit(initial_limit=10, max_limit=5)
+        with pytest.raises(ValueError):
+            AdaptiveLimit(decrease=1)
+        with pytest.raises(ValueError):
+            AdaptiveLimit(latency_tolerance=1)
+            
+    def test_threads_wait_for_a_slot(self):
+        """Test that acquire blocks while the limit is in use"""
+        limit = AdaptiveLimit(initial_limit=1)
+        limit.acquire()
+        acquired = threading.Event()
+        
+        def waiter():
+            limit.acquire()
+            acquired.set()
+            
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        assert not acquired.wait(0.1)
+        
+        limit.release()
+        thread.join(1)
+        assert acquired.is_set()
+        assert limit.in_flight == 1
+        
+    def test_tasks_wait_for_a_slot(self):
+        """Test acquire_async, including a waiter cancelled while queued"""
+        limit = AdaptiveLimit(initial_limit=1)
+        
+        async def run():
+            await limit.acquire_async()
+            cancelled = asyncio.ensure_future(limit.acquire_async())
+            waiting = asyncio.ensure_future(limit.acquire_async())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            assert not waiting.done()
+            
+            limit.release()
+            await asyncio.wait_for(waiting, 1)
+            assert cancelled.cancelled()
+            
+        asyncio.run(run())
+        
+        assert limit.in_flight == 1
+
+
+class TestAdaptiveConcurrency:
+    """Test cases for AdaptiveConcurrency"""
+    
+    def test_groups_share_a_limit(self):
+        """Test that endpoints of one group share a limit"""
+        adaptive = AdaptiveConcurrency(initial_limit=3)
+        
+        assert adaptive.limiter(DISCOVER) is adaptive.limiter(BUSINESS_ENDPOINTS["COMPATIBILITY"])
+        assert adaptive.limiter(DISCOVER) is not adaptive.limiter(USER_ENDPOINTS["DISCOVER"])
+        assert adaptive.group(CAMPAIGN_ENDPOINTS["CREATE"]) == "campaigns"
+        assert adaptive.group("/other") == "/other"
+        
+        adaptive.limiter("/other")
+        assert adaptive.limits() == {"user": 3, "business": 3, "campaigns": 3, "/other": 3}
+        
+    def test_client_backs_off_on_throttling(self, requests_mock):
+        """Test that 429s cut the client's limit and show up in the metrics"""
+        requests_mock.post(f"https://api.test.com{DISCOVER}", status_code=429, json={"message": "Slow down"})
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            adaptive_concurrency=AdaptiveConcurrency(initial_limit=8),
+            metrics=True
+        )
+        
+        with pytest.raises(Exception):
+            client.post(DISCOVER, {"urls": ["https://a.com"]})
+            
+        assert client.adaptive_concurrency.limits()["business"] == 4
+        assert client.metrics.snapshot()[DISCOVER]["concurrency_limit"] == 4
+        assert f'b2brilliant_concurrency_limit{{endpoint="{DISCOVER}"}} 4' in client.metrics.prometheus()
+        
+    def test_client_limits_threads(self):
+        """Test that threads sharing a client stay under the limit"""
+        with FakeServer(FakeRoute(latency=0.05)) as server:
+            client = ApiClient(
+                api_key="test-api-key",
+                base_url=server.url,
+                adaptive_concurrency=AdaptiveConcurrency(initial_limit=2, max_limit=2)
+            )
+            threads = [
+                threading.Thread(target=client.post, args=(DISCOVER, {"urls": ["https://a.com"]}))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+                
+        assert server.calls[(DISCOVER, 200)] == 8
+        assert server.max_in_flight == 2
+        assert client.adaptive_concurrency.stats()["business"]["in_flight"] == 0
+        
+    def test_async_client(self):
+        """Test adaptive concurrency through AsyncApiClient"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json={"a": 1})
+            )),
+            adaptive_concurrency=True
+        )
+        
+        async def run():
+            return await asyncio.gather(*(client.post(DISCOVER) for _ in range(10)))
+            
+        assert asyncio.run(run()) == [{"a": 1}] * 10
+        assert client.adaptive_concurrency.stats()["business"]["in_flight"] == 0
@@ -2,8 +2,9 @@
 Tests for custom exceptions in the B2B Campaign Agent SDK
 """
 
+import pickle
 import pytest
-from .exceptions import ApiError, ValidationError
+from .exceptions import ApiError, CircuitOpenError, ValidationError
 
 
 class TestApiError:
@@ -60,6 +61,30 @@ class TestApiError:
         assert hasattr(error, '__repr__')
 
 
+class TestCircuitOpenError:
+    """Test cases for CircuitOpenError class"""
+    
+    def test_circuit_open_error_is_an_api_error(self):
+        """Test that CircuitOpenError carries the endpoint and wait time"""
+        error = CircuitOpenError("/api/v1/campaigns/create", 12.5, retries=1)
+        
+        assert isinstance(error, ApiError)
+        assert error.status == 503
+        assert error.retries == 1
+        assert error.endpoint == "/api/v1/campaigns/create"
+        assert error.retry_after == 12.5
+        assert error.data == {"endpoint": "/api/v1/campaigns/create", "retry_after": 12.5}
+        assert str(error) == "Circuit open for /api/v1/campaigns/create, retry in 12.5s"
+        
+    def test_circuit_open_error_pickles(self):
+        """Test that errors keep every field through pickling, e.g. from a worker process"""
+        error = pickle.loads(pickle.dumps(CircuitOpenError("/api/v1/campaigns/create", 12.5, retries=1)))
+        
+        assert isinstance(error, CircuitOpenError)
+        assert (error.status, error.retries, error.endpoint) == (503, 1, "/api/v1/campaigns/create")
+        assert str(error) == "Circuit open for /api/v1/campaigns/create, retry in 12.5s"
+
+
 class TestValidationError:
     """Test cases for ValidationError class"""
     
@@ -0,0 +1,142 @@
+"""
+Tests for the fake API server in the B2B Campaign Agent SDK
+"""
+
+import random
+import statistics
+import time
+import pytest
+from .agent import B2BrilliantAgent
+from .api_client import ApiClient
+from .endpoints import BUSINESS_ENDPOINTS
+from .exceptions import ApiError
+from .fake_server import FakeRoute, FakeServer, Latency
+from .retry import RetryPolicy
+
+COMPATIBILITY = BUSINESS_ENDPOINTS["COMPATIBILITY"]
+
+
+@pytest.fixture
+def server():
+    with FakeServer(seed=1) as fake:
+        yield fake
+
+
+def agent_for(fake, **options):
+    return B2BrilliantAgent(api_key="test-api-key", base_url=fake.url, **options)
+
+
+class TestFakeServer:
+    """Test cases for FakeServer"""
+    
+    def test_every_route(self, server):
+        """Test the basic usage flow against all seven routes"""
+        agent = agent_for(server)
+        
+        user = agent.user.discover(["https://themediamasons.com"], {"find_competitors": True})
+        target = agent.business.discover(["https://www.tuni-points.com"])
+        user = agent.user.refine(user, "We now offer video production")
+        target = agent.business.refine(target, "They opened a new office")
+        compatibility = agent.business.compatibility(user, target)
+        campaigns = agent.campaigns.create(user, target, "email")
+        refined = agent.campaigns.refine(user, target, campaigns, "More casual")
+        
+        assert user["profile"]["name"] == "Themediamasons"
+        assert user["competitors"]
+        assert "competitors" not in target
+        assert target["profile"]["name"] == "Tuni Points"
+        assert user["profile"]["summary"].endswith("We now offer video production")
+        assert compatibility["target_business"] == "Tuni Points"
+        assert 0 <= compatibility["score"] <= 10
+        assert compatibility["reasoning"]["positives"]
+        assert [campaign["type"] for campaign in campaigns["campaigns"]] == ["email"]
+        assert 0 <= campaigns["campaigns"][0]["rating"] <= 10
+        assert refined["campaigns"][0]["content"].endswith("(More casual)")
+        assert sum(server.calls.values()) == 7
+        
+    def test_streamed_campaigns(self, server):
+        """Test that campaign creation streams to clients that ask for it"""
+        agent = agent_for(server)
+        business = {"profile": {"name": "Acme"}}
+        
+        campaigns = list(agent.campaigns.create_stream(business, business, ["dm", "sms"]))
+        
+        assert [campaign["type"] for campaign in campaigns] == ["dm", "sms"]
+        
+    def test_throttling(self):
+        """Test that throttled requests get 429 with Retry-After"""
+        with FakeServer(FakeRoute(throttle_rate=1, retry_after=0)) as fake:
+            agent = agent_for(fake, retry_policy=RetryPolicy(max_attempts=3, backoff_factor=0, jitter=False))
+            
+            with pytest.raises(ApiError) as exc_info:
+                agent.business.discover(["https://a.com"])
+                
+        assert exc_info.value.status == 429
+        assert fake.calls[(BUSINESS_ENDPOINTS["DISCOVER"], 429)] == 3
+        
+    def test_errors_and_per_route_overrides(self):
+        """Test injected errors on one route while the others succeed"""
+        routes = {COMPATIBILITY: FakeRoute(error_rate=1, error_status=500)}
+        with FakeServer(routes=routes) as fake:
+            agent = agent_for(fake)
+            target = agent.business.discover(["https://a.com"])
+            
+            with pytest.raises(ApiError) as exc_info:
+                agent.business.compatibility(target, target)
+                
+        assert exc_info.value.status == 500
+        assert exc_info.value.message == "Injected failure"
+        
+    def test_latency_and_size(self):
+        """Test fixed latency and padded response sizes"""
+        with FakeServer(FakeRoute(latency=0.05, size_kb=16)) as fake:
+            client = ApiClient(api_key="test-api-key", base_url=fake.url)
+            payload = {"urls": ["https://a.com"]}
+            
+            started = time.perf_counter()
+            response = client.session.post(fake.url + BUSINESS_ENDPOINTS["DISCOVER"], json=payload)
+            elapsed = time.perf_counter() - started
+            
+        assert elapsed >= 0.05
+        assert len(response.content) >= 16 * 1024
+        assert response.json()["profile"]["name"] == "A"
+        
+    def test_latency_distribution(self):
+        """Test that sampled latencies centre on the median and respect the cap"""
+        rng = random.Random(7)
+        latency = Latency(median=0.5, sigma=0.8, maximum=3)
+        
+        samples = [latency.sample(rng) for _ in range(5000)]
+        
+        assert statistics.median(samples) == pytest.approx(0.5, rel=0.1)
+        assert max(samples) == 3
+        assert Latency(0.2).sample(rng) == 0.2
+        
+    def test_rejects_bad_requests(self):
+        """Test API key checks, unknown routes and compressed bodies"""
+        with FakeServer(api_key="secret") as fake:
+            with pytest.raises(ApiError) as exc_info:
+                ApiClient(api_key="wrong", base_url=fake.url).post(COMPATIBILITY, {})
+            assert exc_info.value.status == 401
+            
+            client = ApiClient(api_key="secret", base_url=fake.url, compress_requests=True, compress_threshold=0)
+            with pytest.raises(ApiError) as exc_info:
+                client.post("/api/v1/unknown", {})
+            assert exc_info.value.status == 404
+            
+            business = {"profile": {"name": "Acme"}}
+            score = client.post(COMPATIBILITY, {"userBusiness": business, "targetBusiness": business})
+            assert score["user_business"] == "Acme"
+            
+    def test_concurrency(self):
+        """Test that the server answers concurrent requests in parallel"""
+        with FakeServer(FakeRoute(latency=0.1)) as fake:
+            agent = agent_for(fake, pool_maxsize=8)
+            
+            started = time.perf_counter()
+            results = list(agent.business.discover_many([[f"https://{i}.com"] for i in range(8)], max_concurrency=8))
+            elapsed = time.perf_counter() - started
+            
+        assert all(result.ok for result in results)
+        assert fake.max_in_flight == 8
+        assert elapsed < 0.5
@@ -0,0 +1,352 @@
+"""
+Tests for hedged requests in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from .api_client import ApiClient
+from .concurrency import AdaptiveConcurrency
+from .endpoints import BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS
+from .fake_server import FakeRoute, FakeServer
+from .hedge import HedgePolicy, LatencyTracker
+
+DISCOVER = BUSINESS_ENDPOINTS["DISCOVER"]
+
+
+class _Server:
+    """Local HTTP server whose handler sleeps according to a per-call schedule"""
+    
+    def __init__(self):
+        self.delays = []
+        self.calls = 0
+        self._lock = threading.Lock()
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with server._lock:
+                    call = server.calls
+                    server.calls += 1
+                delay = server.delays[call] if call < len(server.delays) else 0
+                if delay is None:
+                    self.close_connection = True
+                    return
+                time.sleep(delay)
+                body = json.dumps({"call": call}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                
+            def log_message(self, *args):
+                pass
+                
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = _Server()
+    yield server
+    server.close()
+
+
+class TestLatencyTracker:
+    """Test cases for LatencyTracker class"""
+    
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        tracker = LatencyTracker()
+        for latency in range(1, 101):
+            tracker.record(latency)
+            
+        assert tracker.percentile(50) == 50
+        assert tracker.percentile(95) == 95
+        assert tracker.percentile(100) == 100
+        
+    def test_window(self):
+        """Test that only recent samples are kept"""
+        tracker = LatencyTracker(window=3)
+        for latency in (100, 1, 2, 3):
+            tracker.record(latency)
+            
+        assert len(tracker) == 3
+        assert tracker.percentile(100) == 3
+        
+    def test_empty(self):
+        """Test percentile without samples"""
+        assert LatencyTracker().percentile(95) is None
+
+
+class TestHedgePolicy:
+    """Test cases for HedgePolicy class"""
+    
+    def test_no_hedge_during_warm_up(self):
+        """Test that requests are not hedged until enough latencies are known"""
+        policy = HedgePolicy(min_samples=3)
+        
+        assert policy.hedge_delay(DISCOVER) is None
+        
+    def test_initial_delay_during_warm_up(self):
+        """Test the configured warm-up delay"""
+        policy = HedgePolicy(min_samples=3, initial_delay=2.0)
+        
+        assert policy.hedge_delay(DISCOVER) == 2.0
+        
+    def test_delay_follows_percentile(self):
+        """Test that the delay tracks recent latency on the endpoint"""
+        policy = HedgePolicy(percentile=90, window=10, min_samples=10, min_delay=0.5)
+        for latency in range(1, 11):
+            policy.record(DISCOVER, latency / 10)
+            
+        assert policy.hedge_delay(DISCOVER) == pytest.approx(0.9)
+        assert policy.hedge_delay("/other") is None
+        
+        for _ in range(10):
+            policy.record(DISCOVER, 0.1)
+        assert policy.hedge_delay(DISCOVER) == 0.5
+        
+    def test_hedge_budget(self):
+        """Test that hedges are capped to a fraction of requests"""
+        policy = HedgePolicy(max_hedge_ratio=0.5, max_hedge_burst=1, initial_delay=0)
+        
+        policy.hedge_delay(DISCOVER)
+        assert not policy.acquire_hedge()
+        
+        policy.hedge_delay(DISCOVER)
+        assert policy.acquire_hedge()
+        assert not policy.acquire_hedge()
+        
+        for _ in range(10):
+            policy.hedge_delay(DISCOVER)
+        assert policy.acquire_hedge()
+        assert not policy.acquire_hedge()
+        assert policy.stats() == {"requests": 12, "hedged": 2, "hedge_wins": 0, "hedge_rate": 2 / 12}
+        
+    def test_hedgeable_endpoints(self):
+        """Test that only discover endpoints are hedged by default"""
+        policy = HedgePolicy()
+        
+        assert policy.hedges(DISCOVER)
+        assert not policy.hedges(CAMPAIGN_ENDPOINTS["CREATE"])
+        
+    def test_invalid_arguments(self):
+        """Test argument validation"""
+        with pytest.raises(ValueError):
+            HedgePolicy(percentile=0)
+        with pytest.raises(ValueError):
+            HedgePolicy(max_hedge_ratio=2)
+
+
+class TestApiClientHedging:
+    """Test cases for hedging in ApiClient"""
+    
+    def make_client(self, server, **policy_options):
+        policy_options.setdefault("initial_delay", 0.05)
+        policy_options.setdefault("max_hedge_ratio", 1)
+        policy_options.setdefault("endpoints", [DISCOVER])
+        return ApiClient(
+            api_key="test-api-key",
+            base_url=server.url,
+            hedge_policy=HedgePolicy(**policy_options)
+        )
+        
+    def test_slow_request_is_hedged(self, server):
+        """Test that the duplicate's response is used when the primary is slow"""
+        server.delays = [0.5, 0]
+        client = self.make_client(server)
+        
+        start = time.monotonic()
+        result = client.post(DISCOVER, {"urls": ["https://a.com"]})
+        
+        assert result == {"call": 1}
+        assert time.monotonic() - start < 0.4
+        assert client.hedge_policy.stats()["hedge_wins"] == 1
+        client.close()
+        
+    def test_fast_request_is_not_hedged(self, server):
+        """Test that requests finishing before the delay are sent once"""
+        client = self.make_client(server, initial_delay=1)
+        
+        assert client.post(DISCOVER, {}) == {"call": 0}
+        assert server.calls == 1
+        assert client.hedge_policy.stats()["hedged"] == 0
+        client.close()
+        
+    def test_hedge_budget_exhausted(self, server):
+        """Test that the primary is awaited when no hedge budget is left"""
+        server.delays = [0.2]
+        client = self.make_client(server, max_hedge_ratio=0.1)
+        
+        assert client.post(DISCOVER, {}) == {"call": 0}
+        assert server.calls == 1
+        client.close()
+        
+    def test_non_hedgeable_endpoint(self, server):
+        """Test that endpoints outside the policy are never duplicated"""
+        server.delays = [0.2]
+        client = self.make_client(server)
+        
+        assert client.post(CAMPAIGN_ENDPOINTS["CREATE"], {}) == {"call": 0}
+        assert server.calls == 1
+        client.close()
+        
+    def test_failed_primary_falls_back_to_hedge(self, server):
+        """Test that a primary failing after the hedge was sent does not fail the call"""
+        server.delays = [None, 0.2]
+        client = self.make_client(server, initial_delay=0)
+        
+        assert client.post(DISCOVER, {}) == {"call": 1}
+        client.close()
+        
+    def test_hedging_does_not_limit_concurrency(self):
+        """Test that hedgeable calls are not queued behind the connection pool size"""
+        with FakeServer(FakeRoute(latency=0.2)) as server:
+            client = ApiClient(
+                api_key="test-api-key",
+                base_url=server.url,
+                pool_maxsize=2,
+                hedge_policy=HedgePolicy(initial_delay=30, endpoints=[DISCOVER])
+            )
+            threads = [
+                threading.Thread(target=client.post, args=(DISCOVER, {"urls": ["https://a.com"]}))
+                for _ in range(12)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            client.close()
+            
+        assert server.calls[(DISCOVER, 200)] == 12
+        assert server.max_in_flight == 12
+        assert client.hedge_policy.stats()["hedged"] == 0
+        
+    def test_hedges_count_against_adaptive_limit(self):
+        """Test that a hedge only goes out when the adaptive limit has a free slot"""
+        with FakeServer(FakeRoute(latency=0.3)) as server:
+            client = ApiClient(
+                api_key="test-api-key",
+                base_url=server.url,
+                adaptive_concurrency=AdaptiveConcurrency(initial_limit=3, min_limit=3, max_limit=3),
+                hedge_policy=HedgePolicy(initial_delay=0.05, max_hedge_ratio=1, endpoints=[DISCOVER])
+            )
+            threads = [
+                threading.Thread(target=client.post, args=(DISCOVER, {"urls": ["https://a.com"]}))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            client.close()
+            
+        assert server.max_in_flight == 3
+        assert client.hedge_policy.stats()["hedged"] >= 1
+        assert client.adaptive_concurrency.limiter(DISCOVER).in_flight == 0
+        
+    def test_hedges_reach_hooks_and_metrics(self):
+        """Test that every request sent, hedges included, is counted once"""
+        with FakeServer(FakeRoute(latency=0.2)) as server:
+            client = ApiClient(
+                api_key="test-api-key",
+                base_url=server.url,
+                metrics=True,
+                hedge_policy=HedgePolicy(initial_delay=0.05, max_hedge_ratio=1, endpoints=[DISCOVER])
+            )
+            for _ in range(3):
+                client.post(DISCOVER, {"urls": ["https://a.com"]})
+            # The losers are discarded once their responses arrive
+            time.sleep(0.3)
+            client.close()
+            
+        metrics = client.metrics.snapshot()[DISCOVER]
+        assert server.calls[(DISCOVER, 200)] == 6
+        assert metrics["requests"] == 6
+        assert metrics["responses"] == {200: 3}
+        assert metrics["in_flight"] == 0
+
+
+class TestAsyncApiClientHedging:
+    """Test cases for hedging in AsyncApiClient"""
+    
+    def test_slow_request_is_hedged_and_cancelled(self):
+        """Test that the duplicate wins and the slow primary is cancelled"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        state = {"calls": 0, "cancelled": False}
+        
+        async def handler(request):
+            state["calls"] += 1
+            if state["calls"] == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    state["cancelled"] = True
+                    raise
+                return httpx.Response(200, json={"from": "primary"})
+            return httpx.Response(200, json={"from": "hedge"})
+            
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            hedge_policy=HedgePolicy(initial_delay=0.05, max_hedge_ratio=1)
+        )
+        
+        async def run():
+            result = await client.post(DISCOVER, {})
+            await asyncio.sleep(0)
+            return result
+            
+        assert asyncio.run(run()) == {"from": "hedge"}
+        assert state == {"calls": 2, "cancelled": True}
+        assert client.hedge_policy.stats()["hedge_wins"] == 1
+        
+    def test_hedges_reach_metrics(self):
+        """Test that the duplicate and the cancelled primary are both counted"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        calls = []
+        
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"call": len(calls)})
+            
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            metrics=True,
+            hedge_policy=HedgePolicy(initial_delay=0.05, max_hedge_ratio=1)
+        )
+        
+        async def run():
+            result = await client.post(DISCOVER, {})
+            await asyncio.sleep(0)
+            return result
+            
+        assert asyncio.run(run()) == {"call": 2}
+        metrics = client.metrics.snapshot()[DISCOVER]
+        assert metrics["requests"] == 2
+        assert metrics["responses"] == {200: 1}
+        assert metrics["in_flight"] == 0
@@ -0,0 +1,211 @@
+"""
+Tests for request event hooks in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from .api_client import ApiClient
+from .cache import MemoryCache, ResponseCache
+from .exceptions import ApiError
+from .hooks import PHASES, RequestEvent, RequestHooks
+from .retry import RetryPolicy
+
+
+class RecordingHooks(RequestHooks):
+    """Hooks that keep every event they receive"""
+    
+    def __init__(self):
+        self.events = []
+        
+    def on_request_start(self, event):
+        self.events.append(("start", event))
+        
+    def on_response(self, event):
+        self.events.append(("response", event))
+        
+    def on_retry(self, event):
+        self.events.append(("retry", event))
+        
+    def on_error(self, event):
+        self.events.append(("error", event))
+        
+    def names(self):
+        return [name for name, _ in self.events]
+
+
+def make_client(hooks, **options):
+    return ApiClient(api_key="test-api-key", base_url="https://api.test.com", hooks=hooks, **options)
+
+
+class TestRequestHooks:
+    """Test cases for hooks on ApiClient"""
+    
+    def test_successful_request(self, requests_mock):
+        """Test the events and timings of a request that succeeds first time"""
+        requests_mock.post("https://api.test.com/test", json={"score": 8})
+        hooks = RecordingHooks()
+        
+        make_client(hooks).post("/test", {"name": "Café"})
+        
+        assert hooks.names() == ["start", "response"]
+        start, response = (event for _, event in hooks.events)
+        assert start == RequestEvent("/test", 1, None, len(b'{"name":"Caf\xc3\xa9"}'), None, start.timings, None, None)
+        assert set(start.timings) == {"encode"}
+        assert response.status == 200
+        assert response.response_size == len(b'{"score": 8}')
+        assert {"encode", "ttfb", "transfer", "decode"} <= set(response.timings) <= set(PHASES)
+        assert response.elapsed == pytest.approx(sum(response.timings.values()))
+        
+    def test_retry_then_success(self, requests_mock):
+        """Test that each attempt is reported and retries carry the error and delay"""
+        requests_mock.post("https://api.test.com/test", [
+            {"status_code": 503, "json": {"message": "Busy"}},
+            {"status_code": 200, "json": {"ok": True}}
+        ])
+        hooks = RecordingHooks()
+        client = make_client(hooks, retry_policy=RetryPolicy(backoff_factor=0, jitter=False))
+        
+        client.post("/test")
+        
+        assert hooks.names() == ["start", "response", "retry", "start", "response"]
+        retry = hooks.events[2][1]
+        assert retry.status == 503
+        assert retry.error.status == 503
+        assert retry.retry_delay == 0
+        final = hooks.events[4][1]
+        assert final.attempt == 2
+        assert final.status == 200
+        assert "encode" not in final.timings
+        
+    def test_final_error(self, requests_mock):
+        """Test that a request that gives up reports on_error"""
+        requests_mock.post("https://api.test.com/test", status_code=400, json={"message": "Bad"})
+        hooks = RecordingHooks()
+        
+        with pytest.raises(ApiError):
+            make_client(hooks).post("/test")
+            
+        assert hooks.names() == ["start", "response", "error"]
+        assert hooks.events[2][1].error.status == 400
+        
+    def test_network_error(self, requests_mock):
+        """Test that a failure without a response reports no status"""
+        requests_mock.post("https://api.test.com/test", exc=requests.ConnectionError("refused"))
+        hooks = RecordingHooks()
+        
+        with pytest.raises(ApiError):
+            make_client(hooks).post("/test")
+            
+        assert hooks.names() == ["start", "error"]
+        assert hooks.events[1][1].status is None
+        assert hooks.events[1][1].error.status == 0
+        
+    def test_invalid_body(self, requests_mock):
+        """Test that a body that can't be decoded reports the response and then the error"""
+        requests_mock.post("https://api.test.com/test", text="not json")
+        hooks = RecordingHooks()
+        
+        with pytest.raises(ApiError):
+            make_client(hooks).post("/test")
+            
+        assert hooks.names() == ["start", "response", "error"]
+        
+    def test_cache_hits_send_no_events(self, requests_mock):
+        """Test that only requests that reach the network are reported"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", json={"profile": {}})
+        hooks = RecordingHooks()
+        client = make_client(hooks, cache=ResponseCache(MemoryCache()))
+        
+        client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+        client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+        
+        assert hooks.names() == ["start", "response"]
+        
+    def test_several_hooks_and_partial_overrides(self, requests_mock):
+        """Test that every hook is called and unimplemented methods are no-ops"""
+        requests_mock.post("https://api.test.com/test", json={})
+        statuses = []
+        
+        class StatusHooks(RequestHooks):
+            def on_response(self, event):
+                statuses.append(event.status)
+                
+        recording = RecordingHooks()
+        make_client([StatusHooks(), recording]).post("/test")
+        
+        assert statuses == [200]
+        assert recording.names() == ["start", "response"]
+        
+    def test_stream(self, requests_mock):
+        """Test that streams report the response without a body size"""
+        requests_mock.post(
+            "https://api.test.com/stream",
+            headers={"Content-Type": "text/event-stream"},
+            content=b'event: done\ndata: {}\n\n'
+        )
+        hooks = RecordingHooks()
+        
+        events = list(make_client(hooks).stream("/stream"))
+        
+        assert [event.event for event in events] == ["done"]
+        assert hooks.names() == ["start", "response"]
+        assert hooks.events[1][1].response_size is None
+        assert "transfer" not in hooks.events[1][1].timings
+        
+    def test_connection_phases(self):
+        """Test that opening a connection is timed and reusing one is not"""
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+                
+            def log_message(self, *args):
+                pass
+                
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        hooks = RecordingHooks()
+        try:
+            with ApiClient(api_key="test-api-key", base_url=f"http://127.0.0.1:{httpd.server_address[1]}",
+                           hooks=hooks) as client:
+                client.post("/test")
+                client.post("/test")
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            
+        first, second = (event for name, event in hooks.events if name == "response")
+        assert first.timings["connect"] > 0
+        assert "connect" not in second.timings
+        assert "tls" not in first.timings
+        
+    def test_async_client(self):
+        """Test hooks on AsyncApiClient"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        responses = iter([httpx.Response(429, json={"message": "Slow down"}), httpx.Response(200, json={"a": 1})])
+        hooks = RecordingHooks()
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: next(responses))),
+            retry_policy=RetryPolicy(backoff_factor=0, jitter=False),
+            hooks=hooks
+        )
+        
+        assert asyncio.run(client.post("/test")) == {"a": 1}
+        
+        assert hooks.names() == ["start", "response", "retry", "start", "response"]
+        assert hooks.events[1][1].status == 429
+        assert {"ttfb", "transfer", "decode"} <= set(hooks.events[4][1].timings)
@@ -0,0 +1,165 @@
+"""
+Tests for checkpointed batch jobs in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import threading
+import pytest
+from .agent import B2BrilliantAgent
+from .exceptions import ApiError, ValidationError
+from .jobs import DONE, FAILED, BatchJob, JsonlJobStore, SQLiteJobStore, item_key
+from .profile import BusinessProfile
+
+URLS = [["https://a.com"], ["https://b.com"], ["https://c.com"], ["https://d.com"]]
+
+
+class FlakyDiscover:
+    """Fake discover call that fails for chosen URLs"""
+    
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self._lock = threading.Lock()
+        
+    def __call__(self, urls):
+        with self._lock:
+            self.calls.append(urls[0])
+        if urls[0] in self.failing:
+            raise ApiError("Service unavailable", 503, {"message": "Busy"})
+        return {"profile": {"name": urls[0]}}
+
+
+@pytest.fixture(params=["jsonl", "sqlite"])
+def path(request, tmp_path):
+    return str(tmp_path / f"job.{request.param}")
+
+
+class TestBatchJob:
+    """Test cases for BatchJob"""
+    
+    def test_resume_retries_only_failures(self, path):
+        """Test that a second run skips done items and retries failed ones"""
+        first = FlakyDiscover(failing={"https://b.com"})
+        with BatchJob(first, path) as job:
+            results = sorted(job.run(URLS))
+            
+        assert [result.ok for result in results] == [True, False, True, True]
+        assert results[1].error.status == 503
+        assert results[1].input == ["https://b.com"]
+        
+        second = FlakyDiscover()
+        with BatchJob(second, path) as job:
+            rerun = list(job.run(URLS))
+            
+            assert second.calls == ["https://b.com"]
+            assert job.skipped == 3
+            assert [(result.index, result.ok) for result in rerun] == [(1, True)]
+            assert job.store.counts() == {DONE: 4, FAILED: 0}
+            stored = sorted(job.results())
+            assert [result.result["profile"]["name"] for result in stored] == [urls[0] for urls in URLS]
+            
+    def test_results_kept_when_stopped_early(self, path):
+        """Test that finished calls are recorded even if the caller stops reading"""
+        discover = FlakyDiscover()
+        with BatchJob(discover, path, max_concurrency=1) as job:
+            for _ in job.run(URLS):
+                break
+                
+        with BatchJob(FlakyDiscover(), path) as job:
+            list(job.run(URLS))
+            assert job.skipped >= 1
+            assert job.skipped == len(discover.calls)
+            
+    def test_retry_failed_off(self, path):
+        """Test that failures can be left alone on a rerun"""
+        with BatchJob(FlakyDiscover(failing={"https://a.com"}), path) as job:
+            list(job.run(URLS))
+            
+        discover = FlakyDiscover()
+        with BatchJob(discover, path, retry_failed=False) as job:
+            assert list(job.run(URLS)) == []
+            failed = [result for result in job.results() if not result.ok]
+            
+        assert discover.calls == []
+        assert isinstance(failed[0].error, ApiError)
+        assert failed[0].error.data == {"message": "Busy"}
+        
+    def test_validation_errors_round_trip(self, path):
+        """Test that validation errors are stored and rebuilt"""
+        def invalid(urls):
+            raise ValidationError("URLs must be a non-empty list", {"urls": "Must be a non-empty list"})
+            
+        with BatchJob(invalid, path) as job:
+            list(job.run([[]]))
+            (result,) = job.results()
+            
+        assert isinstance(result.error, ValidationError)
+        assert result.error.validation_errors == {"urls": "Must be a non-empty list"}
+        
+    def test_other_exceptions_are_not_recorded(self, path):
+        """Test that unexpected exceptions propagate and leave the item to run again"""
+        def broken(urls):
+            raise RuntimeError("bug")
+            
+        with BatchJob(broken, path) as job:
+            with pytest.raises(RuntimeError):
+                list(job.run(URLS[:1]))
+            assert job.store.status(item_key(URLS[0])) is None
+            
+    def test_async(self, path):
+        """Test run_async"""
+        async def discover(urls):
+            return BusinessProfile(profile={"name": urls[0]})
+            
+        async def run():
+            with BatchJob(discover, path) as job:
+                return [result async for result in job.run_async(URLS)], list(job.results())
+                
+        results, stored = asyncio.run(run())
+        
+        assert len(results) == 4
+        assert isinstance(results[0].result, BusinessProfile)
+        assert sorted(result.result["profile"]["name"] for result in stored) == [urls[0] for urls in URLS]
+        
+    def test_with_agent(self, requests_mock, path):
+        """Test a checkpointed discover run through the agent"""
+        requests_mock.post(
+            "https://api.test.com/api/v1/business/discover",
+            json=lambda request, context: {"profile": {"name": request.json()["urls"][0]}}
+        )
+        agent = B2BrilliantAgent(api_key="test-api-key", base_url="https://api.test.com")
+        
+        with BatchJob(lambda urls: agent.business.discover(urls), path) as job:
+            list(job.run(URLS))
+        with BatchJob(lambda urls: agent.business.discover(urls), path) as job:
+            list(job.run(URLS))
+            
+        assert requests_mock.call_count == 4
+
+
+class TestJsonlJobStore:
+    """Test cases for the JSON Lines store"""
+    
+    def test_torn_last_line_is_dropped(self, tmp_path):
+        """Test that a record cut off by a crash is discarded on reopening"""
+        path = str(tmp_path / "job.jsonl")
+        with BatchJob(FlakyDiscover(), path) as job:
+            list(job.run(URLS[:2]))
+        with open(path, "ab") as f:
+            f.write(b'{"key": "abc", "index": 2, "inp')
+            
+        with JsonlJobStore(path) as store:
+            assert store.counts() == {DONE: 2, FAILED: 0}
+        with BatchJob(FlakyDiscover(), path) as job:
+            assert len(list(job.run(URLS))) == 2
+            
+        with open(path, "rb") as f:
+            lines = f.read().split(b"\n")
+        assert len(lines) == 5 and lines[-1] == b""
+        
+    def test_store_types(self, tmp_path):
+        """Test that the file extension picks the store"""
+        with BatchJob(FlakyDiscover(), str(tmp_path / "a.jsonl")) as job:
+            assert isinstance(job.store, JsonlJobStore)
+        with BatchJob(FlakyDiscover(), str(tmp_path / "a.db")) as job:
+            assert isinstance(job.store, SQLiteJobStore)
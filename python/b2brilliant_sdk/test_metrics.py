@@ -0,0 +1,194 @@
+"""
+Tests for the request metrics registry in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import pytest
+import requests
+from .agent import B2BrilliantAgent
+from .api_client import ApiClient
+from .exceptions import ApiError
+from .hooks import RequestEvent, RequestHooks
+from .metrics import MetricsRegistry
+from .retry import RetryPolicy
+
+DISCOVER = "/api/v1/business/discover"
+
+
+def event(endpoint="/test", status=None, request_size=None, response_size=None, timings=None, error=None):
+    return RequestEvent(endpoint, 1, status, request_size, response_size, timings or {}, error, None)
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry"""
+    
+    def test_counts_and_latency(self):
+        """Test counters, the in-flight gauge and the latency histogram"""
+        registry = MetricsRegistry(buckets=(0.5, 1))
+        
+        registry.on_request_start(event(request_size=10))
+        assert registry.snapshot()["/test"]["in_flight"] == 1
+        registry.on_response(event(status=200, response_size=40,
+                                   timings={"rate_limit": 5, "ttfb": 0.5, "transfer": 0.25}))
+        
+        metrics = registry.snapshot()["/test"]
+        assert metrics["requests"] == 1
+        assert metrics["in_flight"] == 0
+        assert metrics["responses"] == {200: 1}
+        assert metrics["bytes_sent"] == 10
+        assert metrics["bytes_received"] == 40
+        assert metrics["latency"] == {"count": 1, "sum": 0.75, "buckets": {0.5: 0, 1: 1, float("inf"): 1}}
+        
+    def test_known_endpoints_reported_before_use(self):
+        """Test that every API endpoint is in the snapshot from the start"""
+        snapshot = MetricsRegistry().snapshot()
+        
+        assert snapshot[DISCOVER]["requests"] == 0
+        assert "/api/v1/campaigns/create" in snapshot
+        
+    def test_network_errors_leave_no_request_in_flight(self):
+        """Test that attempts without a response are ended by on_retry and on_error"""
+        registry = MetricsRegistry()
+        error = ApiError("refused", 0)
+        
+        registry.on_request_start(event())
+        registry.on_retry(event(error=error))
+        registry.on_request_start(event())
+        registry.on_error(event(error=error))
+        
+        metrics = registry.snapshot()["/test"]
+        assert metrics["requests"] == 2
+        assert metrics["retries"] == 1
+        assert metrics["errors"] == {0: 1}
+        assert metrics["in_flight"] == 0
+        
+    def test_prometheus(self):
+        """Test the Prometheus text exposition format"""
+        registry = MetricsRegistry(buckets=(1,), endpoints=())
+        registry.on_request_start(event(endpoint='/a"b', request_size=3))
+        registry.on_response(event(endpoint='/a"b', status=404, response_size=2, timings={"ttfb": 0.5}))
+        registry.on_error(event(endpoint='/a"b', status=404, error=ApiError("Not found", 404)))
+        
+        text = registry.prometheus()
+        
+        assert text.endswith("\n")
+        assert "# TYPE b2brilliant_requests_total counter\n" in text
+        assert "# TYPE b2brilliant_in_flight_requests gauge\n" in text
+        assert 'b2brilliant_requests_total{endpoint="/a\\"b"} 1\n' in text
+        assert 'b2brilliant_responses_total{endpoint="/a\\"b",status="404"} 1\n' in text
+        assert 'b2brilliant_errors_total{endpoint="/a\\"b",status="404"} 1\n' in text
+        assert 'b2brilliant_sent_bytes_total{endpoint="/a\\"b"} 3\n' in text
+        assert 'b2brilliant_request_duration_seconds_bucket{endpoint="/a\\"b",le="1.0"} 1\n' in text
+        assert 'b2brilliant_request_duration_seconds_bucket{endpoint="/a\\"b",le="+Inf"} 1\n' in text
+        assert 'b2brilliant_request_duration_seconds_sum{endpoint="/a\\"b"} 0.5\n' in text
+        assert 'b2brilliant_request_duration_seconds_count{endpoint="/a\\"b"} 1\n' in text
+
+
+class TestClientMetrics:
+    """Test cases for metrics collected by the clients"""
+    
+    def test_agent_metrics(self, requests_mock):
+        """Test that an agent created with metrics=True records its requests"""
+        requests_mock.post(f"https://api.test.com{DISCOVER}", json={"profile": {"name": "Target"}})
+        agent = B2BrilliantAgent(api_key="test-api-key", base_url="https://api.test.com", metrics=True)
+        
+        agent.business.discover(["https://target.com"])
+        
+        metrics = agent.metrics.snapshot()[DISCOVER]
+        assert metrics["requests"] == 1
+        assert metrics["responses"] == {200: 1}
+        assert metrics["bytes_sent"] == len(requests_mock.last_request.body)
+        assert metrics["bytes_received"] == len(b'{"profile": {"name": "Target"}}')
+        assert metrics["latency"]["count"] == 1
+        assert B2BrilliantAgent(api_key="test-api-key").metrics is None
+        
+    def test_retries_and_errors(self, requests_mock):
+        """Test that retried attempts and final errors are counted by status"""
+        requests_mock.post("https://api.test.com/test", [
+            {"status_code": 503, "json": {"message": "Busy"}},
+            {"exc": requests.ConnectionError("refused")},
+            {"status_code": 400, "json": {"message": "Bad"}}
+        ])
+        registry = MetricsRegistry()
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", metrics=registry,
+                           retry_policy=RetryPolicy(backoff_factor=0, jitter=False))
+        
+        with pytest.raises(ApiError):
+            client.post("/test")
+            
+        metrics = registry.snapshot()["/test"]
+        assert metrics["requests"] == 3
+        assert metrics["retries"] == 2
+        assert metrics["responses"] == {503: 1, 400: 1}
+        assert metrics["errors"] == {400: 1}
+        assert metrics["in_flight"] == 0
+        
+    def test_in_flight_and_other_hooks(self, requests_mock):
+        """Test that the registry runs after the other hooks and sees the attempt in flight"""
+        requests_mock.post("https://api.test.com/test", json={})
+        registry = MetricsRegistry()
+        in_flight = []
+        
+        class Probe(RequestHooks):
+            def on_response(self, event):
+                in_flight.append(registry.snapshot()["/test"]["in_flight"])
+                
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com",
+                           hooks=Probe(), metrics=registry)
+        client.post("/test")
+        
+        assert in_flight == [1]
+        assert client.hooks[-1] is registry
+        
+    def test_async_client(self):
+        """Test metrics through AsyncApiClient"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json={"a": 1})
+            )),
+            metrics=True
+        )
+        
+        asyncio.run(client.post("/test"))
+        
+        metrics = client.metrics.snapshot()["/test"]
+        assert metrics["requests"] == 1
+        assert metrics["responses"] == {200: 1}
+        assert metrics["latency"]["count"] == 1
+        
+    def test_cancelled_attempt_leaves_no_request_in_flight(self):
+        """Test that an attempt cancelled before its response ends in on_abandon"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        async def handler(request):
+            await asyncio.sleep(5)
+            return httpx.Response(200, json={})
+            
+        abandoned = []
+        hooks = RequestHooks()
+        hooks.on_abandon = abandoned.append
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            hooks=hooks,
+            metrics=True
+        )
+        
+        async def run():
+            task = asyncio.ensure_future(client.post(DISCOVER))
+            await asyncio.sleep(0.05)
+            assert client.metrics.snapshot()[DISCOVER]["in_flight"] == 1
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            
+        asyncio.run(run())
+        
+        assert client.metrics.snapshot()[DISCOVER]["in_flight"] == 0
+        assert [e.status for e in abandoned] == [None]
@@ -0,0 +1,206 @@
+"""
+Tests for compact response models in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import copy
+import json
+import pickle
+import pytest
+from .agent import B2BrilliantAgent
+from .api_client import ApiClient
+from .cache import MemoryCache, ResponseCache
+from .codec import JsonCodec
+from .exceptions import ApiError
+from .models import BusinessModel, CampaignModel, CompatibilityModel
+
+BUSINESS = {
+    "profile": {"name": "Target Co", "services": ["roasting", "delivery"]},
+    "contacts": {"email": "hi@target.com", "social": []},
+    "confidence": {"score": 8.5, "reasoning": "Clear website"},
+    "extra": {"note": "not a declared field"}
+}
+SCORE = {
+    "target_business": "Target Co",
+    "user_business": "User Co",
+    "score": 7.5,
+    "reasoning": {"positives": ["Same market"], "negatives": [], "recommendations": []}
+}
+
+
+class CountingCodec(JsonCodec):
+    """Codec that counts how often it decodes"""
+    
+    def __init__(self):
+        self.loads_calls = 0
+        
+    def loads(self, data):
+        self.loads_calls += 1
+        return super().loads(data)
+
+
+def encode(data):
+    return json.dumps(data).encode("utf-8")
+
+
+class TestResponseModels:
+    """Test cases for the response model classes"""
+    
+    def test_scalars_eager_nested_fields_on_demand(self):
+        """Test that only reading a nested field decodes it, and only once"""
+        codec = CountingCodec()
+        model = CompatibilityModel(encode(SCORE), codec)
+        
+        assert model.score == 7.5
+        assert model.target_business == "Target Co"
+        assert codec.loads_calls == 1
+        
+        assert model.reasoning["positives"] == ["Same market"]
+        assert model.reasoning["negatives"] == []
+        assert codec.loads_calls == 2
+        
+    def test_compact(self):
+        """Test that models have no per-instance dict and share key tuples"""
+        first = BusinessModel(encode(BUSINESS))
+        second = BusinessModel(encode(BUSINESS))
+        
+        assert not hasattr(first, "__dict__")
+        assert first._keys is second._keys
+        
+    def test_reads_like_a_mapping(self):
+        """Test dict-style access to declared and undeclared fields"""
+        model = BusinessModel(encode(BUSINESS))
+        
+        assert model == BUSINESS
+        assert BUSINESS == model
+        assert list(model) == list(BUSINESS)
+        assert len(model) == 4
+        assert model["profile"]["name"] == "Target Co"
+        assert model["extra"] == {"note": "not a declared field"}
+        assert model.get("branding") is None
+        assert model.branding is None
+        assert "branding" not in model
+        with pytest.raises(KeyError):
+            model["branding"]
+            
+    def test_immutable(self):
+        """Test that decoded fields are read-only"""
+        model = BusinessModel(encode(BUSINESS))
+        
+        with pytest.raises(TypeError):
+            model.profile["name"] = "Other"
+        with pytest.raises(AttributeError):
+            model.profile = {}
+            
+        editable = model.to_dict()
+        editable["profile"]["name"] = "Other"
+        assert model.profile["name"] == "Target Co"
+        
+    def test_invalid_body(self):
+        """Test that bodies that are not JSON objects are rejected"""
+        with pytest.raises(ValueError):
+            CampaignModel(b"not json")
+        with pytest.raises(ValueError):
+            CampaignModel(b"[1, 2]")
+            
+    def test_copy_pickle_and_hash(self):
+        """Test copying, pickling and hashing"""
+        model = CompatibilityModel(encode(SCORE))
+        
+        assert copy.deepcopy(model) is model
+        restored = pickle.loads(pickle.dumps(model))
+        assert isinstance(restored, CompatibilityModel)
+        assert restored == model
+        assert restored.json_bytes == model.json_bytes
+        assert len({model, CompatibilityModel(json.dumps(SCORE, indent=2).encode())}) == 1
+
+
+class TestClientResponseModels:
+    """Test cases for response_models in the clients"""
+    
+    def test_models_returned_and_sent_back(self, requests_mock):
+        """Test that services return models and splice them into later requests"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", content=encode(BUSINESS))
+        requests_mock.post("https://api.test.com/api/v1/business/compatibility", content=encode(SCORE))
+        agent = B2BrilliantAgent(api_key="test-api-key", base_url="https://api.test.com",
+                                 response_models=True)
+        
+        target = agent.business.discover(["https://target.com"])
+        score = agent.business.compatibility({"profile": {"name": "User Co"}}, target)
+        
+        assert isinstance(target, BusinessModel)
+        assert isinstance(score, CompatibilityModel)
+        assert score.score == 7.5
+        assert target.json_bytes in requests_mock.last_request.body
+        assert requests_mock.last_request.json()["targetBusiness"] == BUSINESS
+        
+    def test_off_by_default(self, requests_mock):
+        """Test that plain dicts are returned unless models are requested"""
+        requests_mock.post("https://api.test.com/test", json={"score": 1})
+        requests_mock.post("https://api.test.com/api/v1/business/compatibility", json=SCORE)
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com")
+        custom = ApiClient(api_key="test-api-key", base_url="https://api.test.com",
+                           response_models={"/test": CompatibilityModel})
+        
+        assert type(client.post("/api/v1/business/compatibility")) is dict
+        assert isinstance(custom.post("/test"), CompatibilityModel)
+        assert type(custom.post("/api/v1/business/compatibility")) is dict
+        
+    def test_invalid_body_is_network_error(self, requests_mock):
+        """Test that undecodable bodies raise a status 0 ApiError as before"""
+        requests_mock.post("https://api.test.com/api/v1/business/compatibility", text="[]")
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com", response_models=True)
+        
+        with pytest.raises(ApiError) as exc_info:
+            client.post("/api/v1/business/compatibility", {})
+            
+        assert exc_info.value.status == 0
+        
+    def test_cached_models(self, requests_mock):
+        """Test that cached responses come back as models"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", content=encode(BUSINESS))
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com",
+                           response_models=True, cache=ResponseCache(MemoryCache()))
+        payload = {"urls": ["https://target.com"]}
+        
+        first = client.post("/api/v1/business/discover", payload)
+        second = client.post("/api/v1/business/discover", payload)
+        
+        assert requests_mock.call_count == 1
+        assert isinstance(second, BusinessModel)
+        assert second == first == BUSINESS
+        
+    def test_compatibility_many_ranks_models(self, requests_mock):
+        """Test that top-k selection reads scores from models"""
+        scores = iter([3, 9, 6])
+        requests_mock.post(
+            "https://api.test.com/api/v1/business/compatibility",
+            content=lambda request, context: encode(dict(SCORE, score=next(scores)))
+        )
+        agent = B2BrilliantAgent(api_key="test-api-key", base_url="https://api.test.com",
+                                 response_models=True)
+        targets = [{"profile": {"name": name}} for name in ("a", "b", "c")]
+        
+        top = agent.business.compatibility_many({"profile": {"name": "User Co"}}, targets, top_k=2,
+                                                max_concurrency=1)
+        
+        assert [result.result.score for result in top.top] == [9, 6]
+        
+    def test_async_client(self):
+        """Test response models through AsyncApiClient"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=encode(SCORE))
+            )),
+            response_models=True
+        )
+        
+        result = asyncio.run(client.post("/api/v1/business/compatibility", {}))
+        
+        assert isinstance(result, CompatibilityModel)
+        assert result.score == 7.5
@@ -0,0 +1,170 @@
+"""
+Tests for the prospecting pipeline in the B2B Campaign Agent SDK
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from .exceptions import ApiError
+from .pipeline import ProspectingPipeline, ProspectResult
+from .profile import BusinessProfile
+
+USER = BusinessProfile({"profile": {"name": "User Co"}})
+
+
+class FakeAgent:
+    """Agent stand-in whose calls record what they were given"""
+    
+    def __init__(self, scores=None, discover_delay=0, fail=None):
+        self.scores = scores or {}
+        self.discover_delay = discover_delay
+        self.fail = fail or {}
+        self.calls = []
+        self.in_flight = 0
+        self.peak_discover = 0
+        self._lock = threading.Lock()
+        self.user = SimpleNamespace(discover=self._discover_user)
+        self.business = SimpleNamespace(discover=self._discover, compatibility=self._compatibility)
+        self.campaigns = SimpleNamespace(create=self._create)
+        
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+            
+    def _discover_user(self, urls, options=None):
+        self._record("user", tuple(urls))
+        return USER
+        
+    def _discover(self, urls, options=None):
+        self._record("discover", urls[0])
+        with self._lock:
+            self.in_flight += 1
+            self.peak_discover = max(self.peak_discover, self.in_flight)
+        try:
+            time.sleep(self.discover_delay)
+            if self.fail.get(urls[0]) == "discover":
+                raise ApiError("Not found", 404)
+            return {"profile": {"name": urls[0]}}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                
+    def _compatibility(self, user_business, target_business):
+        name = target_business["profile"]["name"]
+        self._record("compatibility", name, user_business is USER)
+        if self.fail.get(name) == "compatibility":
+            raise RuntimeError("bug")
+        return {"score": self.scores.get(name, 8)}
+        
+    def _create(self, user_business, target_business, campaign_types=None):
+        name = target_business["profile"]["name"]
+        self._record("create", name, campaign_types)
+        if self.fail.get(name) == "campaigns":
+            raise ApiError("Rate limited", 429)
+        return {"campaigns": [{"type": "email", "content": f"Hi {name}"}]}
+
+
+class TestProspectingPipeline:
+    """Test cases for ProspectingPipeline class"""
+    
+    def test_end_to_end(self):
+        """Test that qualified targets get campaigns and the rest stop after scoring"""
+        agent = FakeAgent(scores={"b.com": 3})
+        pipeline = ProspectingPipeline(agent, USER, min_score=7, campaign_types="email")
+        
+        results = sorted(pipeline.run([["a.com"], ["b.com"], ["c.com"]]), key=lambda r: r.index)
+        
+        assert [r.urls for r in results] == [["a.com"], ["b.com"], ["c.com"]]
+        assert all(r.ok for r in results)
+        assert [r.qualified for r in results] == [True, False, True]
+        assert results[0].campaigns == {"campaigns": [{"type": "email", "content": "Hi a.com"}]}
+        assert results[1].compatibility == {"score": 3}
+        assert ("create", "a.com", "email") in agent.calls
+        # The same user business object is reused for every call
+        assert all(call[2] for call in agent.calls if call[0] == "compatibility")
+        
+    def test_errors_are_captured_per_target(self):
+        """Test that API errors stop only the affected target"""
+        agent = FakeAgent(fail={"a.com": "discover", "b.com": "campaigns"})
+        pipeline = ProspectingPipeline(agent, USER)
+        
+        results = {r.urls[0]: r for r in pipeline.run([["a.com"], ["b.com"], ["c.com"]])}
+        
+        assert results["a.com"].stage == "discover"
+        assert results["a.com"].error.status == 404
+        assert results["a.com"].target_business is None
+        assert results["b.com"].stage == "campaigns"
+        assert results["b.com"].compatibility == {"score": 8}
+        assert not results["b.com"].qualified
+        assert results["c.com"].ok and results["c.com"].qualified
+        
+    def test_unexpected_errors_propagate(self):
+        """Test that non-API exceptions stop the run"""
+        agent = FakeAgent(fail={"a.com": "compatibility"})
+        pipeline = ProspectingPipeline(agent, USER)
+        
+        with pytest.raises(RuntimeError):
+            list(pipeline.run([["a.com"], ["b.com"]]))
+            
+    def test_custom_qualify(self):
+        """Test a custom qualification rule"""
+        agent = FakeAgent(scores={"a.com": 2})
+        pipeline = ProspectingPipeline(agent, USER, qualify=lambda c: c["score"] < 5)
+        
+        results = {r.urls[0]: r for r in pipeline.run([["a.com"], ["b.com"]])}
+        
+        assert results["a.com"].qualified
+        assert not results["b.com"].qualified
+        
+    def test_stage_concurrency_and_streaming(self):
+        """Test that discover concurrency is bounded and results stream out early"""
+        agent = FakeAgent(discover_delay=0.05)
+        pipeline = ProspectingPipeline(agent, USER, discover_concurrency=3)
+        targets = [[f"t{i}.com"] for i in range(12)]
+        
+        stream = pipeline.run(targets)
+        first = next(stream)
+        discovered_before_first = sum(1 for call in agent.calls if call[0] == "discover")
+        rest = list(stream)
+        
+        assert isinstance(first, ProspectResult)
+        assert discovered_before_first < len(targets)
+        assert len(rest) == len(targets) - 1
+        assert agent.peak_discover == 3
+        
+    def test_backpressure_and_early_exit(self):
+        """Test that a consumer that stops reading stops the input from being drained"""
+        agent = FakeAgent()
+        pipeline = ProspectingPipeline(agent, USER, discover_concurrency=1,
+                                       compatibility_concurrency=1, campaign_concurrency=1,
+                                       queue_size=1)
+        consumed = []
+        
+        def targets():
+            for i in range(1000):
+                consumed.append(i)
+                yield [f"t{i}.com"]
+                
+        stream = pipeline.run(targets())
+        next(stream)
+        time.sleep(0.2)
+        stream.close()
+        
+        assert len(consumed) < 20
+        
+    def test_for_user_discovers_once(self):
+        """Test that the user business is discovered once up front"""
+        agent = FakeAgent()
+        
+        pipeline = ProspectingPipeline.for_user(agent, ["https://me.com"], campaign_concurrency=2)
+        
+        assert pipeline.user_business is USER
+        assert agent.calls == [("user", ("https://me.com",))]
+        assert len(list(pipeline.run([["a.com"], ["b.com"]]))) == 2
+        assert [call[0] for call in agent.calls].count("user") == 1
+        
+    def test_invalid_concurrency(self):
+        """Test argument validation"""
+        with pytest.raises(ValueError):
+            ProspectingPipeline(FakeAgent(), USER, campaign_concurrency=0)
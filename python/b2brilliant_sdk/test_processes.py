@@ -0,0 +1,162 @@
+"""
+Tests for process-pool batch runs and process-shared state in the B2B Campaign Agent SDK
+"""
+
+import pickle
+import time
+import pytest
+from .agent import B2BrilliantAgent
+from .cache import MemoryCache, ResponseCache, SQLiteCache
+from .endpoints import BUSINESS_ENDPOINTS
+from .exceptions import ApiError
+from .fake_server import FakeRoute, FakeServer
+from .rate_limit import RateLimiter, SQLiteTokenBucket, TokenBucket
+from .retry import RetryPolicy
+
+DISCOVER = BUSINESS_ENDPOINTS["DISCOVER"]
+
+
+def discover_name(agent, urls):
+    """Worker function: discover a business and return its name"""
+    return agent.business.discover(urls)["profile"]["name"]
+
+
+def discover_time(agent, urls):
+    """Worker function: discover a business and return when it finished"""
+    agent.business.discover(urls)
+    return time.time()
+
+
+class TestSQLiteTokenBucket:
+    """Test cases for SQLiteTokenBucket"""
+    
+    def test_instances_share_the_budget(self, tmp_path, clock):
+        """Test that buckets on the same file and name draw from one budget"""
+        path = str(tmp_path / "limits.db")
+        first = SQLiteTokenBucket(path, rate=2, burst=2, clock=clock)
+        second = SQLiteTokenBucket(path, rate=2, burst=2, clock=clock)
+        other = SQLiteTokenBucket(path, rate=2, burst=2, name="other", clock=clock)
+        
+        assert first.reserve() == 0
+        assert second.reserve() == 0
+        assert first.reserve() == pytest.approx(0.5)
+        assert second.reserve() == pytest.approx(1.0)
+        assert other.reserve() == 0
+        
+        clock.now += 1.5
+        assert first.reserve() == 0
+        
+    def test_pickled_bucket_keeps_sharing(self, tmp_path, clock):
+        """Test that a pickled bucket reconnects to the same budget"""
+        bucket = SQLiteTokenBucket(str(tmp_path / "limits.db"), rate=1, burst=1, clock=clock)
+        bucket.reserve()
+        
+        copy = pickle.loads(pickle.dumps(bucket))
+        
+        assert copy.reserve() == pytest.approx(1.0)
+        bucket.close()
+        copy.close()
+        
+    def test_rate_limiter_with_path(self, tmp_path):
+        """Test that a RateLimiter with a path builds shared buckets and pickles"""
+        limiter = RateLimiter.per_endpoint(5, 10, path=str(tmp_path / "limits.db"))
+        
+        assert isinstance(limiter.bucket(DISCOVER), SQLiteTokenBucket)
+        assert limiter.bucket(DISCOVER).name == DISCOVER
+        assert pickle.loads(pickle.dumps(limiter)).bucket(DISCOVER).path == limiter.path
+        
+    def test_in_memory_state_is_not_pickled(self):
+        """Test that in-memory buckets, limiters and caches refuse to be copied"""
+        with pytest.raises(TypeError):
+            pickle.dumps(TokenBucket(1))
+        with pytest.raises(TypeError):
+            pickle.dumps(RateLimiter(default=(1, 1)))
+        with pytest.raises(TypeError):
+            pickle.dumps(ResponseCache(MemoryCache()))
+            
+    def test_sqlite_cache_pickles(self, tmp_path):
+        """Test that a pickled SQLite-backed cache sees the same entries"""
+        cache = ResponseCache(SQLiteCache(str(tmp_path / "cache.db")))
+        cache.set(DISCOVER, {"urls": ["https://acme.com"]}, {"name": "Acme"})
+        
+        copy = pickle.loads(pickle.dumps(cache))
+        
+        assert copy.get(DISCOVER, {"urls": ["http://www.acme.com"]}) == {"name": "Acme"}
+        assert copy.stats()["hits"] == 1
+
+
+class TestAgentRunBatch:
+    """Test cases for B2BrilliantAgent.run_batch"""
+    
+    def test_threads(self):
+        """Test the thread backend with the agent itself"""
+        with FakeServer() as server:
+            agent = B2BrilliantAgent(api_key="test-api-key", base_url=server.url)
+            results = list(agent.run_batch(discover_name, [["https://acme.com"], ["https://globex.com"]]))
+            
+        assert [r.index for r in results] == [0, 1]
+        assert all(r.ok for r in results)
+        assert server.calls[(DISCOVER, 200)] == 2
+        
+    def test_processes_share_cache_and_rate_limit(self, tmp_path):
+        """Test that worker processes use the shared cache and one rate budget"""
+        with FakeServer() as server:
+            agent = B2BrilliantAgent(
+                api_key="test-api-key",
+                base_url=server.url,
+                cache=ResponseCache(SQLiteCache(str(tmp_path / "cache.db"))),
+                rate_limiter=RateLimiter.per_endpoint(10, 1, path=str(tmp_path / "limits.db"))
+            )
+            cached = agent.business.discover(["https://acme.com"])["profile"]["name"]
+            
+            names = [r.result for r in agent.run_batch(
+                discover_name,
+                [["http://www.acme.com/"], ["https://acme.com?utm_source=ad"]],
+                max_concurrency=2,
+                backend="processes"
+            )]
+            assert names == [cached, cached]
+            assert server.calls[(DISCOVER, 200)] == 1
+            
+            finished = sorted(r.result for r in agent.run_batch(
+                discover_time,
+                [[f"https://target-{n}.com"] for n in range(5)],
+                max_concurrency=2,
+                backend="processes"
+            ))
+            
+        # Five requests at 10 per second across both workers
+        assert finished[-1] - finished[0] >= 0.3
+        assert server.calls[(DISCOVER, 200)] == 6
+        
+    def test_processes_capture_api_errors(self):
+        """Test that SDK errors raised in a worker come back on their item"""
+        with FakeServer(FakeRoute(error_rate=1, error_status=500)) as server:
+            agent = B2BrilliantAgent(
+                api_key="test-api-key",
+                base_url=server.url,
+                retry_policy=RetryPolicy(max_attempts=1)
+            )
+            results = list(agent.run_batch(discover_name, [["https://acme.com"]], 1, backend="processes"))
+            
+        assert isinstance(results[0].error, ApiError)
+        assert results[0].error.status == 500
+        
+    @pytest.mark.parametrize("backend", ["threads", "processes"])
+    def test_options_are_validated_by_the_call(self, backend):
+        """Test that bad options raise before the result is iterated"""
+        agent = B2BrilliantAgent(api_key="test-api-key")
+        
+        with pytest.raises(ValueError, match="max_concurrency"):
+            agent.run_batch(discover_name, [["https://acme.com"]], max_concurrency=0, backend=backend)
+            
+    def test_processes_reject_in_memory_state(self):
+        """Test that options that would not be shared fail before any work starts"""
+        agent = B2BrilliantAgent(api_key="test-api-key", rate_limiter=RateLimiter.per_endpoint(5))
+        
+        with pytest.raises(ValueError, match="SQLiteTokenBucket"):
+            agent.run_batch(discover_name, [["https://acme.com"]], backend="processes")
+        with pytest.raises(ValueError):
+            agent.run_batch(discover_name, [["https://acme.com"]], max_concurrency=0, backend="processes")
+        with pytest.raises(ValueError):
+            agent.run_batch(discover_name, [], backend="fibers")
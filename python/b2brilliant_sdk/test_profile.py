@@ -0,0 +1,148 @@
+"""
+Tests for immutable business profiles in the B2B Campaign Agent SDK
+"""
+
+import copy
+import json
+import pickle
+from unittest.mock import Mock
+import pytest
+from .agent import B2BrilliantAgent
+from .business import BusinessService
+from .codec import JsonCodec
+from .coalesce import request_key
+from .profile import BusinessProfile, encode_payload
+
+DATA = {
+    "profile": {"name": "Café Co", "services": ["roasting", "delivery"]},
+    "contacts": {"email": None, "social": []},
+    "score": 1.5
+}
+
+
+class TestBusinessProfile:
+    """Test cases for BusinessProfile class"""
+    
+    def test_reads_like_a_dict(self):
+        """Test that a profile compares and reads like the data it wraps"""
+        profile = BusinessProfile(DATA)
+        
+        assert profile == DATA
+        assert isinstance(profile, dict)
+        assert profile["profile"]["services"][1] == "delivery"
+        assert json.loads(json.dumps(profile)) == DATA
+        
+    def test_immutable(self):
+        """Test that the profile and everything nested in it are read-only"""
+        profile = BusinessProfile(DATA)
+        
+        with pytest.raises(TypeError):
+            profile["score"] = 2
+        with pytest.raises(TypeError):
+            profile.update(score=2)
+        with pytest.raises(TypeError):
+            profile["profile"]["name"] = "Other"
+        with pytest.raises(TypeError):
+            profile["profile"]["services"].append("catering")
+            
+        assert profile == DATA
+        
+    def test_copies_its_input(self):
+        """Test that later changes to the source data do not leak into the profile"""
+        data = copy.deepcopy(DATA)
+        profile = BusinessProfile(data)
+        
+        data["profile"]["services"].append("catering")
+        
+        assert profile["profile"]["services"] == ["roasting", "delivery"]
+        
+    def test_cached_bytes_and_hash(self):
+        """Test that the encoding and hash are computed once and match the content"""
+        profile = BusinessProfile(DATA)
+        
+        assert json.loads(profile.json_bytes) == DATA
+        assert profile.json_bytes is profile.json_bytes
+        assert profile.content_hash == BusinessProfile(dict(reversed(DATA.items()))).content_hash
+        assert profile.content_hash != BusinessProfile(DATA, score=2).content_hash
+        assert len({profile, BusinessProfile(DATA)}) == 1
+        
+    def test_of(self):
+        """Test wrapping only what is not already a profile"""
+        profile = BusinessProfile(DATA)
+        
+        assert BusinessProfile.of(profile) is profile
+        assert isinstance(BusinessProfile.of(DATA), BusinessProfile)
+        assert BusinessProfile.of(None) is None
+        
+    def test_to_dict_and_copies(self):
+        """Test getting editable data back and copying a profile"""
+        profile = BusinessProfile(DATA)
+        
+        editable = profile.to_dict()
+        editable["profile"]["services"].append("catering")
+        
+        assert type(editable["profile"]["services"]) is list
+        assert profile["profile"]["services"] == ["roasting", "delivery"]
+        assert copy.deepcopy(profile) is profile
+        
+        restored = pickle.loads(pickle.dumps(profile))
+        assert isinstance(restored, BusinessProfile)
+        assert restored == DATA
+        
+    def test_encode_payload_splices_cached_bytes(self):
+        """Test that profiles are not encoded again by the client codec"""
+        class RecordingCodec(JsonCodec):
+            def __init__(self):
+                self.encoded = []
+                
+            def dumps(self, obj):
+                self.encoded.append(obj)
+                return super().dumps(obj)
+                
+        profile = BusinessProfile(DATA)
+        codec = RecordingCodec()
+        
+        body = encode_payload(codec, {"userBusiness": profile, "additionalInfo": "Now vegan"})
+        
+        assert json.loads(body) == {"userBusiness": DATA, "additionalInfo": "Now vegan"}
+        assert profile not in codec.encoded
+        assert encode_payload(codec, {"a": 1}) == b'{"a":1}'
+        
+    def test_request_key_uses_content_hash(self):
+        """Test that equal profiles coalesce like equal dicts"""
+        assert request_key("/x", {"u": BusinessProfile(DATA)}) == request_key(
+            "/x", {"u": BusinessProfile(copy.deepcopy(DATA))}
+        )
+        assert request_key("/x", {"u": BusinessProfile(DATA)}) != request_key(
+            "/x", {"u": BusinessProfile(DATA, score=2)}
+        )
+
+
+class TestServicesUseProfiles:
+    """Test cases for profiles returned and sent by the services"""
+    
+    def test_discover_and_refine_return_profiles(self):
+        """Test that discover and refine wrap their results"""
+        api_client = Mock()
+        api_client.post.return_value = DATA
+        service = BusinessService(api_client)
+        
+        discovered = service.discover(["https://example.com"])
+        refined = service.refine(discovered, "More info")
+        
+        assert isinstance(discovered, BusinessProfile)
+        assert isinstance(refined, BusinessProfile)
+        assert api_client.post.call_args[0][1]["businessData"] is discovered
+        
+    def test_profiles_sent_through_the_client(self, requests_mock):
+        """Test that a discovered profile is sent back byte for byte"""
+        requests_mock.post("https://api.test.com/api/v1/user/discover", json=DATA)
+        requests_mock.post("https://api.test.com/api/v1/business/compatibility", json={"score": 8})
+        agent = B2BrilliantAgent(api_key="test-api-key", base_url="https://api.test.com")
+        
+        user = agent.user.discover(["https://me.com"])
+        agent.business.compatibility(user, {"profile": {"name": "Target"}})
+        
+        body = requests_mock.last_request.body
+        assert user.json_bytes in body
+        assert json.loads(body) == {"userBusiness": DATA, "targetBusiness": {"profile": {"name": "Target"}}}
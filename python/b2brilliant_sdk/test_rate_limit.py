@@ -0,0 +1,136 @@
+"""
+Tests for client-side rate limiting in the B2B Campaign Agent SDK
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from .api_client import ApiClient
+from .endpoints import USER_ENDPOINTS, BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS
+from .rate_limit import TokenBucket, RateLimiter
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket class"""
+    
+    def test_burst_is_free_then_requests_are_spaced(self, clock):
+        """Test that a full bucket allows a burst and then paces callers"""
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+        
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+    
+    def test_tokens_refill_over_time(self, clock):
+        """Test that idle time refills the bucket up to the burst size"""
+        bucket = TokenBucket(rate=1, burst=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+        
+        clock.now = 10.0
+        
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(1.0)
+    
+    def test_default_burst(self):
+        """Test that burst defaults to one second of tokens"""
+        assert TokenBucket(rate=5).burst == 5
+        assert TokenBucket(rate=0.5).burst == 1
+    
+    def test_invalid_configuration(self):
+        """Test that rate and burst are validated"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+    
+    def test_thread_safety(self, clock):
+        """Test that concurrent reservations never hand out extra tokens"""
+        bucket = TokenBucket(rate=10, burst=5, clock=clock)
+        delays = []
+        lock = threading.Lock()
+        
+        def worker():
+            for _ in range(50):
+                delay = bucket.reserve()
+                with lock:
+                    delays.append(delay)
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # 400 reservations with 5 free tokens: the last caller waits for 395 tokens
+        assert sorted(delays)[-1] == pytest.approx(39.5)
+        assert delays.count(0.0) == 5
+    
+    def test_acquire_paces_real_time(self):
+        """Test that acquire sleeps until the reservation is due"""
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.monotonic()
+        
+        for _ in range(6):
+            bucket.acquire()
+        
+        assert time.monotonic() - start >= 0.09
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter class"""
+    
+    def test_per_endpoint_covers_every_endpoint(self):
+        """Test that per_endpoint builds a bucket for every API route"""
+        limiter = RateLimiter.per_endpoint(rate=2, burst=4)
+        
+        for table in (USER_ENDPOINTS, BUSINESS_ENDPOINTS, CAMPAIGN_ENDPOINTS):
+            for endpoint in table.values():
+                assert limiter.bucket(endpoint).rate == 2
+                assert limiter.bucket(endpoint).burst == 4
+        
+        assert limiter.bucket(USER_ENDPOINTS["DISCOVER"]) is not limiter.bucket(USER_ENDPOINTS["REFINE"])
+    
+    def test_unlimited_endpoints(self):
+        """Test that endpoints without a limit are not paced"""
+        limiter = RateLimiter({BUSINESS_ENDPOINTS["DISCOVER"]: (1, 1)})
+        
+        assert limiter.bucket("/other") is None
+        assert limiter.reserve("/other") == 0.0
+    
+    def test_default_limit_creates_bucket_lazily(self):
+        """Test that the default limit applies per unknown endpoint"""
+        limiter = RateLimiter(default=(3, 3))
+        
+        bucket = limiter.bucket("/custom")
+        
+        assert bucket.rate == 3
+        assert limiter.bucket("/custom") is bucket
+    
+    def test_shared_bucket(self):
+        """Test that endpoints can share one budget"""
+        shared = TokenBucket(rate=1, burst=1)
+        limiter = RateLimiter({
+            CAMPAIGN_ENDPOINTS["CREATE"]: shared,
+            CAMPAIGN_ENDPOINTS["REFINE"]: shared
+        })
+        
+        assert limiter.bucket(CAMPAIGN_ENDPOINTS["CREATE"]) is limiter.bucket(CAMPAIGN_ENDPOINTS["REFINE"])
+    
+    def test_api_client_acquires_before_each_attempt(self, requests_mock):
+        """Test that ApiClient paces every request through the limiter"""
+        requests_mock.post("https://api.test.com/api/v1/user/discover", json={})
+        limiter = Mock(spec=RateLimiter)
+        client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            rate_limiter=limiter
+        )
+        
+        client.post("/api/v1/user/discover")
+        client.post("/api/v1/user/discover")
+        
+        assert limiter.acquire.call_count == 2
+        limiter.acquire.assert_called_with("/api/v1/user/discover")
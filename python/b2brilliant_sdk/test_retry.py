@@ -0,0 +1,204 @@
+"""
+Tests for retry handling in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import time
+import pytest
+import requests
+from email.utils import formatdate
+from unittest.mock import patch
+from .api_client import ApiClient
+from .exceptions import ApiError
+from .retry import RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy class"""
+    
+    def test_default_statuses_are_retried(self):
+        """Test that throttling and gateway errors are retryable by default"""
+        policy = RetryPolicy()
+        
+        for status in (429, 502, 503, 504, 0):
+            assert policy.should_retry("/api/v1/business/discover", status, 1)
+        
+        assert not policy.should_retry("/api/v1/business/discover", 400, 1)
+        assert not policy.should_retry("/api/v1/business/discover", 500, 1)
+    
+    def test_max_attempts(self):
+        """Test that retries stop once max_attempts is reached"""
+        policy = RetryPolicy(max_attempts=3)
+        
+        assert policy.should_retry("/api/v1/user/discover", 503, 2)
+        assert not policy.should_retry("/api/v1/user/discover", 503, 3)
+    
+    def test_status_max_attempts_override(self):
+        """Test per-status attempt limits"""
+        policy = RetryPolicy(max_attempts=2, status_max_attempts={429: 5})
+        
+        assert policy.should_retry("/api/v1/user/discover", 429, 4)
+        assert not policy.should_retry("/api/v1/user/discover", 503, 2)
+    
+    def test_endpoint_rules(self):
+        """Test that campaign endpoints only retry statuses that are safe to repeat"""
+        policy = RetryPolicy()
+        
+        assert policy.should_retry("/api/v1/campaigns/create", 429, 1)
+        assert not policy.should_retry("/api/v1/campaigns/create", 502, 1)
+        assert policy.should_retry("/api/v1/business/discover", 502, 1)
+    
+    def test_endpoint_rules_can_be_overridden(self):
+        """Test custom per-endpoint statuses"""
+        policy = RetryPolicy(endpoint_statuses={"/api/v1/campaigns/create": (429, 502)})
+        
+        assert policy.should_retry("/api/v1/campaigns/create", 502, 1)
+    
+    def test_network_errors_can_be_disabled(self):
+        """Test that network errors are not retried when disabled"""
+        policy = RetryPolicy(retry_network_errors=False)
+        
+        assert not policy.should_retry("/api/v1/user/discover", 0, 1)
+        
+    def test_campaign_network_errors_are_not_retried(self):
+        """Test that billed endpoints are not repeated after a network error unless enabled"""
+        policy = RetryPolicy()
+        
+        assert not policy.should_retry("/api/v1/campaigns/create", 0, 1)
+        assert not policy.should_retry("/api/v1/campaigns/refine", 0, 1)
+        
+        policy = RetryPolicy(endpoint_network_errors={"/api/v1/campaigns/create": True})
+        assert policy.should_retry("/api/v1/campaigns/create", 0, 1)
+    
+    def test_exponential_backoff_without_jitter(self):
+        """Test the exponential backoff schedule"""
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+        
+        assert [policy.get_delay(n) for n in range(1, 5)] == [0.5, 1.0, 2.0, 3]
+    
+    def test_jitter_stays_within_backoff(self):
+        """Test that jittered delays never exceed the computed backoff"""
+        policy = RetryPolicy(backoff_factor=1, jitter=True)
+        
+        for _ in range(50):
+            assert 0 <= policy.get_delay(3) <= 4
+    
+    def test_retry_after_is_honoured(self):
+        """Test that Retry-After overrides the computed backoff"""
+        policy = RetryPolicy(jitter=False, max_retry_after=10)
+        
+        assert policy.get_delay(1, "7") == 7.0
+        assert policy.get_delay(1, "600") == 10
+        assert RetryPolicy(jitter=False, respect_retry_after=False).get_delay(1, "7") == 0.5
+    
+    def test_parse_retry_after(self):
+        """Test parsing of both Retry-After formats"""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert 0 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    
+    def test_invalid_max_attempts(self):
+        """Test that at least one attempt is required"""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+
+class TestApiClientRetries:
+    """Test cases for retries in ApiClient"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.api_client = ApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            retry_policy=RetryPolicy(max_attempts=3, backoff_factor=0)
+        )
+    
+    def test_retries_until_success(self, requests_mock):
+        """Test that transient failures are retried"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", [
+            {"status_code": 503, "json": {"message": "Unavailable"}},
+            {"exc": requests.ConnectionError("reset")},
+            {"status_code": 200, "json": {"ok": True}},
+        ])
+        
+        result = self.api_client.post("/api/v1/business/discover", {"urls": ["https://a.com"]})
+        
+        assert result == {"ok": True}
+        assert requests_mock.call_count == 3
+    
+    def test_gives_up_and_reports_retries(self, requests_mock):
+        """Test that the final error carries the retry count"""
+        requests_mock.post(
+            "https://api.test.com/api/v1/business/discover",
+            status_code=502,
+            json={"message": "Bad gateway"}
+        )
+        
+        with pytest.raises(ApiError) as exc_info:
+            self.api_client.post("/api/v1/business/discover")
+        
+        assert exc_info.value.status == 502
+        assert exc_info.value.retries == 2
+        assert requests_mock.call_count == 3
+    
+    def test_non_retryable_status_fails_immediately(self, requests_mock):
+        """Test that client errors are not retried"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", status_code=400, json={})
+        
+        with pytest.raises(ApiError) as exc_info:
+            self.api_client.post("/api/v1/business/discover")
+        
+        assert exc_info.value.retries == 0
+        assert requests_mock.call_count == 1
+    
+    def test_campaign_network_error_is_not_repeated(self, requests_mock):
+        """Test that a campaign request that may have reached the server is sent once"""
+        requests_mock.post(
+            "https://api.test.com/api/v1/campaigns/create",
+            exc=requests.ConnectionError("reset")
+        )
+        
+        with pytest.raises(ApiError) as exc_info:
+            self.api_client.post("/api/v1/campaigns/create")
+        
+        assert exc_info.value.status == 0
+        assert requests_mock.call_count == 1
+    
+    def test_retry_after_header_is_used(self, requests_mock):
+        """Test that the client sleeps for the server's Retry-After"""
+        requests_mock.post("https://api.test.com/api/v1/user/discover", [
+            {"status_code": 429, "headers": {"Retry-After": "2"}, "json": {}},
+            {"status_code": 200, "json": {"ok": True}},
+        ])
+        
+        with patch("b2brilliant_sdk.api_client.time.sleep") as sleep:
+            self.api_client.post("/api/v1/user/discover")
+        
+        sleep.assert_called_once_with(2.0)
+    
+    def test_no_retries_without_policy(self, requests_mock):
+        """Test that requests are not retried by default"""
+        requests_mock.post("https://api.test.com/api/v1/business/discover", status_code=503, json={})
+        client = ApiClient(api_key="test-api-key", base_url="https://api.test.com")
+        
+        with pytest.raises(ApiError):
+            client.post("/api/v1/business/discover")
+        
+        assert requests_mock.call_count == 1
+    
+    def test_async_client_retries(self):
+        """Test that the async client follows the same policy"""
+        httpx = pytest.importorskip("httpx")
+        from .async_api_client import AsyncApiClient
+        
+        responses = iter([httpx.Response(429, json={}), httpx.Response(200, json={"ok": True})])
+        client = AsyncApiClient(
+            api_key="test-api-key",
+            base_url="https://api.test.com",
+            client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: next(responses))),
+            retry_policy=RetryPolicy(backoff_factor=0)
+        )
+        
+        assert asyncio.run(client.post("/api/v1/user/discover")) == {"ok": True}
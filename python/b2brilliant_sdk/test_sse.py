@@ -0,0 +1,274 @@
+"""
+Tests for server-sent events and streamed campaign generation in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from .agent import B2BrilliantAgent
+from .exceptions import ApiError, ValidationError
+from .sse import SSEDecoder, ServerSentEvent, iter_sse
+
+USER = {"profile": {"name": "User Co"}}
+TARGET = {"profile": {"name": "Target Co"}}
+CAMPAIGNS = [
+    {"type": "email", "content": "Hi there", "rating": 8.5},
+    {"type": "dm", "content": "Hey!", "rating": 7.0},
+    {"type": "sms", "content": "Quick note", "rating": 6.5}
+]
+
+
+class _StreamingServer:
+    """Local stand-in for the campaigns endpoint that streams one event per campaign"""
+    
+    def __init__(self):
+        self.mode = "sse"
+        self.requests = []
+        # Set by a test once it has seen the first campaign, to prove the
+        # client does not wait for the whole response
+        self.release = threading.Event()
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+            
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests.append((dict(self.headers), body))
+                types = body.get("campaignTypes") or ["email", "dm", "sms"]
+                campaigns = [c for c in CAMPAIGNS if c["type"] in types]
+                
+                if server.mode == "json":
+                    payload = json.dumps({"campaigns": campaigns}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                    
+                if server.mode == "unavailable":
+                    payload = b'{"message": "Try later"}'
+                    self.send_response(503)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                    
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self.chunk(": generation started\n\n")
+                for index, campaign in enumerate(campaigns):
+                    if index == 1:
+                        if server.mode == "truncated":
+                            # The connection drops, but the body still ends cleanly
+                            self.chunk("")
+                            return
+                        server.release.wait(5)
+                    self.chunk(f"event: campaign\nid: {index}\ndata: {json.dumps(campaign)}\n\n")
+                if server.mode == "error":
+                    self.chunk('event: error\ndata: {"message": "Generation failed", "status": 500}\n\n')
+                else:
+                    self.chunk("event: done\ndata: {}\n\n")
+                self.chunk("")
+                
+            def chunk(self, text):
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+                
+            def log_message(self, *args):
+                pass
+                
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        
+    def close(self):
+        self.release.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = _StreamingServer()
+    yield server
+    server.close()
+
+
+class TestSSEDecoder:
+    """Test cases for SSEDecoder class"""
+    
+    def test_events_split_across_chunks(self):
+        """Test that lines and events spanning chunks are reassembled"""
+        stream = b'event: campaign\r\ndata: {"a":\r\ndata: 1}\r\n\r\n: comment\n\ndata: plain\n\n'
+        chunks = [stream[i:i + 5] for i in range(0, len(stream), 5)]
+        
+        events = list(iter_sse(chunks))
+        
+        assert events == [
+            ServerSentEvent("campaign", '{"a":\n1}', None),
+            ServerSentEvent("message", "plain", None)
+        ]
+        
+    def test_ids_and_bare_carriage_returns(self):
+        """Test CR line endings and that the last event id carries over"""
+        decoder = SSEDecoder()
+        
+        assert decoder.feed(b"id: 7\rdata:x\r") == []
+        assert decoder.feed(b"\r") == [ServerSentEvent("message", "x", "7")]
+        assert decoder.feed(b"data: y\n\n") == [ServerSentEvent("message", "y", "7")]
+        
+    def test_incomplete_event_is_not_dispatched(self):
+        """Test that an event without its terminating blank line is held back"""
+        assert list(iter_sse([b"event: done\ndata: {}\n"])) == []
+
+
+class TestCampaignStreaming:
+    """Test cases for CampaignService.create_stream"""
+    
+    def test_campaigns_yielded_as_they_arrive(self, server):
+        """Test that the first campaign is available before the rest are generated"""
+        with B2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+            stream = agent.campaigns.create_stream(USER, TARGET)
+            
+            first = next(stream)
+            assert not server.release.is_set()
+            server.release.set()
+            
+            assert [first, *stream] == CAMPAIGNS
+            
+        headers, body = server.requests[0]
+        assert headers["Accept"].startswith("text/event-stream")
+        assert body == {"userBusiness": USER, "targetBusiness": TARGET}
+        
+    def test_campaign_types(self, server):
+        """Test that requested types are sent and streamed"""
+        server.release.set()
+        with B2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+            campaigns = list(agent.campaigns.create_stream(USER, TARGET, "sms"))
+            
+        assert campaigns == [CAMPAIGNS[2]]
+        assert server.requests[0][1]["campaignTypes"] == ["sms"]
+        
+    def test_plain_json_fallback(self, server):
+        """Test that a server that does not stream still yields each campaign"""
+        server.mode = "json"
+        with B2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+            assert list(agent.campaigns.create_stream(USER, TARGET)) == CAMPAIGNS
+            
+    def test_error_event(self, server):
+        """Test that an error event raises after the campaigns already produced"""
+        server.mode = "error"
+        server.release.set()
+        received = []
+        
+        with B2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+            with pytest.raises(ApiError) as exc_info:
+                for campaign in agent.campaigns.create_stream(USER, TARGET):
+                    received.append(campaign)
+                    
+        assert received == CAMPAIGNS
+        assert exc_info.value.message == "Generation failed"
+        assert exc_info.value.status == 500
+        
+    def test_truncated_stream(self, server):
+        """Test that a stream ending without its done event raises"""
+        server.mode = "truncated"
+        received = []
+        
+        with B2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+            with pytest.raises(ApiError) as exc_info:
+                for campaign in agent.campaigns.create_stream(USER, TARGET):
+                    received.append(campaign)
+                    
+        assert received == CAMPAIGNS[:1]
+        assert exc_info.value.status == 0
+        assert exc_info.value.message == "Stream ended before done"
+        
+    def test_async_truncated_stream(self, server):
+        """Test that an async stream ending without its done event raises"""
+        pytest.importorskip("httpx")
+        from .agent import AsyncB2BrilliantAgent
+        
+        server.mode = "truncated"
+        received = []
+        
+        async def run():
+            async with AsyncB2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+                async for campaign in agent.campaigns.create_stream(USER, TARGET):
+                    received.append(campaign)
+                    
+        with pytest.raises(ApiError) as exc_info:
+            asyncio.run(run())
+            
+        assert received == CAMPAIGNS[:1]
+        assert exc_info.value.status == 0
+        
+    def test_http_error(self, server):
+        """Test that an error status raises before anything is yielded"""
+        server.mode = "unavailable"
+        with B2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+            with pytest.raises(ApiError) as exc_info:
+                next(agent.campaigns.create_stream(USER, TARGET))
+                
+        assert exc_info.value.status == 503
+        assert exc_info.value.message == "Try later"
+        
+    def test_validation_is_immediate(self):
+        """Test that invalid input fails before iteration starts"""
+        agent = B2BrilliantAgent(api_key="test-api-key")
+        
+        with pytest.raises(ValidationError):
+            agent.campaigns.create_stream(USER, TARGET, ["fax"])
+            
+    def test_async_stream(self, server):
+        """Test streaming through AsyncB2BrilliantAgent"""
+        pytest.importorskip("httpx")
+        from .agent import AsyncB2BrilliantAgent
+        
+        async def run():
+            async with AsyncB2BrilliantAgent(api_key="test-api-key", base_url=server.url) as agent:
+                received = []
+                async for campaign in agent.campaigns.create_stream(USER, TARGET):
+                    if not received:
+                        assert not server.release.is_set()
+                        server.release.set()
+                    received.append(campaign)
+                return received
+                
+        assert asyncio.run(run()) == CAMPAIGNS
+        
+    def test_async_streams_hold_a_concurrency_slot(self, server):
+        """Test that an open stream counts against max_concurrency until it is closed"""
+        pytest.importorskip("httpx")
+        from .agent import AsyncB2BrilliantAgent
+        
+        async def collect(stream):
+            return [campaign async for campaign in stream]
+            
+        async def run():
+            async with AsyncB2BrilliantAgent(
+                api_key="test-api-key", base_url=server.url, max_concurrency=1
+            ) as agent:
+                first = agent.campaigns.create_stream(USER, TARGET)
+                received = [await first.__anext__()]
+                second = asyncio.ensure_future(collect(agent.campaigns.create_stream(USER, TARGET)))
+                
+                await asyncio.sleep(0.2)
+                assert len(server.requests) == 1
+                
+                server.release.set()
+                received += await collect(first)
+                return received, await second
+                
+        assert asyncio.run(run()) == (CAMPAIGNS, CAMPAIGNS)
+        assert len(server.requests) == 2
@@ -0,0 +1,209 @@
+"""
+Tests for URL canonicalization and batch deduplication in the B2B Campaign Agent SDK
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import Mock
+from .batch import run_batch, run_batch_async
+from .api_client import ApiClient
+from .business import AsyncBusinessService, BusinessService
+from .exceptions import ApiError
+from .urls import canonical_urls, canonicalize_url, discover_key
+from .user import UserService
+
+
+class TestCanonicalizeUrl:
+    """Test cases for canonicalize_url"""
+    
+    @pytest.mark.parametrize("url", [
+        "https://acme.com",
+        "http://acme.com",
+        "https://www.acme.com/",
+        "HTTPS://WWW.Acme.COM///",
+        "  acme.com ",
+        "www.acme.com",
+        "https://acme.com:443/",
+        "http://acme.com:80",
+        "https://acme.com/#pricing",
+        "https://acme.com/?utm_source=newsletter&utm_medium=email",
+        "https://acme.com?gclid=abc&fbclid=def",
+        "https://acme.com?ref_src=twsrc",
+    ])
+    def test_variants_of_the_same_site(self, url):
+        """Test that common spellings of a site map to one URL"""
+        assert canonicalize_url(url) == "https://acme.com"
+        
+    def test_keeps_meaningful_parts(self):
+        """Test that the path case, other parameters and custom ports are kept"""
+        assert canonicalize_url("https://acme.com/Products/?b=2&utm_campaign=x&a=1") == \
+            "https://acme.com/Products?a=1&b=2"
+        assert canonicalize_url("http://acme.com:8080/") == "http://acme.com:8080"
+        assert canonicalize_url("http://[::1]:8080") == "http://[::1]:8080"
+        assert canonicalize_url("https://acme.com/signup?ref=partner") == "https://acme.com/signup?ref=partner"
+        
+    def test_non_strings_are_returned_as_is(self):
+        """Test that invalid values are left for validation to report"""
+        assert canonicalize_url(None) is None
+        assert canonicalize_url(42) == 42
+        assert canonicalize_url("") == ""
+        
+    def test_canonical_urls_drops_duplicates(self):
+        """Test that duplicates are dropped and the order is kept"""
+        urls = ["http://www.b.com/", "https://a.com", "https://b.com?utm_source=x", "A.com"]
+        
+        assert canonical_urls(urls) == ["https://b.com", "https://a.com"]
+        assert canonical_urls("https://a.com") == "https://a.com"
+        
+    def test_discover_key_ignores_order(self):
+        """Test that the same URLs in any order and spelling get one key"""
+        assert discover_key(["https://a.com", "http://www.b.com"]) == discover_key(["b.com/", "A.com"])
+        assert discover_key(["https://a.com"]) != discover_key(["https://b.com"])
+        assert discover_key("https://a.com") == ("'https://a.com'",)
+
+
+class TestBatchDedupe:
+    """Test cases for dedupe_key in the batch runners"""
+    
+    def test_duplicates_share_one_call(self):
+        """Test that items with the same key are called once and fanned out"""
+        calls = []
+        lock = threading.Lock()
+        
+        def call(n):
+            with lock:
+                calls.append(n)
+            return n * 10
+            
+        results = list(run_batch(call, [1, 2, 11, 1, 21], max_concurrency=3, dedupe_key=lambda n: n % 10))
+        
+        assert sorted(calls) == [1, 2]
+        assert [(r.index, r.input, r.result) for r in results] == [
+            (0, 1, 10), (1, 2, 20), (2, 11, 10), (3, 1, 10), (4, 21, 10)
+        ]
+        
+    def test_duplicates_share_errors(self):
+        """Test that every duplicate of a failed item gets its error"""
+        func = Mock(side_effect=ApiError("Bad gateway", 502))
+        
+        results = list(run_batch(func, ["a", "a", "a"], dedupe_key=str))
+        
+        assert func.call_count == 1
+        assert [r.error.status for r in results] == [502, 502, 502]
+        
+    def test_completed_keys_are_released(self):
+        """Test that a key is forgotten once its call finishes"""
+        func = Mock(side_effect=lambda item: item)
+        
+        # One worker and a window of two: the second "a" is read after the
+        # first one has finished
+        results = list(run_batch(func, ["a", "b", "a"], max_concurrency=1, dedupe_key=str))
+        
+        assert [c.args[0] for c in func.call_args_list] == ["a", "b", "a"]
+        assert [r.result for r in results] == ["a", "b", "a"]
+        
+    def test_duplicates_do_not_take_workers(self):
+        """Test that duplicates wait in the dispatcher instead of in a worker"""
+        started = threading.Event()
+        
+        def call(item):
+            if item == "b":
+                started.set()
+            # Waits for "b", which only runs if the duplicates leave the
+            # second worker free
+            elif not started.wait(2):
+                raise ApiError("b never started", 0)
+            return item
+            
+        results = list(run_batch(call, ["a", "a", "a", "b"], max_concurrency=2, dedupe_key=str))
+        
+        assert [r.result for r in results] == ["a", "a", "a", "b"]
+        
+    def test_async_duplicates_share_one_call(self):
+        """Test dedupe_key in the asynchronous batch runner"""
+        calls = []
+        
+        async def call(n):
+            calls.append(n)
+            await asyncio.sleep(0.01)
+            return n
+            
+        async def run():
+            return [r async for r in run_batch_async(call, [1, 1, 2, 1], dedupe_key=lambda n: n)]
+            
+        results = asyncio.run(run())
+        
+        assert calls == [1, 2]
+        assert [r.result for r in results] == [1, 1, 2, 1]
+
+
+class TestDiscoverCanonicalization:
+    """Test cases for canonicalization in the discover services"""
+    
+    def test_urls_are_sent_as_given_by_default(self):
+        """Test that discover leaves URLs alone unless canonicalization is enabled"""
+        assert ApiClient("test-api-key", "https://api.example.com").canonicalize_urls is False
+        
+        api_client = Mock(canonicalize_urls=False)
+        api_client.post.return_value = {"ok": True}
+        
+        BusinessService(api_client).discover(["http://www.acme.com/"])
+        
+        api_client.post.assert_called_once_with("/api/v1/business/discover", {"urls": ["http://www.acme.com/"]})
+        
+    def test_discover_payload_is_canonical_when_enabled(self):
+        """Test that a client with canonicalize_urls=True sends canonical, de-duplicated URLs"""
+        api_client = Mock(canonicalize_urls=True)
+        api_client.post.return_value = {"ok": True}
+        
+        UserService(api_client).discover(["http://www.acme.com/", "https://acme.com?utm_source=x"])
+        
+        api_client.post.assert_called_once_with("/api/v1/user/discover", {"urls": ["https://acme.com"]})
+        
+    def test_discover_many_fans_out_duplicates(self):
+        """Test that variants of one business are discovered once"""
+        api_client = Mock(canonicalize_urls=False)
+        api_client.post.side_effect = lambda endpoint, payload: {"urls": payload["urls"]}
+        service = BusinessService(api_client)
+        
+        results = list(service.discover_many([
+            ["https://acme.com"],
+            ["http://www.acme.com/"],
+            ["https://other.com"],
+            ["ACME.com/?utm_source=ad"]
+        ]))
+        
+        assert api_client.post.call_count == 2
+        assert [r.index for r in results] == [0, 1, 2, 3]
+        assert [r.result["urls"] for r in results] == [
+            ["https://acme.com"], ["https://acme.com"], ["https://other.com"], ["https://acme.com"]
+        ]
+        assert results[1].input == ["http://www.acme.com/"]
+        
+    def test_discover_many_without_dedupe(self):
+        """Test that dedupe=False discovers every input"""
+        api_client = Mock()
+        api_client.post.return_value = {"ok": True}
+        
+        list(UserService(api_client).discover_many([["https://a.com"], ["http://a.com"]], dedupe=False))
+        
+        assert api_client.post.call_count == 2
+        
+    def test_async_discover_many_fans_out_duplicates(self):
+        """Test deduplication in the async business service"""
+        async def post(endpoint, payload):
+            await asyncio.sleep(0.01)
+            return {"urls": payload["urls"]}
+            
+        api_client = Mock(canonicalize_urls=False)
+        api_client.post.side_effect = post
+        service = AsyncBusinessService(api_client)
+        
+        async def run():
+            return [r async for r in service.discover_many([["https://a.com"], ["a.com/"], ["b.com"]])]
+            
+        results = asyncio.run(run())
+        
+        assert api_client.post.call_count == 2
+        assert [r.result["urls"] for r in results] == [["https://a.com"], ["https://a.com"], ["b.com"]]
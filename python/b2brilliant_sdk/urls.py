@@ -0,0 +1,112 @@
+"""
+URL canonicalization for discover inputs
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = frozenset((
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "ref_src"
+))
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url):
+    """
+    Reduce a URL to the canonical spelling of the page it points to
+    
+    Spellings that reach the same site map to the same string:
+    
+    - http becomes https, and https is added when there is no scheme
+    - the host is lower-cased, with ``www.`` and default ports dropped
+    - tracking query parameters (``utm_*``, ``gclid``, ``fbclid``, ...) and
+      fragments are dropped, and the remaining parameters are sorted
+    - trailing slashes are dropped
+    
+    The path keeps its case, since servers may treat it as significant.
+    
+    Args:
+        url (str): URL as given by the user
+        
+    Returns:
+        str: Canonical URL. Values that are not strings are returned as is.
+    """
+    if not isinstance(url, str):
+        return url
+        
+    url = url.strip()
+    if not url:
+        return url
+    if "://" not in url:
+        url = f"https://{url}"
+        
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if ":" in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        # A site on its own port may not speak https there
+        host = f"{host}:{port}"
+    elif scheme in DEFAULT_PORTS:
+        scheme = "https"
+        
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((
+        scheme,
+        host,
+        parts.path.rstrip("/"),
+        urlencode(query),
+        ""
+    ))
+
+
+def canonical_urls(urls):
+    """
+    Canonicalize a list of URLs and drop duplicates, keeping the first of each
+    
+    Args:
+        urls (list): URLs as given by the user
+        
+    Returns:
+        list: Canonical URLs in their original order. Anything that is not
+            a list is returned as is, for the caller to validate.
+    """
+    if not isinstance(urls, list):
+        return urls
+        
+    seen = set()
+    canonical = []
+    for url in urls:
+        url = canonicalize_url(url)
+        key = url if isinstance(url, str) else repr(url)
+        if key not in seen:
+            seen.add(key)
+            canonical.append(url)
+    return canonical
+
+
+def discover_key(urls):
+    """
+    Identify the business a discover input points to
+    
+    Args:
+        urls (list): URLs of one business
+        
+    Returns:
+        tuple: Sorted canonical URLs, equal for every spelling and ordering
+            of the same URLs
+    """
+    return tuple(sorted(canonical_urls(urls), key=str)) if isinstance(urls, list) else (repr(urls),)
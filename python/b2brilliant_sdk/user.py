@@ -2,8 +2,12 @@
 User service for interacting with user business API endpoints
 """
 
+from collections.abc import Mapping
 from .endpoints import USER_ENDPOINTS
 from .exceptions import ValidationError
+from .profile import BusinessProfile
+from .urls import canonical_urls, discover_key
+from .batch import DEFAULT_MAX_CONCURRENCY, run_batch, run_batch_async
 
 
 class UserService:
@@ -33,12 +37,51 @@ class UserService:
                     - position (str): Position or job title
                     
         Returns:
-            dict: Business information
+            BusinessProfile: Business information
             
         Raises:
             ValidationError: If the input is invalid
             ApiError: If the API request fails
         """
+        return BusinessProfile.of(self.api_client.post(
+            USER_ENDPOINTS["DISCOVER"],
+            self._discover_payload(urls, options)
+        ))
+        
+    def discover_many(self, url_batches, options=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                      as_completed=False, dedupe=True):
+        """
+        Run :meth:`discover` for many businesses in parallel
+        
+        Results are produced lazily; wrap the call in ``list()`` to collect
+        them all. A failing item does not abort the batch: its ApiError or
+        ValidationError is returned on the corresponding result instead.
+        
+        Args:
+            url_batches (iterable): URL lists, one per business to discover
+            options (dict, optional): Discovery options applied to every batch,
+                as accepted by :meth:`discover`
+            max_concurrency (int, optional): Maximum number of requests in flight
+            as_completed (bool, optional): Yield results as they finish instead
+                of in input order
+            dedupe (bool, optional): Share calls between duplicates. A URL
+                list that is the same after canonicalization (see
+                :func:`~b2brilliant_sdk.urls.canonicalize_url`) as one whose
+                call is still in flight waits for that call's result.
+                
+        Yields:
+            BatchResult: Result or error for each URL list, with its input index
+        """
+        return run_batch(
+            lambda urls: self.discover(urls, options),
+            url_batches,
+            max_concurrency,
+            as_completed,
+            dedupe_key=discover_key if dedupe else None
+        )
+        
+    def _discover_payload(self, urls, options):
+        """Validate discover input and build the request body"""
         if not urls or not isinstance(urls, list):
             raise ValidationError("URLs must be a non-empty list", {"urls": "Must be a non-empty list"})
             
@@ -61,13 +104,13 @@ class UserService:
                             {"point_of_contact": "Must be a dictionary"}
                         )
                         
-        return self.api_client.post(
-            USER_ENDPOINTS["DISCOVER"],
-            {
-                "urls": urls,
-                **transformed_options
-            }
-        )
+        if getattr(self.api_client, "canonicalize_urls", False):
+            urls = canonical_urls(urls)
+            
+        return {
+            "urls": urls,
+            **transformed_options
+        }
         
     def refine(self, business_data, additional_info):
         """
@@ -78,13 +121,20 @@ class UserService:
             additional_info (str): Additional information to refine with
             
         Returns:
-            dict: Refined business information
+            BusinessProfile: Refined business information
             
         Raises:
             ValidationError: If the input is invalid
             ApiError: If the API request fails
         """
-        if not business_data or not isinstance(business_data, dict):
+        return BusinessProfile.of(self.api_client.post(
+            USER_ENDPOINTS["REFINE"],
+            self._refine_payload(business_data, additional_info)
+        ))
+        
+    def _refine_payload(self, business_data, additional_info):
+        """Validate refine input and build the request body"""
+        if not business_data or not isinstance(business_data, Mapping):
             raise ValidationError(
                 "business_data must be a dictionary", 
                 {"business_data": "Must be a dictionary"}
@@ -96,10 +146,63 @@ class UserService:
                 {"additional_info": "Must be a non-empty string"}
             )
             
-        return self.api_client.post(
+        return {
+            "businessData": business_data,
+            "additionalInfo": additional_info
+        }
+
+
+class AsyncUserService(UserService):
+    """Asynchronous service for user business operations"""
+    
+    async def discover(self, urls, options=None):
+        """
+        Discover information about a user business
+        
+        Accepts the same arguments as :meth:`UserService.discover`.
+        
+        Returns:
+            BusinessProfile: Business information
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails
+        """
+        return BusinessProfile.of(await self.api_client.post(
+            USER_ENDPOINTS["DISCOVER"],
+            self._discover_payload(urls, options)
+        ))
+        
+    def discover_many(self, url_batches, options=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                      as_completed=False, dedupe=True):
+        """
+        Run :meth:`discover` for many businesses concurrently
+        
+        Accepts the same arguments as :meth:`UserService.discover_many` and
+        returns an async iterator of BatchResult.
+        """
+        return run_batch_async(
+            lambda urls: self.discover(urls, options),
+            url_batches,
+            max_concurrency,
+            as_completed,
+            dedupe_key=discover_key if dedupe else None
+        )
+        
+    async def refine(self, business_data, additional_info):
+        """
+        Refine information about a user business
+        
+        Accepts the same arguments as :meth:`UserService.refine`.
+        
+        Returns:
+            BusinessProfile: Refined business information
+            
+        Raises:
+            ValidationError: If the input is invalid
+            ApiError: If the API request fails
+        """
+        return BusinessProfile.of(await self.api_client.post(
             USER_ENDPOINTS["REFINE"],
-            {
-                "businessData": business_data,
-                "additionalInfo": additional_info
-            }
-        ) 
\ No newline at end of file
+            self._refine_payload(business_data, additional_info)
+        ))
@@ -0,0 +1,80 @@
+"""
+Benchmark JSON encode/decode time of each installed codec on large business profiles
+
+Encodes a compatibility-shaped request (two large profiles) and decodes a
+profile-sized response with every available codec. Run from the python/ directory:
+
+    python benchmarks/bench_codec.py --iterations 500 --profile-kb 64
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from b2brilliant_sdk import codec as codec_module
+from b2brilliant_sdk.codec import get_codec
+
+WORDS = (
+    "growth marketing agency brand strategy content social audience campaign "
+    "software platform analytics customers revenue partners services retail "
+    "healthcare logistics finance automation outreach pipeline enterprise"
+).split()
+
+
+def make_profile(name, size_kb, rng):
+    """Build a nested business profile of roughly ``size_kb`` kilobytes"""
+    def sentence():
+        return " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+
+    profile = {
+        "profile": {"name": name, "industry": "Software", "summary": sentence(), "services": []},
+        "contacts": {"social": [], "email": "hello@example.com"},
+        "branding": {"voice": "friendly", "tone": "confident", "phrases": []},
+        "competitors": []
+    }
+    size = 0
+    while size < size_kb * 1024:
+        profile["profile"]["services"].append(sentence())
+        profile["contacts"]["social"].append({"platform": rng.choice(WORDS), "followers": rng.randint(0, 10 ** 6)})
+        profile["competitors"].append({"name": rng.choice(WORDS).title(), "similarity": rng.random()})
+        size += 250
+    return profile
+
+
+def time_it(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--profile-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    request = {
+        "userBusiness": make_profile("User Co", args.profile_kb, rng),
+        "targetBusiness": make_profile("Target Co", args.profile_kb, rng)
+    }
+    response = get_codec("json").dumps(request["targetBusiness"])
+
+    names = ["json"] + [name for name in ("ujson", "orjson") if getattr(codec_module, name)]
+    print(f"request {len(get_codec('json').dumps(request)) / 1024:.0f} KiB, "
+          f"response {len(response) / 1024:.0f} KiB, {args.iterations} iterations")
+
+    for name in names:
+        codec = get_codec(name)
+        encode = time_it(lambda: codec.dumps(request), args.iterations)
+        decode = time_it(lambda: codec.loads(response), args.iterations)
+        print(f"{name:<8} encode {encode:8.1f} us   decode {decode:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark bytes on the wire and latency for response/request compression settings
+
+Starts a local server that honours Accept-Encoding (gzip/deflate) and gzip
+request bodies, then sends compatibility-shaped requests that re-upload two
+large business profiles. Run from the python/ directory:
+
+    python benchmarks/bench_compression.py --calls 200 --profile-kb 64
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from b2brilliant_sdk.api_client import ApiClient
+from b2brilliant_sdk.endpoints import BUSINESS_ENDPOINTS
+
+WORDS = (
+    "growth marketing agency brand strategy content social audience campaign "
+    "software platform analytics customers revenue partners services retail "
+    "healthcare logistics finance automation outreach pipeline enterprise"
+).split()
+
+
+def make_profile(name, size_kb, rng):
+    """Build a business profile of roughly ``size_kb`` kilobytes of prose"""
+    def sentence():
+        return " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+
+    profile = {
+        "profile": {"name": name, "industry": "Software", "summary": "", "services": []},
+        "branding": {"voice": "friendly", "tone": "confident", "phrases": []},
+        "competitors": []
+    }
+    while len(json.dumps(profile)) < size_kb * 1024:
+        profile["profile"]["summary"] += sentence() + " "
+        profile["profile"]["services"].append(sentence())
+        profile["branding"]["phrases"].append(sentence())
+    return profile
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+def make_handler(stats, response_body):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            json.loads(raw)
+
+            body = response_body
+            encoding = None
+            accepted = [e.strip() for e in self.headers.get("Accept-Encoding", "").split(",")]
+            if "gzip" in accepted:
+                body, encoding = gzip.compress(body), "gzip"
+            elif "deflate" in accepted:
+                body, encoding = zlib.compress(body), "deflate"
+
+            with stats.lock:
+                stats.bytes_in += int(self.headers.get("Content-Length", 0))
+                stats.bytes_out += len(body)
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--profile-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    user = make_profile("User Co", args.profile_kb, rng)
+    target = make_profile("Target Co", args.profile_kb, rng)
+    payload = {"userBusiness": user, "targetBusiness": target}
+    response_body = json.dumps({"score": 8, "reasoning": {"positives": [target["profile"]["summary"]]}}).encode()
+
+    modes = [
+        ("deflate only (before)", {"accept_encoding": "deflate"}),
+        ("identity", {"accept_encoding": "identity"}),
+        ("negotiated", {}),
+        ("negotiated + gzip body", {"compress_requests": True}),
+    ]
+
+    print(f"request JSON {len(json.dumps(payload)) / 1024:.0f} KiB, "
+          f"response JSON {len(response_body) / 1024:.0f} KiB, {args.calls} calls per mode")
+
+    for label, options in modes:
+        stats = _Stats()
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(stats, response_body))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        samples = []
+        try:
+            with ApiClient(api_key="bench", base_url=base_url, **options) as client:
+                for _ in range(args.calls):
+                    start = time.perf_counter()
+                    client.post(BUSINESS_ENDPOINTS["COMPATIBILITY"], payload)
+                    samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        print(f"{label:<24} up {stats.bytes_in / args.calls / 1024:7.1f} KiB/call   "
+              f"down {stats.bytes_out / args.calls / 1024:7.1f} KiB/call   "
+              f"mean {statistics.mean(samples):7.2f} ms   p50 {statistics.median(samples):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
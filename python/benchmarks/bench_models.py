@@ -0,0 +1,117 @@
+"""
+Benchmark memory held by decoded dict responses versus compact response models
+
+Decodes many discover and compatibility responses both as plain dicts and as
+response models, keeps them all alive, and reports the memory they hold
+(measured with tracemalloc) and the time taken. Compatibility results are
+ranked by score afterwards, which reads only the scalar field. Run from the
+python/ directory:
+
+    python benchmarks/bench_models.py --count 5000 --profile-kb 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from b2brilliant_sdk.codec import get_codec
+from b2brilliant_sdk.models import BusinessModel, CompatibilityModel
+
+WORDS = (
+    "growth marketing agency brand strategy content social audience campaign "
+    "software platform analytics customers revenue partners services retail "
+    "healthcare logistics finance automation outreach pipeline enterprise"
+).split()
+
+
+def make_profile(name, size_kb, rng):
+    """Build a nested business profile of roughly ``size_kb`` kilobytes"""
+    def sentence():
+        return " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+        
+    profile = {
+        "profile": {"name": name, "industry": "Software", "summary": sentence(), "services": []},
+        "contacts": {"social": [], "email": "hello@example.com"},
+        "branding": {"voice": "friendly", "tone": "confident", "phrases": []},
+        "competitors": [],
+        "confidence": {"score": rng.uniform(0, 10), "reasoning": sentence()}
+    }
+    size = 0
+    while size < size_kb * 1024:
+        profile["profile"]["services"].append(sentence())
+        profile["contacts"]["social"].append({"platform": rng.choice(WORDS), "followers": rng.randint(0, 10 ** 6)})
+        profile["competitors"].append({"name": rng.choice(WORDS).title(), "similarity": rng.random()})
+        size += 250
+    return profile
+
+
+def make_compatibility(name, rng):
+    """Build a compatibility response"""
+    def points():
+        return [" ".join(rng.choice(WORDS) for _ in range(10)) for _ in range(4)]
+        
+    return {
+        "target_business": name,
+        "user_business": "User Co",
+        "score": round(rng.uniform(0, 10), 1),
+        "reasoning": {"positives": points(), "negatives": points(), "recommendations": points()}
+    }
+
+
+def measure(build, bodies):
+    """Build one object per body and return (objects, bytes held, seconds)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = [build(body) for body in bodies]
+    elapsed = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, held, elapsed
+
+
+def report(label, bodies, decode, model):
+    raw = sum(len(body) for body in bodies)
+    dicts, dict_bytes, dict_time = measure(decode, bodies)
+    models, model_bytes, model_time = measure(model, bodies)
+    print(f"{label}: {len(bodies)} responses, {raw / 2 ** 20:.1f} MiB of JSON")
+    print(f"  dicts   {dict_bytes / 2 ** 20:8.1f} MiB   {dict_time:6.2f} s")
+    print(f"  models  {model_bytes / 2 ** 20:8.1f} MiB   {model_time:6.2f} s   "
+          f"({dict_bytes / model_bytes:.1f}x less memory)")
+    return dicts, models
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--profile-kb", type=int, default=4)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    codec = get_codec()
+    businesses = [codec.dumps(make_profile(f"Target {i}", args.profile_kb, rng)) for i in range(args.count)]
+    scores = [codec.dumps(make_compatibility(f"Target {i}", rng)) for i in range(args.count)]
+    print(f"codec {codec.name}")
+    
+    # Models are given a copy of each body so the raw bytes they keep are counted
+    report("discover", businesses, codec.loads, lambda body: BusinessModel(bytearray(body), codec))
+    dicts, models = report(
+        "compatibility", scores, codec.loads, lambda body: CompatibilityModel(bytearray(body), codec)
+    )
+    
+    start = time.perf_counter()
+    top_dicts = sorted(dicts, key=lambda result: result["score"], reverse=True)[:10]
+    dict_rank = time.perf_counter() - start
+    start = time.perf_counter()
+    top_models = sorted(models, key=lambda result: result.score, reverse=True)[:10]
+    model_rank = time.perf_counter() - start
+    assert [r["score"] for r in top_dicts] == [r.score for r in top_models]
+    print(f"rank by score: dicts {dict_rank * 1e3:.1f} ms, models {model_rank * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
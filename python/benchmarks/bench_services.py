@@ -0,0 +1,299 @@
+"""
+Benchmark every service method through the sync and async clients
+
+Starts the fake API server in a subprocess, so its CPU time is not counted,
+and calls each UserService, BusinessService and CampaignService method at
+several concurrency levels and payload sizes. For each run it reports
+throughput, p50/p95/p99 latency, client CPU time per request and peak traced
+memory, and saves everything as JSON. Pass an earlier results file with
+--compare to flag regressions between SDK versions. Run from the python/
+directory:
+
+    python benchmarks/bench_services.py --requests 200 --concurrency 1,8,32 --payload-kb 1,16
+    python benchmarks/bench_services.py --output new.json --compare old.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from b2brilliant_sdk import ApiError, AsyncB2BrilliantAgent, B2BrilliantAgent
+
+WORDS = (
+    "growth marketing agency brand strategy content social audience campaign "
+    "software platform analytics customers revenue partners services retail "
+    "healthcare logistics finance automation outreach pipeline enterprise"
+).split()
+
+MODES = ("sync", "async")
+
+# Each method is called the same way through both agents: the sync call
+# returns the result, the async one returns an awaitable or async iterator
+METHODS = {
+    "user.discover": lambda agent, data: agent.user.discover(["https://user.example.com"], {"find_branding": True}),
+    "user.refine": lambda agent, data: agent.user.refine(data["user"], "We now offer delivery"),
+    "business.discover": lambda agent, data: agent.business.discover(["https://target.example.com"]),
+    "business.refine": lambda agent, data: agent.business.refine(data["target"], "They opened a new office"),
+    "business.compatibility": lambda agent, data: agent.business.compatibility(data["user"], data["target"]),
+    "campaigns.create": lambda agent, data: agent.campaigns.create(data["user"], data["target"], "email"),
+    "campaigns.create_stream": lambda agent, data: agent.campaigns.create_stream(data["user"], data["target"]),
+    "campaigns.refine": lambda agent, data: agent.campaigns.refine(
+        data["user"], data["target"], data["campaigns"], "Make it more casual"
+    )
+}
+
+
+def make_business(name, size_kb, rng):
+    """Build a business profile of roughly ``size_kb`` kilobytes"""
+    def sentence():
+        return " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+        
+    business = {
+        "profile": {"name": name, "industry": "Software", "summary": sentence(), "services": []},
+        "contacts": {"social": [], "email": "hello@example.com"},
+        "branding": {"voice": "friendly", "tone": "confident", "phrases": []},
+        "confidence": {"score": 8.0, "reasoning": sentence()}
+    }
+    size = 0
+    while size < size_kb * 1024:
+        business["profile"]["services"].append(sentence())
+        size += 100
+    return business
+
+
+def make_inputs(size_kb):
+    """Inputs for the methods that send businesses and campaigns back"""
+    rng = random.Random(42)
+    user = make_business("User Co", size_kb, rng)
+    target = make_business("Target Co", size_kb, rng)
+    campaign = {
+        "type": "email",
+        "content": " ".join(rng.choice(WORDS) for _ in range(120)),
+        "rating": 8.0,
+        "feedback": {"strengths": [], "weaknesses": [], "suggestions": []}
+    }
+    campaigns = {"target_business": "Target Co", "user_business": "User Co", "campaigns": [campaign]}
+    return {"user": user, "target": target, "campaigns": campaigns}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(size_kb, latency):
+    """Run the fake API server in a subprocess and wait until it accepts connections"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "b2brilliant_sdk.fake_server", "--port", str(port),
+         "--size-kb", str(size_kb), "--latency", str(latency), "--seed", "1"],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                raise RuntimeError("fake API server did not start")
+            time.sleep(0.05)
+
+
+def run_sync(base_url, method, data, requests, concurrency):
+    """Send ``requests`` calls from ``concurrency`` threads; return their latencies, None for failures"""
+    call = METHODS[method]
+    with B2BrilliantAgent(api_key="bench", base_url=base_url, pool_maxsize=concurrency) as agent:
+        def timed(_):
+            start = time.perf_counter()
+            try:
+                result = call(agent, data)
+                if method.endswith("_stream"):
+                    list(result)
+            except ApiError:
+                return None
+            return time.perf_counter() - start
+            
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(timed, range(requests)))
+
+
+def run_async(base_url, method, data, requests, concurrency):
+    """Send ``requests`` calls with at most ``concurrency`` in flight on one event loop"""
+    call = METHODS[method]
+    
+    async def main():
+        async with AsyncB2BrilliantAgent(api_key="bench", base_url=base_url,
+                                         max_connections=concurrency) as agent:
+            async def worker(calls):
+                latencies = []
+                for _ in calls:
+                    start = time.perf_counter()
+                    try:
+                        result = call(agent, data)
+                        if method.endswith("_stream"):
+                            [campaign async for campaign in result]
+                        else:
+                            await result
+                    except ApiError:
+                        latencies.append(None)
+                        continue
+                    latencies.append(time.perf_counter() - start)
+                return latencies
+                
+            # Workers share one iterator, so each call is timed from when it starts, not while queued
+            calls = iter(range(requests))
+            workers = await asyncio.gather(*(worker(calls) for _ in range(concurrency)))
+            return [latency for latencies in workers for latency in latencies]
+            
+    return asyncio.run(main())
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def measure(run, base_url, method, data, requests, concurrency, memory):
+    """Run one scenario and summarise it"""
+    cpu = time.process_time()
+    start = time.perf_counter()
+    samples = run(base_url, method, data, requests, concurrency)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    
+    latencies = sorted(sample for sample in samples if sample is not None)
+    result = {
+        "requests": requests,
+        "errors": requests - len(latencies),
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1e3, 3),
+            "p95": round(percentile(latencies, 0.95) * 1e3, 3),
+            "p99": round(percentile(latencies, 0.99) * 1e3, 3)
+        } if latencies else None,
+        "cpu_ms_per_request": round(cpu / requests * 1e3, 3),
+        "peak_memory_mib": None
+    }
+    
+    if memory:
+        # A separate pass, since tracing allocations slows every call down
+        tracemalloc.start()
+        run(base_url, method, data, requests, concurrency)
+        result["peak_memory_mib"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        tracemalloc.stop()
+    return result
+
+
+def sdk_version():
+    try:
+        from importlib.metadata import version
+        return version("b2brilliant_sdk")
+    except Exception:
+        return "unknown"
+
+
+def scenario_key(result):
+    return (result["method"], result["mode"], result["concurrency"], result["payload_kb"])
+
+
+def compare(results, baseline_path, tolerance):
+    """Print scenarios that got slower than the baseline by more than ``tolerance``"""
+    with open(baseline_path) as f:
+        baseline = {scenario_key(result): result for result in json.load(f)["results"]}
+        
+    regressions = 0
+    for result in results:
+        old = baseline.get(scenario_key(result))
+        if old is None or not old["latency_ms"] or not result["latency_ms"]:
+            continue
+            
+        changes = {
+            "throughput": old["throughput_rps"] / result["throughput_rps"],
+            "p99": result["latency_ms"]["p99"] / old["latency_ms"]["p99"],
+            "cpu": result["cpu_ms_per_request"] / old["cpu_ms_per_request"]
+        }
+        worse = {name: ratio for name, ratio in changes.items() if ratio > 1 + tolerance}
+        if worse:
+            regressions += 1
+            detail = ", ".join(f"{name} {ratio:.2f}x worse" for name, ratio in worse.items())
+            print(f"REGRESSION {' '.join(map(str, scenario_key(result)))}: {detail}")
+    print(f"{regressions} regressions against {baseline_path}")
+    return regressions
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="calls per scenario")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--payload-kb", default="1,16", help="comma-separated request and response sizes")
+    parser.add_argument("--methods", default=",".join(METHODS), help="comma-separated service methods")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated transport modes")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake server latency in seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--output", default="bench_services.json")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+    
+    runners = {"sync": run_sync, "async": run_async}
+    results = []
+    for payload_kb in parse_list(args.payload_kb, float):
+        data = make_inputs(payload_kb)
+        process, base_url = start_server(payload_kb, args.latency)
+        try:
+            for method in parse_list(args.methods, str):
+                for mode in parse_list(args.modes, str):
+                    for concurrency in parse_list(args.concurrency, int):
+                        result = {"method": method, "mode": mode, "concurrency": concurrency, "payload_kb": payload_kb}
+                        result.update(measure(runners[mode], base_url, method, data, args.requests, concurrency,
+                                              not args.no_memory))
+                        results.append(result)
+                        latency = result["latency_ms"] or {"p50": 0, "p95": 0, "p99": 0}
+                        print(f"{method:<24} {mode:<5} c={concurrency:<3} {payload_kb:>5g} KB  "
+                              f"{result['throughput_rps']:8.1f} req/s  p50 {latency['p50']:8.2f}  "
+                              f"p95 {latency['p95']:8.2f}  p99 {latency['p99']:8.2f} ms  "
+                              f"cpu {result['cpu_ms_per_request']:6.3f} ms/req  "
+                              f"mem {result['peak_memory_mib'] or 0:6.2f} MiB  errors {result['errors']}")
+        finally:
+            process.terminate()
+            process.wait()
+            
+    report = {
+        "sdk_version": sdk_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "settings": {"requests": args.requests, "latency": args.latency},
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"saved {len(results)} results to {args.output}")
+    
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
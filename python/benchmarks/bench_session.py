@@ -0,0 +1,84 @@
+"""
+Benchmark per-call latency of one-shot requests.post vs the pooled ApiClient session
+
+Starts a local keep-alive HTTP server and times sequential discover-shaped calls
+through both paths. Run from the python/ directory:
+
+    python benchmarks/bench_session.py --calls 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from b2brilliant_sdk.api_client import ApiClient
+
+RESPONSE = json.dumps({"profile": {"name": "Bench Co", "industry": "Software"}}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+def _time_calls(call, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label, samples):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<22} mean {statistics.mean(samples):7.3f} ms   "
+          f"p50 {statistics.median(samples):7.3f} ms   p99 {p99:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    endpoint = "/api/v1/business/discover"
+    payload = {"urls": ["https://example.com"]}
+
+    try:
+        def one_shot():
+            requests.post(f"{base_url}{endpoint}", json=payload).json()
+
+        _report("requests.post (before)", _time_calls(one_shot, args.calls))
+
+        with ApiClient(api_key="bench", base_url=base_url) as client:
+            _report("ApiClient (after)", _time_calls(lambda: client.post(endpoint, payload), args.calls))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()